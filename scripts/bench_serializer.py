@@ -0,0 +1,109 @@
+"""Micro-benchmark: monitoring event serialization.
+
+Compares the previous two-pass path (ForwardingListener._serialize on the crew
+thread, then json.dumps(cls=DateTimeEncoder) in the forwarder) against what
+runs now: `serialization.snapshot()` on the crew thread and a single-pass
+`serialization.dumps()` in the forwarder loop.
+
+Usage:
+    python scripts/bench_serializer.py [--messages 40] [--message-chars 2000] [--runs 200]
+"""
+import argparse
+import importlib.util
+import json
+import os
+import timeit
+from datetime import datetime
+from typing import Any
+
+
+def _load_serialization():
+    # Load the module by path so the benchmark doesn't import crewai
+    path = os.path.join(os.path.dirname(__file__), "..", "src", "backend", "monitoring", "serialization.py")
+    spec = importlib.util.spec_from_file_location("serialization", os.path.abspath(path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# --- Previous implementation, kept here for comparison ---------------------
+
+def legacy_serialize(obj: Any) -> Any:
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    elif isinstance(obj, dict):
+        return {k: legacy_serialize(v) for k, v in obj.items()}
+    elif isinstance(obj, (list, tuple)):
+        return [legacy_serialize(item) for item in obj]
+    elif isinstance(obj, (str, int, float, bool, type(None))):
+        return obj
+    else:
+        return str(obj)
+
+
+class DateTimeEncoder(json.JSONEncoder):
+    def default(self, obj: Any) -> Any:
+        if isinstance(obj, datetime):
+            return obj.isoformat()
+        return str(obj)
+
+
+# ---------------------------------------------------------------------------
+
+class _Opaque:
+    def __str__(self) -> str:
+        return "<TokenCalcHandler>"
+
+
+def build_payload(messages: int, message_chars: int) -> dict:
+    """An llm_call_completed-like payload with a long message history."""
+    text = ("lorem ipsum dolor sit amet " * (message_chars // 27 + 1))[:message_chars]
+    return {
+        "type": "llm_call_completed",
+        "call_type": "llm_call",
+        "timestamp": datetime.now(),
+        "llm_name": "openai/gpt-oss-20b",
+        "temperature": 0.7,
+        "messages": [
+            {"role": "user" if i % 2 else "assistant", "content": text, "meta": {"at": datetime.now(), "n": i}}
+            for i in range(messages)
+        ],
+        "response": text,
+        "from_task": _Opaque(),
+        "from_agent": None,
+        "callbacks": [_Opaque(), _Opaque()],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=40)
+    parser.add_argument("--message-chars", type=int, default=2000)
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    serialization = _load_serialization()
+    payload = build_payload(args.messages, args.message_chars)
+
+    # Sanity check: both paths must produce the same document
+    legacy_doc = json.loads(json.dumps(legacy_serialize(payload), cls=DateTimeEncoder))
+    assert legacy_doc == json.loads(serialization.dumps(payload)), "serializers disagree"
+
+    def per_call_us(fn) -> float:
+        return min(timeit.repeat(fn, number=args.runs, repeat=5)) / args.runs * 1e6
+
+    legacy_push = per_call_us(lambda: legacy_serialize(payload))
+    legacy_total = per_call_us(lambda: json.dumps(legacy_serialize(payload), cls=DateTimeEncoder).encode("utf-8"))
+    single_pass = per_call_us(lambda: serialization.dumps(payload))
+    snapshot = per_call_us(lambda: serialization.snapshot(payload))
+
+    size_kb = len(serialization.dumps(payload)) / 1024
+    print(f"payload: {args.messages} messages, {size_kb:.1f} KiB encoded; backend: {serialization.BACKEND}")
+    print(f"  legacy _serialize (crew thread)      {legacy_push:10.1f} us/event")
+    print(f"  legacy _serialize + json.dumps       {legacy_total:10.1f} us/event")
+    print(f"  single-pass dumps (forwarder)        {single_pass:10.1f} us/event  ({legacy_total / single_pass:.1f}x faster end-to-end)")
+    print(f"  snapshot (crew thread)               {snapshot:10.1f} us/event  ({legacy_push / snapshot:.0f}x less crew-thread time)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Load test: WebSocket fan-out throughput of a running bridge.
+
+Opens ``--clients`` WebSocket connections (spread over ``--procs`` client
+processes so the load generator is not the bottleneck), publishes
+``--events`` events to the bridge's Redis channel as fast as possible and
+reports how many clients were served and how many messages per second they
+received in total. ``/health`` is queried before and after so the
+per-worker distribution is visible.
+
+To measure scaling, run it once per worker count with the same arguments:
+
+    BRIDGE_WORKERS=1 python -m src.bridge.app      # then, in another shell:
+    python scripts/loadtest_bridge.py --clients 2000 --events 5000
+    BRIDGE_WORKERS=4 python -m src.bridge.app
+    python scripts/loadtest_bridge.py --clients 2000 --events 5000
+
+Each worker relays every event to its own clients, so with enough cores the
+connected clients and delivered messages/sec grow close to linearly with the
+number of workers.
+
+Requires the `websockets` and `redis` packages (both installed with the
+bridge requirements).
+"""
+import argparse
+import asyncio
+import json
+import multiprocessing
+import time
+import urllib.request
+from typing import Any, Dict, List
+
+import redis.asyncio as aioredis
+import websockets
+
+
+def _health(http_url: str) -> Dict[str, Any]:
+    try:
+        with urllib.request.urlopen(f"{http_url}/health", timeout=5) as response:
+            return json.loads(response.read())
+    except Exception as e:
+        return {"error": str(e)}
+
+
+async def _client(ws_url: str, expected: int, ready: asyncio.Event, results: List[int], timeout: float) -> None:
+    received = 0
+    try:
+        async with websockets.connect(ws_url, max_queue=None, open_timeout=30) as ws:
+            ready.set()
+            deadline = time.monotonic() + timeout
+            while received < expected:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    message = await asyncio.wait_for(ws.recv(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                if '"loadtest"' in message:
+                    received += 1
+    except Exception:
+        pass
+    results.append(received)
+
+
+async def _client_group(ws_url: str, clients: int, expected: int, timeout: float, connected, groups, start) -> List[int]:
+    results: List[int] = []
+    tasks = []
+    for _ in range(clients):
+        ready = asyncio.Event()
+        tasks.append(asyncio.create_task(_client(ws_url, expected, ready, results, timeout)))
+        await asyncio.wait([asyncio.create_task(ready.wait())], timeout=30)
+    with connected.get_lock():
+        connected.value += sum(1 for task in tasks if not task.done())
+    with groups.get_lock():
+        groups.value += 1
+    # Wait for the publisher without blocking the loop (keeps pings answered)
+    await asyncio.get_running_loop().run_in_executor(None, start.wait)
+    await asyncio.gather(*tasks)
+    return results
+
+
+def _client_process(ws_url, clients, expected, timeout, connected, groups, start, queue) -> None:
+    results = asyncio.run(_client_group(ws_url, clients, expected, timeout, connected, groups, start))
+    queue.put(results)
+
+
+async def _publish(redis_url: str, channel: str, events: int, batch: int) -> float:
+    client = aioredis.from_url(redis_url)
+    started = time.perf_counter()
+    for offset in range(0, events, batch):
+        pipe = client.pipeline(transaction=False)
+        for i in range(offset, min(offset + batch, events)):
+            pipe.publish(channel, json.dumps({"type": "loadtest", "seq": i, "chunk": "x" * 64}))
+        await pipe.execute()
+    elapsed = time.perf_counter() - started
+    await client.aclose()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="ws://127.0.0.1:8000/ws/events")
+    parser.add_argument("--redis-url", default="redis://127.0.0.1:6379/0")
+    parser.add_argument("--channel", default="crewai:events")
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--procs", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    http_url = args.url.replace("ws://", "http://").replace("wss://", "https://").split("/ws/")[0]
+    connected = multiprocessing.Value("i", 0)
+    groups = multiprocessing.Value("i", 0)
+    start = multiprocessing.Event()
+    queue: multiprocessing.Queue = multiprocessing.Queue()
+    procs = max(1, min(args.procs, args.clients))
+    per_proc = [args.clients // procs + (1 if i < args.clients % procs else 0) for i in range(procs)]
+    workers = [
+        multiprocessing.Process(
+            target=_client_process,
+            args=(args.url, n, args.events, args.timeout, connected, groups, start, queue),
+        )
+        for n in per_proc
+    ]
+    for worker in workers:
+        worker.start()
+    while groups.value < len(workers) and any(w.is_alive() for w in workers):
+        time.sleep(0.2)
+    health = _health(http_url)
+    print(f"connected clients: {connected.value}/{args.clients}")
+    print(f"/health before: {json.dumps(health)}")
+
+    started = time.perf_counter()
+    start.set()
+    publish_seconds = asyncio.run(_publish(args.redis_url, args.channel, args.events, args.batch))
+    received: List[int] = []
+    for _ in workers:
+        received.extend(queue.get())
+    elapsed = time.perf_counter() - started
+    for worker in workers:
+        worker.join()
+
+    total = sum(received)
+    complete = sum(1 for r in received if r >= args.events)
+    print(f"published {args.events} events in {publish_seconds:.2f}s")
+    print(f"delivered {total} messages in {elapsed:.2f}s: {total / elapsed:,.0f} messages/s "
+          f"({complete}/{len(received)} clients received every event)")
+    print(f"/health after: {json.dumps(_health(http_url))}")
+
+
+if __name__ == "__main__":
+    main()
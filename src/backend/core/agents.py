@@ -1,9 +1,10 @@
-import os
+import threading
 from typing import List
 from crewai import Agent
-from crewai_tools import FileReadTool, FileWriterTool, DirectoryReadTool, MCPServerAdapter
+from crewai_tools import FileReadTool, DirectoryReadTool
 from .artifacts import ArtifactOutput
-from .tools import BatchFileWriterTool, Base64EncodeTool
+from .mcp_servers import MCPServerPool, load_mcp_server_configs
+from .tools import ArtifactFileWriterTool, ArtifactManifestTool, BatchFileWriterTool, Base64EncodeTool
 
 
 class AgentManager:
@@ -15,71 +16,65 @@ class AgentManager:
         self.__initialize_agents__()
 
     def __initialize_tools__(self):
-        artifact_output_directory = self.artifact_output.get_base_output_path()
-        self._file_write_tool = FileWriterTool(directory=artifact_output_directory, allow_overwrite=True)  # Allow overwriting files
-        # Batch wrapper allows agents to submit a list of files in one call.
-        self._batch_file_writer = BatchFileWriterTool(self._file_write_tool, default_directory=artifact_output_directory, max_retries=3)
+        self.__initialize_output_tools__()
         # Small helper tool to encode content as base64 before writing when content
         # contains quotes/newlines or other characters that make JSON fragile.
         self._base64_encode_tool = Base64EncodeTool()
-        self._directory_read_tool = DirectoryReadTool(directory=artifact_output_directory)  # To read directories if needed
         self._file_read_tool = FileReadTool()  # To read files if needed
-        # Try to initialize the MCP server adapter if available. If the
-        # optional `mcp` package or the MCP adapter isn't present, we
-        # fall back to an empty search tool list so the module can be
-        # imported without side-effects (no auto-install attempts).
-        # Attempt to initialize an optional MCP server adapter. This is best-effort
-        # so missing optional packages won't prevent module import. If the
-        # adapter instance is created successfully we keep a reference on
-        # `self._mcp_server_adapter` and expose `.shutdown()` to stop it later.
-        self._mcp_server_adapter = None
-        try:
-            from crewai_tools import MCPServerAdapter
-            from mcp import StdioServerParameters
-
-            # Initialize server parameters (path may be project-specific)
-            server_params = StdioServerParameters(
-                command="node",
-                args=["C:/mcp-servers/web-search-mcp-v0.3.2/dist/index.js"],
-                env=os.environ  # Pass environment variables if needed
-            )
-
-            adapter = MCPServerAdapter(server_params)
-            # If this is the first time we start it in this process,
-            # record it as the global adapter to prevent double-starts
-            adapter.start()
-            self._mcp_server_adapter = adapter
-            self._search_tools = getattr(adapter, "tools", []) or []
-        except Exception as e:
-            # Provide clearer diagnostics for common MCP adapter failures
-            msg = str(e)
-            if "threads can only be started once" in msg:
-                print("Warning: MCPServerAdapter.start() called twice in the same process.")
-                print("If you intentionally created multiple AgentManager instances, share a single adapter instead.")
-                # Attempt to reuse the adapter if possible
-                try:
-                    self._mcp_server_adapter = adapter
-                    self._search_tools = getattr(adapter, "tools", []) or []
-                except Exception:
-                    self._mcp_server_adapter = None
-                    self._search_tools = []
-            elif "Invalid JSON" in msg or "Failed to parse JSONRPC" in msg or "Waiting for MCP messages" in msg:
-                print("Warning: MCP server produced non-JSON stdout which breaks the JSON-RPC channel.")
-                print("Ensure the MCP server prints only JSON-RPC to stdout, and sends logs to stderr or a log file.")
-                self._mcp_server_adapter = None
-                self._search_tools = []
-            else:
-                print(f"Warning: MCPServerAdapter failed to start: [LOG SUPPRESSED]")
-                self._mcp_server_adapter = None
-                self._search_tools = []
+        # MCP servers (search tools) start in the background so agents can be
+        # built and the crew kicked off right away. Their tools are added to
+        # the agents that use search as each server becomes ready; the
+        # documentation agent never waits on them.
+        self._search_tools = []
+        self._search_agents = []
+        self._search_lock = threading.Lock()
+        self._mcp_servers = MCPServerPool(load_mcp_server_configs())
+        self._mcp_servers.start(on_ready=self.__attach_search_tools__)
+
+    def __attach_search_tools__(self, tools):
+        """Called from an MCP start-up thread once a server's tools are listed."""
+        with self._search_lock:
+            self._search_tools.extend(tools)
+            for agent in self._search_agents:
+                agent.tools.extend(tools)
+
+    def __initialize_output_tools__(self):
+        """Create the tools bound to the run's artifact directory."""
+        artifact_output_directory = self.artifact_output.get_base_output_path()
+        self._directory_read_tool = DirectoryReadTool(directory=artifact_output_directory)  # To read directories if needed
+        # What earlier tasks produced, without re-listing the directory
+        self._artifact_manifest_tool = ArtifactManifestTool(self.artifact_output)
+
+    def __writer_tools__(self):
+        """Write tools for one agent; each agent gets its own so the manifest knows who wrote a file."""
+        artifact_output_directory = self.artifact_output.get_base_output_path()
+        file_write_tool = ArtifactFileWriterTool(self.artifact_output, directory=artifact_output_directory, allow_overwrite=True)  # Allow overwriting files
+        # Batch wrapper allows agents to submit a list of files in one call.
+        batch_file_writer = BatchFileWriterTool(default_directory=artifact_output_directory, max_retries=3, artifact_output=self.artifact_output)
+        return [file_write_tool, batch_file_writer]
+
+    def rebind(self, artifact_output: ArtifactOutput):
+        """Prepare for another run writing to a new artifact directory.
+
+        Run-independent tools (the MCP adapter and its search tools, file
+        reading, base64 encoding) are kept; the directory-bound tools (writers,
+        directory listing, artifact manifest) and the agents themselves are
+        rebuilt, so no per-run agent state carries over.
+        """
+        self.artifact_output = artifact_output
+        self.output_directory = artifact_output.get_base_output_path()
+        self.__initialize_output_tools__()
+        self.__initialize_agents__()
 
     def __initialize_agents__(self):
         """Initialize agents with their roles, goals, backstories, and tools."""
+        with self._search_lock:
+            search_tools = list(self._search_tools)
         requirements_analyst = Agent(
             role='Requirements Analyst Agent',
             goal='Analyze and refine user requirements into detailed specs.',
             backstory='An experienced product manager specializing in educational tools, skilled at breaking down vague ideas into actionable specs.',
-            tools=[self._file_write_tool, self._batch_file_writer, self._base64_encode_tool, self._directory_read_tool, self._file_read_tool] + self._search_tools,
+            tools=[*self.__writer_tools__(), self._base64_encode_tool, self._directory_read_tool, self._artifact_manifest_tool, self._file_read_tool] + search_tools,
             verbose=True,
             respect_context_window=True,  # Enables automatic handling of context window limits
             allow_delegation=False,
@@ -90,7 +85,7 @@ class AgentManager:
             role='System Architect Agent',
             goal='Design the overall architecture, including component structure, data models, and tech stack.',
             backstory='A software architect with expertise in full-stack web apps, focusing on graph-based systems.',
-            tools=[self._file_write_tool, self._batch_file_writer, self._base64_encode_tool, self._directory_read_tool, self._file_read_tool] + self._search_tools,
+            tools=[*self.__writer_tools__(), self._base64_encode_tool, self._directory_read_tool, self._artifact_manifest_tool, self._file_read_tool] + search_tools,
             verbose=True,
             respect_context_window=True,  # Enables automatic handling of context window limits
             allow_delegation=False,
@@ -101,7 +96,7 @@ class AgentManager:
             role='UI/UX Designer Agent',
             goal='Produce wireframes, component designs, and Vue templates that are intuitive for educational users.',
             backstory='A frontend designer familiar with Vue and educational platforms, emphasizing usability.',
-            tools=[self._file_write_tool, self._batch_file_writer, self._base64_encode_tool, self._directory_read_tool, self._file_read_tool] + self._search_tools,
+            tools=[*self.__writer_tools__(), self._base64_encode_tool, self._directory_read_tool, self._artifact_manifest_tool, self._file_read_tool] + search_tools,
             verbose=True,
             respect_context_window=True,  # Enables automatic handling of context window limits
             allow_delegation=False,
@@ -112,7 +107,7 @@ class AgentManager:
             role='Frontend Developer Agent',
             goal='Build responsive components for note management, manual linking, and graph rendering.',
             backstory='A Vue specialist with TypeScript expertise, experienced in state management and visualization libraries.',
-            tools=[self._file_write_tool, self._batch_file_writer, self._base64_encode_tool, self._directory_read_tool, self._file_read_tool] + self._search_tools,
+            tools=[*self.__writer_tools__(), self._base64_encode_tool, self._directory_read_tool, self._artifact_manifest_tool, self._file_read_tool] + search_tools,
             verbose=True,
             respect_context_window=True,  # Enables automatic handling of context window limits
             allow_delegation=True,  # Can delegate if needed
@@ -123,7 +118,7 @@ class AgentManager:
             role='Backend & AI Developer Agent',
             goal='Handle data persistence, API endpoints, and AI-driven similarity detection for notes.',
             backstory='A full-stack developer with AI integration experience (e.g., using NLP APIs for content analysis).',
-            tools=[self._file_write_tool, self._batch_file_writer, self._base64_encode_tool, self._directory_read_tool, self._file_read_tool] + self._search_tools,  # Search for AI best practices
+            tools=[*self.__writer_tools__(), self._base64_encode_tool, self._directory_read_tool, self._artifact_manifest_tool, self._file_read_tool] + search_tools,  # Search for AI best practices
             verbose=True,
             respect_context_window=True,  # Enables automatic handling of context window limits
             allow_delegation=True,
@@ -134,7 +129,7 @@ class AgentManager:
             role='Tester Agent',
             goal='Ensure the platform is bug-free, with coverage for linking logic, graph rendering, and AI suggestions.',
             backstory='A QA engineer skilled in unit/integration testing for Vue apps and APIs.',
-            tools=[self._file_write_tool, self._batch_file_writer, self._base64_encode_tool, self._directory_read_tool, self._file_read_tool] + self._search_tools,  # To read generated code for testing
+            tools=[*self.__writer_tools__(), self._base64_encode_tool, self._directory_read_tool, self._artifact_manifest_tool, self._file_read_tool] + search_tools,  # To read generated code for testing
             verbose=True,
             respect_context_window=True,  # Enables automatic handling of context window limits
             allow_delegation=False,
@@ -145,7 +140,7 @@ class AgentManager:
             role='Documentation Agent',
             goal='Make the codebase maintainable and easy to deploy/extend.',
             backstory='A technical writer focused on open-source educational tools.',
-            tools=[self._file_write_tool, self._batch_file_writer, self._base64_encode_tool, self._directory_read_tool, self._file_read_tool],
+            tools=[*self.__writer_tools__(), self._base64_encode_tool, self._directory_read_tool, self._artifact_manifest_tool, self._file_read_tool],
             verbose=True,
             respect_context_window=True,  # Enables automatic handling of context window limits
             allow_delegation=False,
@@ -161,27 +156,37 @@ class AgentManager:
             tester,
             documentation_agent
         ]
-        
+        for agent in self._agents:
+            for tool in agent.tools:
+                if isinstance(tool, (ArtifactFileWriterTool, BatchFileWriterTool)):
+                    tool.bind_agent(agent)
+        # Agents built with search_tools above; later MCP servers extend these
+        search_agents = [
+            requirements_analyst,
+            system_architect,
+            ui_ux_designer,
+            frontend_developer,
+            backend_ai_developer,
+            tester,
+        ]
+        with self._search_lock:
+            self._search_agents = search_agents
+            # Servers that became ready while the agents were being built
+            for agent in self._search_agents:
+                agent.tools.extend(self._search_tools[len(search_tools):])
+
     def get_all_agents(self) -> List[Agent]:
         """Return the list of all defined agents."""
         return self._agents
 
     def shutdown(self):
-        """Attempt to gracefully shutdown optional tools (e.g. MCP adapter).
+        """Attempt to gracefully shutdown optional tools (e.g. MCP adapters).
 
-        This method calls common shutdown/stop methods on the adapter if they
-        exist and swallows exceptions to avoid raising during program shutdown.
-        Call this from your application shutdown hook if you created an
-        AgentManager instance that started the adapter.
+        Stops every MCP server that was started (servers still starting are
+        stopped as soon as they are up) and swallows exceptions to avoid
+        raising during program shutdown.
         """
-        if not self._mcp_server_adapter:
-            return
-
-         # Try explicit stop first
-        # Best-effort: clear reference
         try:
-            self._mcp_server_adapter.stop()
-            self._mcp_server_adapter = None
+            self._mcp_servers.stop()
         except Exception:
             pass
-
@@ -1,18 +1,293 @@
 # Helper function to generate timestamped output folder
 from datetime import datetime
+from typing import Any, Callable, Dict, Optional
+import hashlib
+import json
 import os
+import shutil
+import stat
+import tempfile
+import threading
+import time
+import uuid
+
+# Columns of a manifest entry, in the order they are stored on disk
+MANIFEST_FIELDS = ("size", "sha256", "mtime", "agent", "task")
+MANIFEST_FILE = ".manifest.json"
+# Minimum seconds between two saves by `save_manifest_debounced`
+MANIFEST_SAVE_INTERVAL = 5.0
+# Blobs, and so every artifact linked to one, are read-only: a tool that
+# opened one for writing would change every run's copy of that content
+BLOB_MODE = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+# Mode of an artifact that `detach` gave back its own copy
+DETACHED_MODE = BLOB_MODE | stat.S_IWUSR
 
 
 class ArtifactOutput:
-    """Class to manage artifact output paths."""
-    def __init__(self, base_folder: str = "outputs"):
+    """Class to manage artifact output paths.
+
+    Also keeps the run's artifact manifest: for every file the write tools
+    produced, its size, content hash, mtime and the agent/task that wrote it,
+    keyed by path relative to the run folder. Agents and the dashboard look
+    files up there instead of re-listing and re-reading the folder; it is
+    persisted as ``.manifest.json`` in the run folder (see `load_manifest`).
+
+    The hashes also let the write tools skip rewriting identical content, and
+    a content-addressed blob store shared by every run under ``base_folder``
+    (``.blobs/<sha256[:2]>/<sha256>``) keeps each distinct file content once:
+    artifacts are hard links to their blob, so content another run (or file)
+    already produced is linked into place instead of written again. Linked
+    artifacts are read-only, so an in-place edit fails instead of changing
+    the blob; `detach` gives a file its own writable copy first. Blobs no
+    artifact links to any more are removed by `prune_blobs`. Set
+    ``ARTIFACT_BLOB_STORE=false`` to disable the blob store; it is also
+    skipped where the filesystem cannot hard-link, and on Windows, where a
+    read-only file cannot be replaced.
+    """
+    def __init__(self, base_folder: str = "outputs", run_id: Optional[str] = None, blob_store: Optional[bool] = None):
         # Normalize and make absolute the base folder path
         self.base_folder = os.path.abspath(os.path.normpath(base_folder))
         self.timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
+        # Runs started in the same second get separate folders
+        self.run_id = run_id
+        if blob_store is None:
+            blob_store = os.getenv("ARTIFACT_BLOB_STORE", "true").lower() in ("1", "true", "yes")
+        blob_store = blob_store and os.name != "nt"
+        self.blob_folder = os.path.join(self.base_folder, ".blobs") if blob_store else None
+        # Called with each new or updated manifest entry (e.g. to publish an event)
+        self.on_change: Optional[Callable[[Dict[str, Any]], None]] = None
+        self._manifest: Dict[str, Dict[str, Any]] = {}
+        # Relative path -> (inode, size, mtime_ns) of the file as last recorded
+        self._stats: Dict[str, tuple] = {}
+        self._dirty = False
+        self._saved_at = 0.0
+        self._lock = threading.Lock()
 
     def get_base_output_path(self) -> str:
         """Get full output path for a given relative path."""
-        path = os.path.join(self.base_folder, self.timestamp)
+        folder = f"{self.timestamp}_{self.run_id}" if self.run_id else self.timestamp
+        path = os.path.join(self.base_folder, folder)
         return os.path.normpath(path)
 
+    def relative_path(self, path: str) -> str:
+        """Manifest key for ``path``: relative to the run folder, with forward slashes."""
+        path = os.path.abspath(os.path.join(self.get_base_output_path(), path))
+        return os.path.relpath(path, self.get_base_output_path()).replace(os.sep, "/")
+
+    @staticmethod
+    def content_hash(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def recorded_hash(self, path: str) -> Optional[str]:
+        """Hash of the content last recorded for ``path``, if the file is untouched since."""
+        key = self.relative_path(path)
+        with self._lock:
+            entry = self._manifest.get(key)
+            recorded = self._stats.get(key)
+        if entry is None:
+            return None
+        try:
+            st = os.stat(os.path.join(self.get_base_output_path(), key))
+        except OSError:
+            return None
+        # Changed or replaced behind our back (e.g. by another tool): the hash is stale
+        if (st.st_ino, st.st_size, st.st_mtime_ns) != recorded:
+            return None
+        return entry["sha256"]
+
+    def record_write(self, path: str, digest: str, agent: Optional[str] = None, task: Optional[str] = None) -> None:
+        """Record that ``path`` now holds the content with hash ``digest``.
+
+        The recorded mtime is when the file got this content: for a file
+        linked to a blob, the inode's mtime is when the blob was first written.
+        """
+        try:
+            st = os.stat(os.path.abspath(path))
+        except OSError:
+            return
+        key = self.relative_path(path)
+        signature = (st.st_ino, st.st_size, st.st_mtime_ns)
+        mtime = st.st_mtime if st.st_nlink <= 1 else time.time()
+        with self._lock:
+            previous = self._manifest.get(key)
+            if previous is not None and previous["sha256"] == digest:
+                # An unchanged rewrite keeps the original author
+                agent, task = previous["agent"] or agent, previous["task"] or task
+                if self._stats.get(key) == signature:
+                    mtime = previous["mtime"]
+            self._stats[key] = signature
+            entry = {
+                "path": key,
+                "size": st.st_size,
+                "sha256": digest,
+                "mtime": mtime,
+                "agent": agent,
+                "task": task,
+            }
+            if entry == previous:
+                return
+            self._manifest[key] = entry
+            self._dirty = True
+        if self.on_change is not None:
+            try:
+                self.on_change(dict(entry))
+            except Exception:
+                pass
+
+    def artifact(self, path: str) -> Optional[Dict[str, Any]]:
+        """Manifest entry of one file (path relative to the run folder, or absolute)."""
+        key = self.relative_path(path)
+        with self._lock:
+            entry = self._manifest.get(key)
+            return dict(entry) if entry is not None else None
+
+    def manifest(self) -> Dict[str, Dict[str, Any]]:
+        """Copy of the whole manifest, keyed by relative path."""
+        with self._lock:
+            return {key: dict(entry) for key, entry in self._manifest.items()}
+
+    def manifest_path(self) -> str:
+        return os.path.join(self.get_base_output_path(), MANIFEST_FILE)
+
+    def save_manifest(self) -> Optional[str]:
+        """Persist the manifest if it changed since the last save; returns its path."""
+        with self._lock:
+            if not self._dirty:
+                return None
+            data = {
+                "version": 1,
+                "run_id": self.run_id,
+                "fields": list(MANIFEST_FIELDS),
+                "files": {key: [entry[f] for f in MANIFEST_FIELDS] for key, entry in self._manifest.items()},
+            }
+            self._dirty = False
+            self._saved_at = time.monotonic()
+        path = self.manifest_path()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+        except BaseException:
+            with self._lock:
+                self._dirty = True
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        return path
+
+    def save_manifest_debounced(self) -> Optional[str]:
+        """`save_manifest`, at most every `MANIFEST_SAVE_INTERVAL` seconds.
+
+        For per-file writes: the whole manifest is rewritten on every save, so
+        saving after each file would be quadratic over a run. The run's final
+        `save_manifest` persists whatever is still pending.
+        """
+        with self._lock:
+            if time.monotonic() - self._saved_at < MANIFEST_SAVE_INTERVAL:
+                return None
+        return self.save_manifest()
+
+    @staticmethod
+    def load_manifest(run_folder: str) -> Dict[str, Dict[str, Any]]:
+        """Manifest of a (finished or historical) run folder; empty if it has none."""
+        try:
+            with open(os.path.join(run_folder, MANIFEST_FILE), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        fields = data.get("fields") or MANIFEST_FIELDS
+        return {key: dict(zip(fields, values), path=key) for key, values in (data.get("files") or {}).items()}
+
+    def blob_path(self, digest: str) -> Optional[str]:
+        if self.blob_folder is None:
+            return None
+        return os.path.join(self.blob_folder, digest[:2], digest)
+
+    def link_blob(self, digest: str, path: str, create: bool = True, size: Optional[int] = None) -> bool:
+        """Make ``path`` a hard link to the blob of ``digest``.
+
+        When there is no blob yet and ``create`` is set, ``path`` itself
+        becomes the blob. Either way the content is made read-only (see
+        `BLOB_MODE`). ``size`` guards against a blob that was modified in
+        place. Returns False (leaving ``path`` as it was) when the store is
+        disabled, the blob is missing or the filesystem cannot hard-link.
+        """
+        blob = self.blob_path(digest)
+        if blob is None:
+            return False
+        tmp_path = None
+        try:
+            if create and not os.path.exists(blob):
+                os.makedirs(os.path.dirname(blob), exist_ok=True)
+                try:
+                    os.link(path, blob)
+                    os.chmod(blob, BLOB_MODE)
+                    return True
+                except FileExistsError:
+                    pass  # another writer stored the same content first
+            if size is not None and os.path.getsize(blob) != size:
+                return False
+            # Also covers blobs stored before they were made read-only
+            os.chmod(blob, BLOB_MODE)
+            if os.path.samefile(blob, path):
+                return True
+            tmp_path = f"{path}.{uuid.uuid4().hex[:8]}.link"
+            os.link(blob, tmp_path)
+            os.replace(tmp_path, path)
+            return True
+        except OSError:
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+            return False
+
+    @staticmethod
+    def detach(path: str) -> None:
+        """Give ``path`` its own, writable copy of its content if it is linked to a blob.
+
+        Needed before a tool rewrites the file in place, which would otherwise
+        fail on the read-only link.
+        """
+        try:
+            st = os.stat(path)
+            if st.st_nlink <= 1:
+                # Its blob is gone (e.g. the store was cleared): only writable again
+                if not st.st_mode & stat.S_IWUSR:
+                    os.chmod(path, DETACHED_MODE)
+                return
+        except OSError:
+            return
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            os.close(fd)
+            shutil.copyfile(path, tmp_path)
+            os.chmod(tmp_path, DETACHED_MODE)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
 
+    def prune_blobs(self) -> int:
+        """Remove blobs no artifact links to any more; returns how many."""
+        if self.blob_folder is None:
+            return 0
+        removed = 0
+        for folder, _dirs, names in os.walk(self.blob_folder):
+            for name in names:
+                path = os.path.join(folder, name)
+                try:
+                    if os.stat(path).st_nlink <= 1:
+                        os.remove(path)
+                        removed += 1
+                except OSError:
+                    pass
+        return removed
@@ -0,0 +1,148 @@
+"""Background start-up of the MCP servers that provide the agents' search tools.
+
+Starting an MCP server (spawning e.g. a node process and listing its tools)
+takes seconds. `MCPServerPool` starts every configured server concurrently
+on its own thread, so building agents and kicking off the crew does not wait
+for them; each server's tools are handed to an ``on_ready`` callback as soon
+as that server is up. A server that is not ready within ``ready_timeout``
+seconds is given up on: the timeout is the adapter's connect timeout, so a
+server that hangs while starting is stopped by the adapter itself.
+
+Servers are configured with ``MCP_SERVERS``, a JSON list of
+``{"name": ..., "command": ..., "args": [...], "env": {...}}`` objects (the
+process environment is passed when ``env`` is omitted). An empty value or
+``[]`` disables MCP tools.
+"""
+import json
+import math
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# The search server the crew was built around
+DEFAULT_MCP_SERVERS = [
+    {
+        "name": "web-search",
+        "command": "node",
+        "args": ["C:/mcp-servers/web-search-mcp-v0.3.2/dist/index.js"],
+    },
+]
+
+
+def load_mcp_server_configs() -> List[Dict[str, Any]]:
+    """Server configs from ``MCP_SERVERS`` (or the default search server)."""
+    raw = os.getenv("MCP_SERVERS")
+    if raw is None:
+        return DEFAULT_MCP_SERVERS
+    if not raw.strip():
+        return []
+    try:
+        configs = json.loads(raw)
+    except ValueError as e:
+        print(f"Warning: ignoring invalid MCP_SERVERS ({e})")
+        return []
+    if not isinstance(configs, list):
+        print("Warning: ignoring MCP_SERVERS, expected a JSON list of server objects")
+        return []
+    return [c for c in configs if isinstance(c, dict) and c.get("command")]
+
+
+class MCPServerPool:
+    """Start several MCP server adapters concurrently and collect their tools."""
+
+    def __init__(self, configs: List[Dict[str, Any]], ready_timeout: Optional[float] = None):
+        self.configs = configs
+        self.ready_timeout = ready_timeout if ready_timeout is not None else float(os.getenv("MCP_READY_TIMEOUT", "60"))
+        self._lock = threading.Lock()
+        self._adapters: Dict[str, Any] = {}
+        self._tools: List[Any] = []
+        self._stopped = False
+
+    @staticmethod
+    def _name(config: Dict[str, Any], index: int) -> str:
+        return str(config.get("name") or f"mcp-{index}")
+
+    def start(self, on_ready: Optional[Callable[[List[Any]], None]] = None) -> None:
+        """Start every server in the background; returns immediately."""
+        for index, config in enumerate(self.configs):
+            name = self._name(config, index)
+            threading.Thread(
+                target=self._start_server,
+                args=(name, config, on_ready),
+                name=f"mcp-start-{name}",
+                daemon=True,
+            ).start()
+
+    def _start_server(self, name: str, config: Dict[str, Any],
+                      on_ready: Optional[Callable[[List[Any]], None]]) -> None:
+        deadline = time.monotonic() + self.ready_timeout
+        try:
+            from crewai_tools import MCPServerAdapter
+            from mcp import StdioServerParameters
+
+            server_params = StdioServerParameters(
+                command=config["command"],
+                args=list(config.get("args") or []),
+                env=config.get("env") or os.environ,  # Pass environment variables if needed
+            )
+            # The adapter starts the server in its constructor and stops it
+            # again if it is not connected within connect_timeout
+            adapter = MCPServerAdapter(server_params, connect_timeout=max(1, math.ceil(self.ready_timeout)))
+            if getattr(adapter, "_tools", None) is None:
+                # Adapters that are started explicitly
+                adapter.start()
+            tools = list(getattr(adapter, "tools", []) or [])
+        except Exception as e:
+            if time.monotonic() >= deadline:
+                print(f"Warning: MCP server '{name}' was not ready within {self.ready_timeout:g}s; its tools are not used.")
+            else:
+                self._report_failure(name, e)
+            return
+
+        with self._lock:
+            late = time.monotonic() > deadline
+            keep = not late and not self._stopped
+            if keep:
+                self._adapters[name] = adapter
+                self._tools.extend(tools)
+        if not keep:
+            if late:
+                print(f"Warning: MCP server '{name}' was not ready within {self.ready_timeout:g}s; its tools are not used.")
+            self._stop_adapter(adapter)
+            return
+        print(f"MCP server '{name}' ready with {len(tools)} tools")
+        if on_ready is not None and tools:
+            on_ready(tools)
+
+    @staticmethod
+    def _report_failure(name: str, error: Exception) -> None:
+        # Provide clearer diagnostics for common MCP adapter failures
+        msg = str(error)
+        if "Invalid JSON" in msg or "Failed to parse JSONRPC" in msg or "Waiting for MCP messages" in msg:
+            print(f"Warning: MCP server '{name}' produced non-JSON stdout which breaks the JSON-RPC channel.")
+            print("Ensure the MCP server prints only JSON-RPC to stdout, and sends logs to stderr or a log file.")
+        else:
+            print(f"Warning: MCP server '{name}' failed to start: [LOG SUPPRESSED]")
+
+    def tools(self) -> List[Any]:
+        """Tools of the servers that are ready now (never blocks)."""
+        with self._lock:
+            return list(self._tools)
+
+    @staticmethod
+    def _stop_adapter(adapter: Any) -> None:
+        try:
+            adapter.stop()
+        except Exception:
+            pass
+
+    def stop(self) -> None:
+        """Stop every started server; servers still starting stop once they are up."""
+        with self._lock:
+            self._stopped = True
+            adapters = list(self._adapters.values())
+            self._adapters.clear()
+            self._tools = []
+        for adapter in adapters:
+            self._stop_adapter(adapter)
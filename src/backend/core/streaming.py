@@ -0,0 +1,193 @@
+"""Incremental parsing and encoding helpers for large tool arguments.
+
+Agents pass whole files inside tool arguments (a JSON array of file objects,
+often with base64 content). These helpers work through such arguments a
+chunk at a time so the write tools never hold extra full copies of them:
+
+ - `JSONArrayParser` yields the elements of a JSON array as soon as each one
+   is complete, buffering only the element being parsed.
+ - `iter_encoded` / `iter_b64decoded` turn text or base64 text into bytes
+   chunks, to be hashed or written straight to a file.
+ - `b64encode_text` base64-encodes text without a full intermediate bytes copy.
+"""
+import ast
+import base64
+import binascii
+import json
+import re
+from typing import Any, Iterable, Iterator, List, Optional
+
+# Characters handed to the parser / encoders per step
+CHUNK_CHARS = 64 * 1024
+
+_STRUCTURE = re.compile(r"[\"'\[\]{},]")
+_ELEMENT_START = re.compile(r"[^\s,]")
+_STRING_END = {'"': re.compile(r'["\\]'), "'": re.compile(r"['\\]")}
+_NOT_B64 = re.compile(r"[^A-Za-z0-9+/=]+")
+
+
+class JSONArrayParser:
+    """Incremental parser for a JSON array embedded in arbitrary text.
+
+    Text before the first ``[`` and after the matching ``]`` is ignored, like
+    the model chatter around a tool argument. Elements that are not valid
+    JSON are parsed as Python literals (single-quoted dicts etc.).
+
+        parser = JSONArrayParser()
+        for chunk in chunks:
+            for item in parser.feed(chunk):
+                ...
+        parser.close()
+    """
+
+    def __init__(self):
+        self._started = False
+        self.done = False
+        self._depth = 0
+        self._quote: Optional[str] = None
+        self._escaped = False
+        # Pieces of the element being parsed (None between elements)
+        self._parts: Optional[List[str]] = None
+
+    def feed(self, chunk: str) -> List[Any]:
+        """Consume ``chunk`` and return the elements it completed."""
+        items: List[Any] = []
+        pos, end = 0, len(chunk)
+        start = 0  # where the current element's text begins in this chunk
+        while pos < end and not self.done:
+            if not self._started:
+                i = chunk.find("[", pos)
+                if i < 0:
+                    break
+                self._started = True
+                pos = i + 1
+            elif self._escaped:
+                # Character escaped by a backslash at the end of the last chunk
+                self._escaped = False
+                pos += 1
+            elif self._quote is not None:
+                m = _STRING_END[self._quote].search(chunk, pos)
+                if m is None:
+                    pos = end
+                elif m.group() == "\\":
+                    self._escaped = m.end() >= end
+                    pos = m.end() + 1
+                else:
+                    self._quote = None
+                    pos = m.end()
+            elif self._parts is None:
+                m = _ELEMENT_START.search(chunk, pos)
+                if m is None:
+                    break
+                if m.group() == "]":
+                    self.done = True
+                    break
+                self._parts = []
+                start = pos = m.start()
+            else:
+                m = _STRUCTURE.search(chunk, pos)
+                if m is None:
+                    pos = end
+                    continue
+                c, i = m.group(), m.start()
+                pos = i + 1
+                if c in "\"'":
+                    self._quote = c
+                elif c in "[{":
+                    self._depth += 1
+                elif c in "]}" and self._depth > 0:
+                    self._depth -= 1
+                    if self._depth == 0:
+                        items.append(self._complete(chunk[start:pos]))
+                elif self._depth == 0:
+                    # A scalar element ends at the next comma or the closing ]
+                    items.append(self._complete(chunk[start:i]))
+                    self.done = c == "]"
+        if self._parts is not None and not self.done:
+            self._parts.append(chunk[start:])
+        return items
+
+    def _complete(self, tail: str) -> Any:
+        parts, self._parts = self._parts, None
+        parts.append(tail)
+        text = "".join(parts)
+        # Free the pieces before parsing so only the joined text is held
+        del parts
+        return self._element(text)
+
+    def close(self) -> None:
+        """Raise ValueError unless a complete array was parsed."""
+        if not self._started:
+            raise ValueError("no JSON array found")
+        if not self.done:
+            raise ValueError("JSON array is not terminated")
+
+    @staticmethod
+    def _element(text: str) -> Any:
+        text = text.strip()
+        try:
+            return json.loads(text)
+        except ValueError:
+            pass
+        try:
+            return ast.literal_eval(text)
+        except Exception:
+            raise ValueError(f"could not parse array element {text[:80]!r}")
+
+
+def iter_json_array(source: Any, chunk_chars: int = CHUNK_CHARS) -> Iterator[Any]:
+    """Yield the elements of the JSON array in ``source``.
+
+    ``source`` is a string, a file-like object with ``read`` or an iterable
+    of string chunks.
+    """
+    parser = JSONArrayParser()
+    if isinstance(source, str):
+        chunks: Iterable[str] = (source[i:i + chunk_chars] for i in range(0, len(source), chunk_chars))
+    elif hasattr(source, "read"):
+        chunks = iter(lambda: source.read(chunk_chars), "")
+    else:
+        chunks = source
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+        if parser.done:
+            return
+    parser.close()
+
+
+def iter_encoded(text: str, chunk_chars: int = CHUNK_CHARS) -> Iterator[bytes]:
+    """UTF-8 bytes of ``text``, one chunk at a time."""
+    for i in range(0, len(text), chunk_chars):
+        yield text[i:i + chunk_chars].encode("utf-8")
+
+
+def iter_b64decoded(text: str, chunk_chars: int = CHUNK_CHARS) -> Iterator[bytes]:
+    """Decoded bytes of base64 ``text``, one chunk at a time.
+
+    Like ``base64.b64decode`` (non-validating), characters outside the
+    base64 alphabet such as line breaks are ignored. Raises
+    ``binascii.Error`` on bad padding.
+    """
+    carry = ""
+    for i in range(0, len(text), chunk_chars):
+        piece = carry + _NOT_B64.sub("", text[i:i + chunk_chars])
+        cut = len(piece) - len(piece) % 4
+        carry = piece[cut:]
+        if cut:
+            yield base64.b64decode(piece[:cut])
+    if carry:
+        # b64decode rejects a leftover that is not a multiple of 4 characters
+        yield base64.b64decode(carry)
+
+
+def b64encode_text(text: str, chunk_chars: int = CHUNK_CHARS) -> str:
+    """Base64 of the UTF-8 encoding of ``text``."""
+    parts = []
+    carry = b""
+    for data in iter_encoded(text, chunk_chars):
+        data = carry + data
+        cut = len(data) - len(data) % 3
+        carry = data[cut:]
+        parts.append(binascii.b2a_base64(data[:cut], newline=False).decode("ascii"))
+    parts.append(binascii.b2a_base64(carry, newline=False).decode("ascii"))
+    return "".join(parts)
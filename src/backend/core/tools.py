@@ -1,17 +1,91 @@
+import asyncio
 import os
+import random
 import time
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 import json
 import ast
 import re
 import base64
+import binascii
+import hashlib
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
 from crewai.tools.base_tool import BaseTool
+from crewai_tools import FileWriterTool
+
+from .streaming import CHUNK_CHARS, b64encode_text, iter_b64decoded, iter_encoded, iter_json_array
+
+
+def artifact_attribution(agent: Any) -> Tuple[Optional[str], Optional[str]]:
+	"""(agent role, task) to record for a file written by ``agent``'s tools."""
+	if agent is None:
+		return None, None
+	# The executor of the agent's current task (see Agent.execute_task)
+	task = getattr(getattr(agent, "agent_executor", None), "task", None)
+	label = None
+	if task is not None:
+		label = getattr(task, "name", None) or (getattr(task, "description", None) or "").strip().split("\n", 1)[0][:120] or None
+	return getattr(agent, "role", None), label
+
+
+class ArtifactFileWriterTool(FileWriterTool):
+	"""FileWriterTool that records what it writes in the run's artifact manifest."""
+
+	_artifact_output: Any = None
+	_agent: Any = None
+
+	def __init__(self, artifact_output=None, **data):
+		super().__init__(**data)
+		self._artifact_output = artifact_output
+
+	def bind_agent(self, agent: Any) -> None:
+		self._agent = agent
+
+	def _run(self, **kwargs: Any) -> str:
+		if self._artifact_output is not None and "filename" in kwargs:
+			# FileWriterTool rewrites in place; never through a shared blob
+			try:
+				self._artifact_output.detach(os.path.abspath(os.path.join(kwargs.get("directory") or "", kwargs["filename"])))
+			except OSError as e:
+				print(f"Warning: could not detach {kwargs['filename']} from the blob store: {e}")
+		result = super()._run(**kwargs)
+		if self._artifact_output is not None and isinstance(result, str) and result.startswith("Content successfully written"):
+			try:
+				path = os.path.abspath(os.path.join(kwargs.get("directory") or "", kwargs["filename"]))
+				digest = hashlib.sha256()
+				with open(path, "rb") as f:
+					for data in iter(lambda: f.read(CHUNK_CHARS), b""):
+						digest.update(data)
+				self._artifact_output.link_blob(digest.hexdigest(), path)
+				agent, task = artifact_attribution(self._agent)
+				self._artifact_output.record_write(path, digest.hexdigest(), agent=agent, task=task)
+				self._artifact_output.save_manifest_debounced()
+			except (OSError, KeyError) as e:
+				print(f"Warning: could not record {kwargs.get('filename')} in the artifact manifest: {e}")
+		return result
 
 
 class BatchFileWriterTool(BaseTool):
 	"""A CrewAI-compatible tool that accepts a list of file dicts and writes
-	them one-by-one using an underlying FileWriterTool instance.
+	them to disk in one call.
+
+	The whole batch is validated first (filenames, content encodings, target
+	directories, duplicate targets); the valid files are then written
+	concurrently on a bounded thread pool. Filenames must stay inside their
+	target directory. When several entries target the same file the last one
+	wins and the earlier ones are reported with ``status: "superseded"``. Every file is written to a
+	temporary file next to its target and renamed into place, so readers never
+	see a half-written file. With ``atomic=True`` nothing is written unless
+	every entry is valid, and the renames only happen once every temporary
+	file was written (a failed rename rolls back the ones already done).
+
+	Given the run's `ArtifactOutput`, the tool skips files whose content is
+	already on disk (reported with ``status: "unchanged"``), records what it
+	wrote in the run's content-hash index, and links content the blob store
+	already holds into place instead of writing it again.
 
 	This class subclasses `BaseTool` so it can be added to an Agent's
 	`tools` list and validated by the crewai model.
@@ -21,39 +95,63 @@ class BatchFileWriterTool(BaseTool):
 	# machine-oriented identifier. The runtime will still register the
 	# tool object and the agents will receive this display name.
 	name: str = "Batch File Writer Tool"
-	description: str = "Write multiple files by delegating to the FileWriterTool"
-
-	_writer: Any = None
+	description: str = (
+		"Write multiple files in one call. Pass a JSON array of file objects "
+		"(filename, content or content_b64, directory, overwrite); set atomic=true "
+		"to write all of them or none."
+	)
+
+	_artifact_output: Any = None
+	# Agent using this instance, for the manifest's agent/task columns
+	_agent: Any = None
 	default_directory: Optional[str] = None
 	max_retries: int = 3
+	# Concurrent file writes per batch
+	max_workers: int = int(os.getenv("BATCH_WRITER_WORKERS", "8"))
 
-	def __init__(self, writer=None, default_directory: Optional[str] = None, max_retries: int = 3, **data):
+	def __init__(self, default_directory: Optional[str] = None, max_retries: int = 3, artifact_output=None, **data):
 		super().__init__(**data)
-		self._writer = writer
+		self._artifact_output = artifact_output
 		self.default_directory = default_directory
 		self.max_retries = max_retries
 
-	def _write_single(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+	@staticmethod
+	def _as_bool(value: Any) -> bool:
+		if isinstance(value, str):
+			return value.strip().lower() in ("1", "true", "yes", "y", "on")
+		return bool(value)
+
+	def _prepare(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+		"""Resolve one entry into its target path and content, or an error result.
+
+		Content stays in the form the agent sent it (base64 is not decoded
+		into a second copy); it is hashed here and decoded again chunk by
+		chunk when written.
+		"""
 		filename = payload.get("filename")
 		# Support multiple content encodings to make agents' lives easier. Preferred order:
 		# 1. content_b64: base64-encoded bytes of the content (recommended for large or quote-heavy text)
 		# 2. content with content_encoding == 'base64'
 		# 3. plain content string
-		content = None
+		encoding = "text"
 		if "content_b64" in payload:
-			try:
-				content = base64.b64decode(payload["content_b64"]).decode("utf-8")
-			except Exception as e:
-				return {"filename": filename, "success": False, "path": None, "error": f"Invalid base64 content: {e}"}
+			content, encoding = payload["content_b64"], "base64"
 		elif payload.get("content_encoding") == "base64" and payload.get("content"):
-			try:
-				content = base64.b64decode(payload["content"]).decode("utf-8")
-			except Exception as e:
-				return {"filename": filename, "success": False, "path": None, "error": f"Invalid base64 content: {e}"}
+			content, encoding = payload["content"], "base64"
 		else:
 			content = payload.get("content")
 		if filename is None or content is None:
 			return {"filename": filename, "success": False, "path": None, "error": "Missing filename or content"}
+		if not isinstance(content, str):
+			content = str(content)
+		# One pass over the content: validates base64 and gives hash and size
+		digest, size = hashlib.sha256(), 0
+		try:
+			for data in self._chunks(content, encoding):
+				digest.update(data)
+				size += len(data)
+		except (binascii.Error, ValueError) as e:
+			return {"filename": filename, "success": False, "path": None, "error": f"Invalid base64 content: {e}"}
 
 		directory = payload.get("directory") or self.default_directory
 
@@ -67,84 +165,182 @@ class BatchFileWriterTool(BaseTool):
 		# If we still don't have a directory, fail early with a clear error
 		if directory is None:
 			return {"filename": filename, "success": False, "path": None, "error": "No target directory provided; set 'directory' or configure default_directory for the tool."}
-		requested_overwrite = payload.get("overwrite", None)
-
-		# Prepare kwargs for the underlying writer. Pass directory and overwrite
-		# explicitly so that FileWriterTool._run can see them and create the
-		# target directory before attempting to write.
-		single = {"filename": filename, "content": content}
-		if directory:
-			single["directory"] = directory
-		# Ensure an overwrite key is always present so the underlying
-		# FileWriterTool can safely read it. If caller didn't provide an
-		# explicit value, default to False.
-		single["overwrite"] = requested_overwrite if requested_overwrite is not None else False
 
+		directory = os.path.abspath(directory)
+		path = os.path.abspath(os.path.join(directory, filename))
+		# '../' or an absolute filename would write outside the target directory
+		if path == directory or os.path.commonpath([directory, path]) != directory:
+			return {"filename": filename, "success": False, "path": None, "error": f"Filename {filename!r} resolves outside the target directory {directory}"}
+
+		return {
+			"filename": filename,
+			"content": content,
+			"encoding": encoding,
+			"sha256": digest.hexdigest(),
+			"size": size,
+			"path": path,
+			"overwrite": self._as_bool(payload.get("overwrite", False)),
+		}
+
+	@staticmethod
+	def _chunks(content: str, encoding: str) -> Iterator[bytes]:
+		return iter_b64decoded(content) if encoding == "base64" else iter_encoded(content)
+
+	def _write_temp(self, entry: Dict[str, Any]) -> str:
+		"""Write ``entry``'s content next to its target and return the temp path."""
+		target = entry["path"]
+		os.makedirs(os.path.dirname(target), exist_ok=True)
+		fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(target), prefix=f".{os.path.basename(target)}.", suffix=".tmp")
+		if self._artifact_output is not None and self._artifact_output.link_blob(entry["sha256"], tmp_path, create=False, size=entry["size"]):
+			# Same content as a stored blob: linked instead of written
+			os.close(fd)
+			return tmp_path
+		try:
+			with os.fdopen(fd, "wb") as f:
+				for data in self._chunks(entry["content"], entry["encoding"]):
+					f.write(data)
+		except BaseException:
+			self._discard(tmp_path)
+			raise
+		return tmp_path
+
+	@staticmethod
+	def _discard(path: Optional[str]) -> None:
+		if path:
+			try:
+				os.remove(path)
+			except OSError:
+				pass
+
+	def _unchanged(self, entry: Dict[str, Any]) -> bool:
+		"""True when the target already holds exactly this content."""
+		target = entry["path"]
+		if self._artifact_output is not None and self._artifact_output.recorded_hash(target) == entry["sha256"]:
+			return True
+		try:
+			if os.path.getsize(target) != entry["size"]:
+				return False
+			# Not written by this tool in this run (or modified since): compare on disk
+			digest = hashlib.sha256()
+			with open(target, "rb") as f:
+				for data in iter(lambda: f.read(CHUNK_CHARS), b""):
+					digest.update(data)
+			return digest.hexdigest() == entry["sha256"]
+		except OSError:
+			return False
+
+	def bind_agent(self, agent: Any) -> None:
+		self._agent = agent
+
+	def _record(self, entry: Dict[str, Any]) -> None:
+		if self._artifact_output is None:
+			return
+		# Linked first: recording stats the file as it stays
+		self._artifact_output.link_blob(entry["sha256"], entry["path"])
+		agent, task = artifact_attribution(self._agent)
+		self._artifact_output.record_write(entry["path"], entry["sha256"], agent=agent, task=task)
+
+	def _backoff(self, attempt: int) -> None:
+		time.sleep(0.2 * attempt)
+
+	@staticmethod
+	def _retry_delay(attempt: int) -> float:
+		# Same base delay as the sync path, jittered so concurrent retries
+		# (e.g. several agents hitting a locked file) spread out
+		return 0.2 * attempt * random.uniform(0.5, 1.5)
+
+	def _precheck(self, entry: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+		"""The result for an entry that needs no write, or None."""
+		filename, target = entry["filename"], entry["path"]
+		if os.path.exists(target) and not entry["overwrite"]:
+			# Same outcome the FileWriterTool reports: nothing written, not fatal
+			message = f"File {target} already exists and overwrite option was not passed."
+			return {"filename": filename, "success": True, "status": "exists", "path": target, "error": None, "result": message, "warning": message}
+		if self._unchanged(entry):
+			self._record(entry)
+			return {"filename": filename, "success": True, "status": "unchanged", "path": target, "error": None,
+				"result": f"Content of {target} is unchanged; nothing written", "warning": None}
+		return None
+
+	def _attempt(self, entry: Dict[str, Any], commit: bool) -> Dict[str, Any]:
+		"""One write attempt; raises on failure."""
+		filename, target = entry["filename"], entry["path"]
+		tmp_path = None
+		try:
+			tmp_path = self._write_temp(entry)
+			if not commit:
+				return {"filename": filename, "success": True, "path": target, "error": None, "tmp_path": tmp_path}
+			os.replace(tmp_path, target)
+		except BaseException:
+			self._discard(tmp_path)
+			raise
+		self._record(entry)
+		warning = "Caller requested overwrite; existing file was replaced if present" if entry["overwrite"] else None
+		return {"filename": filename, "success": True, "status": "written", "path": target, "error": None, "result": f"Content successfully written to {target}", "warning": warning}
+
+	def _write_file(self, entry: Dict[str, Any], commit: bool = True) -> Dict[str, Any]:
+		"""Write one prepared entry, retrying up to ``max_retries`` times.
+
+		With ``commit=False`` the content is only written to a temporary file
+		(returned as ``tmp_path``) for the caller to rename into place.
+		"""
+		done = self._precheck(entry)
+		if done is not None:
+			return done
 		attempt = 0
 		last_error = None
 		while attempt <= self.max_retries:
 			try:
-				# The FileWriterTool provides a `run` method; call it directly.
-				# This keeps the behavior simple and matches the tool in
-				# site-packages/crewai_tools.
-				result = self._writer.run(**single)
-
-				# Normalize reported path to an absolute path for clarity.
-				if directory:
-					written_path = os.path.abspath(os.path.join(directory, filename))
-				else:
-					written_path = os.path.abspath(filename)
-				warning = None
-				returned_result = result
-
-				# The wrapped FileWriterTool returns human-readable strings. Try to
-				# detect common cases and surface them in structured fields.
-				if isinstance(result, str):
-					low = result.lower()
-					# If the underlying writer mentions 'overwrite' or 'already exists'
-					# treat that as a warning (not fatal) unless caller requested
-					# overwrite explicitly.
-					if "overwrite" in low or "already exists" in low:
-						warning = result
-						# leave returned_result as the original string so callers can
-						# inspect it if needed.
-
-				# If caller requested overwrite, but the underlying writer didn't
-				# report anything, add a gentle note so users understand the
-				# writer was instantiated with overwrite enabled.
-				if requested_overwrite and warning is None:
-					warning = "Caller requested overwrite; file_write_tool_initialized with allow_overwrite=True"
-
-				return {"filename": filename, "success": True, "path": written_path, "error": None, "result": returned_result, "warning": warning}
+				return self._attempt(entry, commit)
 			except Exception as e:
 				last_error = str(e)
 				attempt += 1
-				# Prefer non-blocking asyncio sleep when running outside an
-				# active event loop; if an event loop is already running we
-				# cannot await here in this synchronous function, so fall
-				# back to a short blocking sleep. This keeps the retry
-				# behavior safe for both sync and async call sites. If you
-				# want fully non-blocking retries, we should add async
-				# versions of these methods.
-				try:
-					import asyncio
-					loop = asyncio.get_running_loop()
-					# If we're here, an event loop is running; avoid trying to
-					# schedule awaits from sync code — use blocking sleep.
-					time.sleep(0.2 * attempt)
-				except RuntimeError:
-					# No running loop — use asyncio.run to perform a non-blocking
-					# sleep (this will block the thread briefly while running
-					# the coroutine, but avoids importing asyncio.sleep into
-					# already-running loops).
-					import asyncio
-					asyncio.run(asyncio.sleep(0.2 * attempt))
-		return {"filename": filename, "success": False, "path": None, "error": last_error}
-
-	def run(self, files: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-		# Accept either an already-deserialized list, or a string that contains
-		# a JSON array. Models sometimes return the JSON array as text; try to
-		# extract and parse it robustly.
+				if attempt <= self.max_retries:
+					self._backoff(attempt)
+		return {"filename": entry["filename"], "success": False, "path": None, "error": last_error}
+
+	async def _awrite_file(self, entry: Dict[str, Any], commit: bool = True) -> Dict[str, Any]:
+		"""Async `_write_file`: file I/O runs in a thread, backoff is awaited."""
+		done = await asyncio.to_thread(self._precheck, entry)
+		if done is not None:
+			return done
+		attempt = 0
+		last_error = None
+		while attempt <= self.max_retries:
+			try:
+				return await asyncio.to_thread(self._attempt, entry, commit)
+			except Exception as e:
+				last_error = str(e)
+				attempt += 1
+				if attempt <= self.max_retries:
+					await asyncio.sleep(self._retry_delay(attempt))
+		return {"filename": entry["filename"], "success": False, "path": None, "error": last_error}
+
+	def _write_single(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+		entry = self._prepare(payload)
+		if "success" in entry:
+			return entry
+		return self._write_file(entry)
+
+	@staticmethod
+	def _parse_files(files: Any) -> List[Dict[str, Any]]:
+		"""The file dicts of a list, or of a string or file holding a JSON array.
+
+		Strings and files are parsed element by element, without a copy of the
+		array text. Every entry is still kept until the batch is written, because
+		the whole batch is validated first. Peak memory above the argument is
+		therefore about the total size of the entries, not one chunk. Text the
+		incremental parser rejects goes to the regex/json/ast fallback, which
+		parses the whole array again and adds a copy of its text.
+		"""
+		# Models sometimes return the JSON array as text; try to extract and
+		# parse it robustly.
+		if isinstance(files, str) or hasattr(files, "read"):
+			try:
+				files = list(iter_json_array(files))
+			except ValueError:
+				if not isinstance(files, str):
+					raise ValueError("BatchFileWriterTool could not parse the provided input as a JSON array.")
 		if isinstance(files, str):
 			# Try to find the first JSON array substring in the string.
 			m = re.search(r"(\[.*\])", files, flags=re.DOTALL)
@@ -171,6 +367,7 @@ class BatchFileWriterTool(BaseTool):
 		# payload accidentally produces a list of strings instead of a list
 		# of dicts). Raising a descriptive TypeError makes debugging much
 		# faster than letting downstream code fail with obscure messages.
+		items: List[Dict[str, Any]] = []
 		for idx, item in enumerate(files):
 			# If model returned items as strings, attempt to parse each element.
 			if not isinstance(item, dict):
@@ -195,16 +392,186 @@ class BatchFileWriterTool(BaseTool):
 						f"BatchFileWriterTool: expected dict for files[{idx}], got {type(item).__name__}. "
 						"Each entry must be a dict with keys: filename, content, (optional) directory, (optional) overwrite."
 				)
-		results: List[Dict[str, Any]] = []
-		for item in files:
-			results.append(self._write_single(item))
-		return results
-
-	def __call__(self, files: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-		return self.run(files)
+			items.append(item)
+		return items
+
+	def _validate(self, items: List[Dict[str, Any]], atomic: bool) -> List[Dict[str, Any]]:
+		"""Prepare every entry.
+
+		Entries that need no write already hold their result (they have a
+		``success`` key): invalid ones, and earlier entries for a file a later
+		entry replaces.
+		"""
+		entries = [self._prepare(item) for item in items]
+		seen: Dict[str, int] = {}
+		for idx, entry in enumerate(entries):
+			if "success" in entry:
+				continue
+			# Two entries for the same file would race; written one after the
+			# other the last one wins, so only that one is written
+			key = os.path.normcase(entry["path"])
+			if key in seen:
+				earlier = seen[key]
+				entries[earlier] = {"filename": entries[earlier]["filename"], "success": True, "status": "superseded",
+									"path": entry["path"], "error": None, "superseded_by": idx,
+									"result": f"Superseded by files[{idx}] for the same path", "warning": None}
+			seen[key] = idx
+			if atomic and os.path.exists(entry["path"]) and not entry["overwrite"]:
+				entries[idx] = {"filename": entry["filename"], "success": False, "path": None,
+								"error": f"File {entry['path']} already exists and overwrite option was not passed."}
+		return entries
+
+	def _map(self, fn, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+		if len(entries) <= 1:
+			return [fn(entry) for entry in entries]
+		with ThreadPoolExecutor(max_workers=min(self.max_workers, len(entries)), thread_name_prefix="batch-writer") as pool:
+			return list(pool.map(fn, entries))
+
+	def _commit(self, written: List[Dict[str, Any]], entries: List[Dict[str, Any]]) -> Optional[str]:
+		"""Rename every temp file into place; undo all renames if one fails."""
+		done = []  # (target, backup of the replaced file or None)
+		try:
+			for result in written:
+				target = result["path"]
+				backup = None
+				if os.path.exists(target):
+					backup = f"{result['tmp_path']}.bak"
+					try:
+						os.link(target, backup)
+					except OSError:
+						shutil.copy2(target, backup)
+				os.replace(result["tmp_path"], target)
+				done.append((target, backup))
+		except Exception as e:
+			for target, backup in reversed(done):
+				try:
+					if backup:
+						os.replace(backup, target)
+					else:
+						os.remove(target)
+				except OSError:
+					pass
+			for result in written:
+				self._discard(result["tmp_path"])
+				self._discard(f"{result['tmp_path']}.bak")
+			return str(e)
+		for _target, backup in done:
+			self._discard(backup)
+		for entry in entries:
+			self._record(entry)
+		return None
+
+	@staticmethod
+	def _pending(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+		"""The entries that still have to be written."""
+		return [entry for entry in entries if "success" not in entry]
+
+	@staticmethod
+	def _merge(entries: List[Dict[str, Any]], written: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+		"""Results in input order: the validation results plus the write results.
+
+		A superseded entry shares the outcome of the entry that replaced it.
+		"""
+		results = iter(written)
+		merged = [entry if "success" in entry else next(results) for entry in entries]
+		# Later entries first, so a chain of entries for one path resolves
+		for idx in reversed(range(len(merged))):
+			result = merged[idx]
+			if result.get("status") == "superseded" and not merged[result["superseded_by"]]["success"]:
+				merged[idx] = {"filename": result["filename"], "success": False, "path": None,
+							   "error": f"Not written: files[{result['superseded_by']}] for the same path failed"}
+		return merged
+
+	@staticmethod
+	def _rejected(entries: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+		"""For an atomic batch with invalid entries: the all-failed results."""
+		if all(entry.get("success", True) for entry in entries):
+			return None
+		return [entry if not entry.get("success", True) else
+				{"filename": entry["filename"], "success": False, "path": None, "error": "Not written: the batch has invalid entries"}
+				for entry in entries]
+
+	def _finish_atomic(self, entries: List[Dict[str, Any]], written: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+		"""Commit the staged files of an atomic batch, or discard them if any failed."""
+		staged = [result for result in written if "tmp_path" in result]
+		failed = next((result["error"] for result in written if not result["success"]), None)
+		if failed is None:
+			failed = self._commit(staged, [entry for entry, result in zip(entries, written) if "tmp_path" in result])
+		else:
+			for result in staged:
+				self._discard(result["tmp_path"])
+		if failed is not None:
+			return [result if not result["success"] else
+					{"filename": result["filename"], "success": False, "path": None, "error": f"Not written: batch rolled back ({failed})"}
+					for result in written]
+		return [{"filename": result["filename"], "success": True, "status": "written", "path": result["path"], "error": None,
+				 "result": f"Content successfully written to {result['path']}", "warning": None}
+				if "tmp_path" in result else result
+				for result in written]
+
+	def _save_manifest(self) -> None:
+		if self._artifact_output is None:
+			return
+		try:
+			self._artifact_output.save_manifest()
+		except OSError as e:
+			print(f"Warning: could not save the artifact manifest: {e}")
 
-	def _run(self, files: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-		return self.run(files)
+	def run(self, files: List[Dict[str, Any]], atomic: bool = False) -> List[Dict[str, Any]]:
+		try:
+			return self._run_batch(files, atomic)
+		finally:
+			self._save_manifest()
+
+	def _run_batch(self, files: List[Dict[str, Any]], atomic: bool) -> List[Dict[str, Any]]:
+		atomic = self._as_bool(atomic)
+		entries = self._validate(self._parse_files(files), atomic)
+		pending = self._pending(entries)
+		if not atomic:
+			return self._merge(entries, self._map(self._write_file, pending))
+
+		# All-or-nothing: stop before touching the disk if any entry is invalid
+		rejected = self._rejected(entries)
+		if rejected is not None:
+			return rejected
+		written = self._map(lambda entry: self._write_file(entry, commit=False), pending)
+		return self._merge(entries, self._finish_atomic(pending, written))
+
+	async def _arun(self, files: List[Dict[str, Any]], atomic: bool = False) -> List[Dict[str, Any]]:
+		"""Async entry point used by CrewAI's async execution paths.
+
+		Same results as `run`, but the event loop is never blocked: files are
+		written in worker threads (at most ``max_workers`` at once) and retry
+		backoff is awaited with jitter, so other agents' work overlaps it.
+		"""
+		try:
+			return await self._arun_batch(files, atomic)
+		finally:
+			await asyncio.to_thread(self._save_manifest)
+
+	async def _arun_batch(self, files: List[Dict[str, Any]], atomic: bool) -> List[Dict[str, Any]]:
+		atomic = self._as_bool(atomic)
+		entries = await asyncio.to_thread(lambda: self._validate(self._parse_files(files), atomic))
+		slots = asyncio.Semaphore(self.max_workers)
+
+		async def write(entry: Dict[str, Any]) -> Dict[str, Any]:
+			async with slots:
+				return await self._awrite_file(entry, commit=not atomic)
+
+		pending = self._pending(entries)
+		if not atomic:
+			return self._merge(entries, await asyncio.gather(*(write(entry) for entry in pending)))
+		rejected = self._rejected(entries)
+		if rejected is not None:
+			return rejected
+		written = await asyncio.gather(*(write(entry) for entry in pending))
+		return self._merge(entries, await asyncio.to_thread(self._finish_atomic, pending, written))
+
+	def __call__(self, files: List[Dict[str, Any]], atomic: bool = False) -> List[Dict[str, Any]]:
+		return self.run(files, atomic)
+
+	def _run(self, files: List[Dict[str, Any]], atomic: bool = False) -> List[Dict[str, Any]]:
+		return self.run(files, atomic)
 
 class WebSearchTool(BaseTool):
     """A CrewAI-compatible tool that performs web searches using an underlying search API.
@@ -251,14 +618,12 @@ class Base64EncodeTool(BaseTool):
 
 	def run(self, text: Any) -> Dict[str, Any]:
 		try:
-			if isinstance(text, str):
-				raw = text.encode("utf-8")
-			elif isinstance(text, (bytes, bytearray)):
-				raw = bytes(text)
+			if isinstance(text, (bytes, bytearray)):
+				encoded = base64.b64encode(text).decode("ascii")
 			else:
-				# Try to stringify non-string inputs
-				raw = str(text).encode("utf-8")
-			encoded = base64.b64encode(raw).decode("ascii")
+				# Encoded chunk by chunk: no full UTF-8 copy of the text.
+				# Non-string inputs are stringified.
+				encoded = b64encode_text(text if isinstance(text, str) else str(text))
 			return {"success": True, "content_b64": encoded}
 		except Exception as e:
 			return {"success": False, "error": str(e)}
@@ -266,4 +631,40 @@ class Base64EncodeTool(BaseTool):
 		# BaseTool subclasses often require an _run implementation.
 		# Delegate to run() for convenience so both sync and runtime
 		# call paths work.
-		return self.run(text)
\ No newline at end of file
+		return self.run(text)
+
+
+class ArtifactManifestTool(BaseTool):
+	"""Look up the files produced so far in this run from the artifact manifest.
+
+	Cheaper than listing and reading the output directory: every file the
+	write tools produced is recorded with its size, sha256, mtime and the
+	agent/task that wrote it.
+	"""
+
+	name: str = "artifact-manifest"
+	description: str = (
+		"List the files written so far in this run with size, sha256, agent and task. "
+		"Pass a path (relative to the output directory) for one file or a folder prefix, or nothing for all files."
+	)
+
+	_artifact_output: Any = None
+
+	def __init__(self, artifact_output=None, **data):
+		super().__init__(**data)
+		self._artifact_output = artifact_output
+
+	def run(self, path: str = "") -> Dict[str, Any]:
+		if self._artifact_output is None:
+			return {"success": False, "error": "No artifact output configured."}
+		path = (path or "").strip()
+		if path:
+			entry = self._artifact_output.artifact(path)
+			if entry is not None:
+				return {"success": True, "files": [entry]}
+		prefix = self._artifact_output.relative_path(path).rstrip("/") + "/" if path else ""
+		files = [entry for key, entry in sorted(self._artifact_output.manifest().items()) if key.startswith(prefix)]
+		return {"success": True, "files": files}
+
+	def _run(self, path: str = "") -> Dict[str, Any]:
+		return self.run(path)
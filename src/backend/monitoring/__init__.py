@@ -2,15 +2,25 @@
 
 Exports:
  - orchestrator.run_with_monitoring(...) to start forwarding and run the Crew.
+ - scheduler.RunScheduler to execute several monitored runs concurrently.
+ - orchestrator.RunnerResources to reuse LLM, tools and MCP server across runs.
 """
 
-from .orchestrator import run_with_monitoring
-from .forwarder import redis_forwarder, start_loop_in_thread
+from .orchestrator import RunnerResources, run_with_monitoring
+from .event_queue import EventQueue
+from .forwarder import PublishStats, redis_forwarder, start_loop_in_thread
 from .listener import setup_listeners
+from .scheduler import RunScheduler
+from .spool import EventSpool
 
 __all__ = [
     "run_with_monitoring",
+    "RunScheduler",
+    "RunnerResources",
     "redis_forwarder",
+    "PublishStats",
+    "EventQueue",
+    "EventSpool",
     "start_loop_in_thread",
     "setup_listeners"
 ]
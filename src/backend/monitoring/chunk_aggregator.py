@@ -0,0 +1,94 @@
+"""Coalesces streamed LLM tokens into time/size-bounded frames.
+
+`LLMStreamChunkEvent` fires once per token. `ChunkAggregator` buffers
+consecutive chunks of the same stream and emits a single `llm_stream_chunk`
+payload (with the concatenated ``chunk`` text and a ``chunk_count``) when:
+
+ - ``window`` seconds have passed since the first buffered chunk,
+ - the buffered text reaches ``max_bytes``,
+ - a tool-call chunk arrives on the stream (it is emitted on its own), or
+ - `flush()` is called, e.g. when the LLM call completes or fails.
+
+Chunks are added from CrewAI worker threads; the window timer runs on the
+forwarder's event loop.
+"""
+import asyncio
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+
+class _PendingFrame:
+    __slots__ = ("payload", "parts", "size", "generation")
+
+    def __init__(self, payload: Dict[str, Any], generation: int):
+        self.payload = payload
+        self.parts: List[str] = []
+        self.size = 0
+        self.generation = generation
+
+
+class ChunkAggregator:
+    """Merge consecutive stream chunks per stream key into frames."""
+
+    def __init__(self,
+                 loop: asyncio.AbstractEventLoop,
+                 push: Callable[[Dict[str, Any]], None],
+                 window: float = 0.05,
+                 max_bytes: int = 2048):
+        self._loop = loop
+        self._push = push
+        self.window = window
+        self.max_bytes = max_bytes
+        self._frames: Dict[Hashable, _PendingFrame] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def add(self, key: Hashable, payload: Dict[str, Any]) -> None:
+        """Buffer one chunk payload for the stream identified by key."""
+        chunk = payload.get("chunk")
+        with self._lock:
+            if payload.get("tool_call") or not isinstance(chunk, str):
+                # Tool calls are structured; never merge them with text
+                self._flush_locked(key)
+                self._push(payload)
+                return
+            frame = self._frames.get(key)
+            if frame is None:
+                self._generation += 1
+                frame = _PendingFrame(payload, self._generation)
+                self._frames[key] = frame
+                self._schedule(key, frame.generation)
+            frame.parts.append(chunk)
+            frame.size += len(chunk.encode("utf-8"))
+            if frame.size >= self.max_bytes:
+                self._flush_locked(key)
+
+    def flush(self, key: Optional[Hashable] = None) -> None:
+        """Emit the buffered frame for key, or for every stream if key is None."""
+        with self._lock:
+            keys = [key] if key is not None else list(self._frames)
+            for k in keys:
+                self._flush_locked(k)
+
+    def _schedule(self, key: Hashable, generation: int) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._loop.call_later, self.window, self._flush_expired, key, generation)
+        except RuntimeError:
+            # Loop already closed (shutdown); the next flush() emits the frame
+            pass
+
+    def _flush_expired(self, key: Hashable, generation: int) -> None:
+        with self._lock:
+            frame = self._frames.get(key)
+            # Ignore timers for frames that were already flushed by size/tool call
+            if frame is not None and frame.generation == generation:
+                self._flush_locked(key)
+
+    def _flush_locked(self, key: Hashable) -> None:
+        frame = self._frames.pop(key, None)
+        if frame is None:
+            return
+        payload = dict(frame.payload)
+        payload["chunk"] = "".join(frame.parts)
+        payload["chunk_count"] = len(frame.parts)
+        self._push(payload)
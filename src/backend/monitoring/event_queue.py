@@ -0,0 +1,90 @@
+"""Bounded event queue between the listeners and the Redis forwarder.
+
+`EventQueue` is a drop-in `asyncio.Queue` with a fixed capacity and a per
+event-type priority. When it is full:
+
+ - droppable events (stream chunks by default) are merged into the newest
+   queued chunk of the same stream if possible, otherwise discarded;
+ - any other (lifecycle) event evicts the oldest queued droppable event and is
+   never dropped itself.
+
+Lifecycle events may push the queue past its capacity only when nothing
+droppable is left to evict. They are rare compared to stream chunks, so memory
+stays flat even while Redis is unavailable for long periods.
+"""
+import asyncio
+from typing import Any, Dict, Iterable, Optional
+
+
+DEFAULT_DROPPABLE_EVENT_TYPES = frozenset({"llm_stream_chunk"})
+# Droppable event types whose consecutive payloads can be merged
+COALESCIBLE_EVENT_TYPES = frozenset({"llm_stream_chunk"})
+
+
+def _event_type(item: Any) -> Optional[str]:
+    return item.get("type") if isinstance(item, dict) else None
+
+
+class EventQueue(asyncio.Queue):
+    """asyncio.Queue with bounded capacity and drop/coalesce policy for low-priority events."""
+
+    def __init__(self, capacity: int = 10000, droppable_types: Optional[Iterable[str]] = None):
+        # The underlying queue is unbounded; capacity is enforced in put_nowait
+        # so lifecycle events are never rejected.
+        super().__init__()
+        self.capacity = capacity
+        self.droppable_types = frozenset(droppable_types) if droppable_types is not None else DEFAULT_DROPPABLE_EVENT_TYPES
+        self.dropped = 0
+        self.coalesced = 0
+        self.dropped_by_type: Dict[str, int] = {}
+
+    def put_nowait(self, item: Any) -> None:
+        if self.qsize() >= self.capacity:
+            event_type = _event_type(item)
+            if event_type in self.droppable_types:
+                if not self._coalesce(item):
+                    self._record_drop(event_type)
+                return
+            self._evict_droppable()
+        super().put_nowait(item)
+
+    def _coalesce(self, item: Dict[str, Any]) -> bool:
+        """Append item's chunk to the newest queued chunk of the same stream."""
+        if item.get("type") not in COALESCIBLE_EVENT_TYPES or not self._queue:
+            return False
+        last = self._queue[-1]
+        if _event_type(last) != item.get("type"):
+            return False
+        if last.get("llm_name") != item.get("llm_name") or last.get("tool_call") or item.get("tool_call"):
+            return False
+        merged = dict(last)
+        merged["chunk"] = (last.get("chunk") or "") + (item.get("chunk") or "")
+        self._queue[-1] = merged
+        self.coalesced += 1
+        return True
+
+    def _evict_droppable(self) -> None:
+        """Remove the oldest queued droppable event, if there is one."""
+        for index, queued in enumerate(self._queue):
+            event_type = _event_type(queued)
+            if event_type in self.droppable_types:
+                del self._queue[index]
+                # Keep join()/task_done() accounting consistent
+                self.task_done()
+                self._record_drop(event_type)
+                return
+
+    def _record_drop(self, event_type: Optional[str]) -> None:
+        self.dropped += 1
+        key = event_type or "unknown"
+        self.dropped_by_type[key] = self.dropped_by_type.get(key, 0) + 1
+
+    def metrics(self) -> Dict[str, Any]:
+        """Snapshot of queue counters for the monitoring metrics event."""
+        return {
+            "queued": self.qsize(),
+            "capacity": self.capacity,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "dropped_by_type": dict(self.dropped_by_type),
+        }
@@ -1,68 +1,357 @@
 """Redis forwarder: publishes JSON messages from an asyncio.Queue to a Redis channel.
 
 Uses the `redis.asyncio` client. The queue should yield dict-like messages which
-will be JSON-serialized. Sending `None` signals shutdown.
+will be JSON-serialized here (off the crew thread) and published in pipelined
+batches. Sending `None`
+signals shutdown.
+
+When a Redis Stream is configured every event is also appended to it (capped
+with ``MAXLEN ~``) so the bridge can replay history to clients that connect
+late or reconnect. The XADD and PUBLISH run in one server-side script that
+splices the new entry id into the published event as ``stream_id``.
 """
-from typing import Any
+from typing import Any, Callable, Dict, List, Optional, Tuple
 import asyncio
-import json
+import os
+import time
 from datetime import datetime
 
 import redis.asyncio as aioredis
 
+from .serialization import dumps
+from .spool import LOCK_FILE, EventSpool, SpoolBusy
+
+
+# KEYS[1] = channel, KEYS[2] = stream; ARGV[1] = event JSON, ARGV[2] = maxlen
+_XADD_PUBLISH = """
+local id = redis.call('XADD', KEYS[2], 'MAXLEN', '~', ARGV[2], '*', 'data', ARGV[1])
+local data = ARGV[1]
+local body
+if #data > 2 then body = ',' .. string.sub(data, 2) else body = '}' end
+redis.call('PUBLISH', KEYS[1], '{"stream_id":"' .. id .. '"' .. body)
+return id
+"""
+
+
+class PublishStats:
+    """Running count of published events and the achieved publish rate."""
+
+    def __init__(self):
+        self.published = 0
+        self.batches = 0
+        self._window_start = time.monotonic()
+        self._window_count = 0
+
+    def record(self, count: int) -> None:
+        self.published += count
+        self.batches += 1
+        self._window_count += count
+
+    def window_elapsed(self) -> float:
+        return time.monotonic() - self._window_start
+
+    def roll(self) -> float:
+        """Return events/sec since the previous roll and start a new window."""
+        elapsed = self.window_elapsed()
+        rate = self._window_count / elapsed if elapsed > 0 else 0.0
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        return rate
+
+
+async def _next_batch(queue: asyncio.Queue, max_batch: int, linger: float) -> Tuple[List[Any], bool]:
+    """Wait for one message, then drain whatever else is available.
+
+    After the first message, waits up to ``linger`` seconds for the batch to
+    fill. Returns the batch and whether the shutdown sentinel was seen.
+    """
+    msg = await queue.get()
+    if msg is None:
+        return [], True
+    batch = [msg]
+    deadline = asyncio.get_running_loop().time() + linger
+    while len(batch) < max_batch:
+        try:
+            msg = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                break
+            try:
+                msg = await asyncio.wait_for(queue.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+        if msg is None:
+            return batch, True
+        batch.append(msg)
+    return batch, False
+
+
+def _metrics_event(queue: asyncio.Queue,
+                   stats: PublishStats,
+                   rate: float,
+                   spool: Optional[EventSpool] = None) -> Dict[str, Any]:
+    """Build the periodic `monitoring_metrics` event (queue counters + publish rate)."""
+    event = {
+        "type": "monitoring_metrics",
+        "timestamp": datetime.now(),
+        "published": stats.published,
+        "events_per_sec": round(rate, 1),
+    }
+    if hasattr(queue, "metrics"):
+        event.update(queue.metrics())
+    if spool is not None:
+        event["spooled"] = spool.spooled
+        event["replayed"] = spool.replayed
+    return event
+
+
+def _run_tag(run_id: Optional[str]) -> bytes:
+    """The ``"run_id":...,`` member spliced into every event of a run."""
+    return b'"run_id":' + dumps(run_id) + b"," if run_id else b""
+
+
+def _encode(msg: Any, tag: bytes = b"") -> Optional[bytes]:
+    """Serialize a queued event; returns None (and logs) if it can't be encoded.
+
+    ``tag`` (see `_run_tag`) is spliced in as the first member of the object so
+    the bridge can read it without decoding the event.
+    """
+    try:
+        data = dumps(msg)
+        if tag and data[:1] == b"{":
+            data = b"{" + (tag + data[1:] if len(data) > 2 else tag[:-1] + b"}")
+        return data
+    except Exception as e:
+        event_type = msg.get("type") if isinstance(msg, dict) else type(msg).__name__
+        print(f"[forwarder] Failed to serialize '{event_type}' event, skipping: {e}")
+        return None
 
-class DateTimeEncoder(json.JSONEncoder):
-    """Custom JSON encoder that handles datetime objects and other non-serializable types."""
-    def default(self, obj: Any) -> Any:
-        if isinstance(obj, datetime):
-            return obj.isoformat()
-        # For any other non-serializable object, convert to string
-        # This includes TokenCalcHandler, custom objects, etc.
-        return str(obj)
 
+def _encode_all(messages: List[Any], tag: bytes = b"") -> List[bytes]:
+    return [data for data in (_encode(msg, tag) for msg in messages) if data is not None]
 
-async def redis_forwarder(queue: asyncio.Queue, redis_url: str, channel: str):
+
+def _drain_to_spool(queue: asyncio.Queue, spool: EventSpool, tag: bytes = b"") -> bool:
+    """Move everything currently queued to the spool tail; True if shutdown was requested."""
+    stopping = False
+    while True:
+        try:
+            msg = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            break
+        if msg is None:
+            stopping = True
+            continue
+        data = _encode(msg, tag)
+        if data is not None:
+            spool.append(data)
+    spool.flush()
+    return stopping
+
+
+async def _spool_for(queue: asyncio.Queue, spool: EventSpool, duration: float, tag: bytes = b"") -> bool:
+    """Write incoming messages to the spool for `duration` seconds (Redis is down).
+
+    Returns True as soon as the shutdown sentinel is seen.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + duration
+    try:
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            try:
+                msg = await asyncio.wait_for(queue.get(), remaining)
+            except asyncio.TimeoutError:
+                return False
+            if msg is None:
+                return True
+            data = _encode(msg, tag)
+            if data is not None:
+                spool.append(data)
+            if _drain_to_spool(queue, spool, tag):
+                return True
+    finally:
+        spool.flush()
+
+
+async def _close_client(client: Any) -> None:
+    try:
+        await client.close()
+    except Exception:
+        pass
+
+
+async def redis_forwarder(queue: asyncio.Queue,
+                          redis_url: str,
+                          channel: str,
+                          max_batch: int = 500,
+                          linger: float = 0.0,
+                          stats: Optional[PublishStats] = None,
+                          stats_interval: float = 30.0,
+                          spool: Optional[EventSpool] = None,
+                          stream: Optional[str] = None,
+                          stream_maxlen: int = 100000,
+                          run_id: Optional[str] = None,
+                          per_run_channel: bool = True):
     """Continuously publish messages from the queue to redis channel.
 
-    Retries on connection failure with exponential backoff.
+    Messages are drained from the queue in batches of up to ``max_batch`` and
+    sent in a single pipeline round trip. ``linger`` (seconds) lets a batch
+    wait briefly for more messages. The achieved publish rate is printed every
+    ``stats_interval`` seconds (0 disables it), together with a
+    `monitoring_metrics` event carrying the queue's dropped/coalesced counts.
+
+    Retries on connection failure with exponential backoff. A batch that fails
+    to publish is resent first after reconnecting. When a ``spool`` is given,
+    messages are written to disk while Redis is unreachable and replayed in
+    order once it is back; live messages queue up behind the spooled ones.
+    On shutdown during an outage the spool is left on disk for
+    `replay_leftover_spools`.
+
+    With a ``stream`` name, events are also appended to that Redis Stream
+    (trimmed to roughly ``stream_maxlen`` entries) for history replay.
+
+    With a ``run_id``, every event is tagged with it and, unless
+    ``per_run_channel`` is False, published on the run's own channel,
+    ``<channel>:<run_id>``.
     """
+    stats = stats or PublishStats()
+    tag = _run_tag(run_id)
+    if run_id and per_run_channel:
+        channel = f"{channel}:{run_id}"
+    pending: List[bytes] = []
+    from_spool = False
+    stopping = False
     backoff = 1
     while True:
+        client = None
         try:
             client = aioredis.from_url(redis_url)
             # Test connection
             await client.ping()
-            print(f"[forwarder] Connected to Redis at {redis_url}, publishing on '{channel}'")
+            xadd_publish = client.register_script(_XADD_PUBLISH) if stream else None
+            print(f"[forwarder] Connected to Redis at {redis_url}, publishing on '{channel}'"
+                  + (f" (history in stream '{stream}')" if stream else ""))
             backoff = 1
             while True:
-                msg = await queue.get()
-                if msg is None:
+                if not pending and spool is not None and not spool.empty:
+                    # Replay the backlog first, keeping live events behind it
+                    pending, from_spool = spool.read_batch(max_batch), True
+                    stopping = _drain_to_spool(queue, spool, tag) or stopping
+                elif not pending and not stopping:
+                    batch, stopping = await _next_batch(queue, max_batch, linger)
+                    pending, from_spool = _encode_all(batch, tag), False
+                if pending:
+                    pipe = client.pipeline(transaction=False)
+                    for data in pending:
+                        if xadd_publish is not None:
+                            await xadd_publish(keys=[channel, stream], args=[data, stream_maxlen], client=pipe)
+                        else:
+                            pipe.publish(channel, data)
+                    await pipe.execute()
+                    if from_spool:
+                        spool.commit()
+                    stats.record(len(pending))
+                    pending = []
+                if stats_interval and stats.window_elapsed() >= stats_interval:
+                    metrics = _metrics_event(queue, stats, stats.roll(), spool)
+                    print(f"[forwarder] {stats.published} events published ({metrics['events_per_sec']} events/s, "
+                          f"{metrics.get('dropped', 0)} dropped, {metrics.get('coalesced', 0)} coalesced)")
+                    # Published with the next batch
+                    pending, from_spool = _encode_all([metrics], tag), False
+                if stopping and not pending and (spool is None or spool.empty):
                     # Shutdown signal
-                    await client.close()
                     return
-                try:
-                    await client.publish(channel, json.dumps(msg, cls=DateTimeEncoder))
-                except Exception as e:
-                    print(f"[forwarder] Error publishing to Redis, will reconnect: {e}")
-                    # Re-enqueue and break to reconnect
-                    await queue.put(msg)
-                    break
         except Exception as e:
+            # Each attempt has its own client: free its connection pool now,
+            # or a long outage leaks one per retry
+            if client is not None:
+                await _close_client(client)
+                client = None
             print(f"[forwarder] Redis connection/publish failed: {e}; retrying in {backoff}s")
-            await asyncio.sleep(backoff)
+            if spool is None:
+                await asyncio.sleep(backoff)
+            else:
+                # Spooled batches are still in the spool (not committed)
+                if pending and not from_spool:
+                    spool.append_many(pending)
+                pending = []
+                if stopping or await _spool_for(queue, spool, backoff, tag):
+                    _drain_to_spool(queue, spool, tag)
+                    spool.close()
+                    print(f"[forwarder] Redis unavailable at shutdown; events spooled to {spool.directory}")
+                    return
             backoff = min(backoff * 2, 30)
+        finally:
+            if client is not None:
+                await _close_client(client)
+
+
+def replay_leftover_spools(base: str,
+                           redis_url: str,
+                           channel: str,
+                           skip: Optional[Callable[[str], bool]] = None,
+                           **options: Any) -> int:
+    """Publish the events that finished runs left in their spools under ``base``.
+
+    Every sub-directory of ``base`` is the spool of one run, named after its
+    run id (see `RunScheduler`). Spools still open in a live run and names
+    for which ``skip`` returns True are left alone. The others are replayed
+    on their run's channel (``options`` are passed to `redis_forwarder`) and
+    removed once empty; while Redis is unreachable they stay for the next
+    call. Returns the number of events replayed.
+    """
+    try:
+        names = sorted(os.listdir(base))
+    except OSError:
+        return 0
+    replayed = 0
+    for name in names:
+        path = os.path.join(base, name)
+        if not os.path.isdir(path) or (skip is not None and skip(name)):
+            continue
+        try:
+            spool = EventSpool(path)
+        except SpoolBusy:
+            continue
+        try:
+            if not spool.empty:
+                # Only the shutdown sentinel: publish the spool, then stop
+                queue: asyncio.Queue = asyncio.Queue()
+                queue.put_nowait(None)
+                asyncio.run(redis_forwarder(queue, redis_url, channel, spool=spool, run_id=name,
+                                            stats_interval=0, **options))
+                replayed += spool.replayed
+        finally:
+            spool.close()
+        if spool.empty:
+            try:
+                os.remove(os.path.join(path, LOCK_FILE))
+                os.rmdir(path)
+            except OSError:
+                pass
+    if replayed:
+        print(f"[forwarder] replayed {replayed} events left in the spools of earlier runs")
+    return replayed
 
 
 def start_loop_in_thread(loop: asyncio.AbstractEventLoop, coro: Any) -> Any:
     """Run coro (an awaitable) on loop in a new daemon thread and return the thread.
 
-    This helper sets the event loop and runs until the coroutine completes.
+    This helper sets the event loop and runs until the coroutine completes,
+    then closes the loop.
     """
     import threading
 
     def _run():
         asyncio.set_event_loop(loop)
-        loop.run_until_complete(coro)
+        try:
+            loop.run_until_complete(coro)
+        finally:
+            loop.close()
 
     t = threading.Thread(target=_run, daemon=True)
     t.start()
@@ -19,13 +19,24 @@ from crewai.events.event_bus import CrewAIEventsBus
 
 def setup_listeners(loop: asyncio.AbstractEventLoop, 
                     queue: asyncio.Queue, 
-                    crewai_event_bus: CrewAIEventsBus) -> None:
+                    crewai_event_bus: CrewAIEventsBus,
+                    delta_messages: bool = True,
+                    full_history_every: int = 20,
+                    chunk_window: float = 0.05,
+                    chunk_max_bytes: int = 2048) -> None:
     # Instantiate per-group listeners and let them register their handlers
     listeners = [
         TaskListener(loop, queue),
         CrewListener(loop, queue),
         ReasoningListener(loop, queue),
-        LLMListener(loop, queue),
+        LLMListener(
+            loop,
+            queue,
+            delta_messages=delta_messages,
+            full_history_every=full_history_every,
+            chunk_window=chunk_window,
+            chunk_max_bytes=chunk_max_bytes,
+        ),
         ToolUsageListener(loop, queue),
         A2AListener(loop, queue),
         FlowListener(loop, queue),
@@ -38,3 +49,13 @@ def setup_listeners(loop: asyncio.AbstractEventLoop,
     for listener in listeners:
         listener.setup_listeners(crewai_event_bus)
     return listeners
+
+
+def bind_listeners(listeners, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue) -> None:
+    """Re-point listeners created by `setup_listeners` at a new run's loop and queue.
+
+    Handlers stay registered on the (process-wide) event bus, so a warm runner
+    registers them once instead of adding another set for every run.
+    """
+    for listener in listeners:
+        listener.bind(loop, queue)
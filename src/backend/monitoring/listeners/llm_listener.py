@@ -1,6 +1,8 @@
 import asyncio
+import threading
+import uuid
+from typing import Any, Dict, Tuple
 
-from crewai import LLM
 from crewai import LLM
 from crewai.llms.base_llm import BaseLLM
 from crewai.events.types.llm_events import (
@@ -10,12 +12,97 @@ from crewai.events.types.llm_events import (
     LLMStreamChunkEvent,
 )
 
+from ..chunk_aggregator import ChunkAggregator
 from .forward_listener import ForwardingListener
 from crewai.events.event_bus import CrewAIEventsBus
 
 class LLMListener(ForwardingListener):
-    def __init__(self, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue):
+    """Forwards LLM call events.
+
+    With ``delta_messages`` enabled (the default), call started/completed
+    events carry only the messages appended since the previous call of the
+    same (agent, task) conversation:
+
+     - ``conversation_id``: stable id of the (agent, task) conversation
+     - ``messages_base``: number of earlier messages the delta applies to
+       (0 means ``messages`` is the full history, e.g. after it was rewritten)
+     - ``messages_total``: length of the full history for this call
+     - ``messages``: ``full_history[messages_base:]``
+
+    Every ``full_history_every``-th call of a conversation sends the full
+    history again (0 never does), so a consumer that missed a delta (e.g. a
+    restarted bridge) can resync.
+
+    Stream chunks are merged into frames of up to ``chunk_window`` seconds or
+    ``chunk_max_bytes`` bytes (a ``chunk_window`` of 0 sends every token).
+    Buffered frames are flushed before any other LLM event is pushed.
+    """
+
+    def __init__(self,
+                 loop: asyncio.AbstractEventLoop,
+                 queue: asyncio.Queue,
+                 delta_messages: bool = True,
+                 full_history_every: int = 20,
+                 chunk_window: float = 0.05,
+                 chunk_max_bytes: int = 2048):
         super().__init__(loop, queue)
+        self._delta_messages = delta_messages
+        self._full_history_every = full_history_every
+        self._chunk_window = chunk_window
+        self._chunk_max_bytes = chunk_max_bytes
+        self._chunks = ChunkAggregator(loop, self._push, chunk_window, chunk_max_bytes) if chunk_window > 0 else None
+        # (agent, task) -> (conversation_id, messages sent so far, calls since the last full history)
+        self._conversations: Dict[Tuple[str, str], Tuple[str, tuple, int]] = {}
+        self._conversations_lock = threading.Lock()
+
+    def bind(self, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue) -> None:
+        """Start a new run: fresh chunk timers on its loop and no conversation history."""
+        super().bind(loop, queue)
+        if self._chunks is not None:
+            self._chunks = ChunkAggregator(loop, self._push, self._chunk_window, self._chunk_max_bytes)
+        with self._conversations_lock:
+            self._conversations.clear()
+
+    @staticmethod
+    def _identity(obj: Any) -> str:
+        if obj is None:
+            return "-"
+        return str(getattr(obj, "id", None) or id(obj))
+
+    def _flush_chunks(self) -> None:
+        if self._chunks is not None:
+            self._chunks.flush()
+
+    def _push_with_history(self, payload: dict, messages: Any, from_agent: Any, from_task: Any) -> None:
+        """Push payload with `messages` delta-encoded against the conversation cache."""
+        self._flush_chunks()
+        if not self._delta_messages or not isinstance(messages, (list, tuple)):
+            payload["messages"] = messages
+            self._push(payload)
+            return
+        key = (self._identity(from_agent), self._identity(from_task))
+        current = tuple(messages)
+        # Compute and enqueue under the lock so deltas reach the queue in the
+        # same order they were computed against the cache.
+        with self._conversations_lock:
+            conversation_id, previous, calls = self._conversations.get(key, (None, (), 0))
+            base = len(previous)
+            if conversation_id is None:
+                conversation_id = uuid.uuid4().hex
+                base = 0
+            elif base > len(current) or current[:base] != previous:
+                # History was rewritten (e.g. summarized to fit the context window)
+                base = 0
+            elif self._full_history_every and calls + 1 >= self._full_history_every:
+                # Periodic resync for consumers that missed a delta
+                base = 0
+            calls = 0 if base == 0 else calls + 1
+            self._conversations[key] = (conversation_id, current, calls)
+            payload["conversation_id"] = conversation_id
+            payload["messages_base"] = base
+            payload["messages_total"] = len(current)
+            payload["messages"] = current[base:]
+            self._push(payload)
 
     def setup_listeners(self, crewai_event_bus: CrewAIEventsBus) -> None:
         @crewai_event_bus.on(LLMCallStartedEvent)
@@ -24,7 +111,7 @@ class LLMListener(ForwardingListener):
                 "type": event.type,
                 "timestamp": event.timestamp,
                 "llm_name": getattr(event, "model", None),
-                "messages": getattr(event, "messages", None),
+                "messages": None,
                 "tools": getattr(event, "tools", None),
                 "from_task": getattr(event, "from_task", None),
                 "from_agent": getattr(event, "from_agent", None),
@@ -32,7 +119,7 @@ class LLMListener(ForwardingListener):
                 "callbacks": getattr(event, "callbacks", None),
                 "available_functions": getattr(event, "available_functions", None),
             }
-            self._push(payload)
+            self._push_with_history(payload, getattr(event, "messages", None), payload["from_agent"], payload["from_task"])
 
         @crewai_event_bus.on(LLMCallCompletedEvent)
         def on_llm_call_completed(source: BaseLLM | LLM, event: LLMCallCompletedEvent):
@@ -42,12 +129,12 @@ class LLMListener(ForwardingListener):
                 "timestamp": event.timestamp,
                 "llm_name": getattr(event, "model", None),
                 "temperature": getattr(source, "temperature", None),
-                "messages": getattr(event, "messages", None),
+                "messages": None,
                 "response": getattr(event, "response", None),
                 "from_task": getattr(event, "from_task", None),
                 "from_agent": getattr(event, "from_agent", None),
             }
-            self._push(payload)
+            self._push_with_history(payload, getattr(event, "messages", None), payload["from_agent"], payload["from_task"])
 
         @crewai_event_bus.on(LLMCallFailedEvent)
         def on_llm_call_failed(source: BaseLLM | LLM, event: LLMCallFailedEvent):
@@ -59,6 +146,8 @@ class LLMListener(ForwardingListener):
                 "from_agent": getattr(event, "from_agent", None),
                 "error": getattr(event, "error", None),
             }
+            # End of stream: emit whatever is buffered first
+            self._flush_chunks()
             self._push(payload)
 
         @crewai_event_bus.on(LLMStreamChunkEvent)
@@ -70,4 +159,12 @@ class LLMListener(ForwardingListener):
                 "chunk": getattr(event, "chunk", None),
                 "tool_call": getattr(event, "tool_call", None),
             }
-            self._push(payload)
+            if self._chunks is None:
+                self._push(payload)
+                return
+            stream = (
+                payload["llm_name"],
+                self._identity(getattr(event, "from_agent", None)),
+                self._identity(getattr(event, "from_task", None)),
+            )
+            self._chunks.add(stream, payload)
@@ -8,6 +8,9 @@ import os
 import sys
 import asyncio
 import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional, Tuple
 
 from ..core.artifacts import ArtifactOutput
 from ..core.agents import AgentManager
@@ -16,31 +19,23 @@ from ..core.tasks import TaskManager
 from crewai import LLM, Crew, Process
 from crewai.events import crewai_event_bus
 
-from .forwarder import redis_forwarder, start_loop_in_thread
-from .listener import setup_listeners
+from .event_queue import EventQueue
+from .forwarder import redis_forwarder, replay_leftover_spools, start_loop_in_thread
+from .spool import EventSpool, SpoolBusy
+from .listener import bind_listeners, setup_listeners
+from .run_registry import RunCancelled
 
 
-def run_with_monitoring():
-    OUTPUT_FOLDER = os.getenv('CREW_OUTPUT_FOLDER', 'outputs')
-    
-    # Convert to absolute path to ensure FileWriterTool can save files
-    OUTPUT_FOLDER = os.path.abspath(OUTPUT_FOLDER)
+DEFAULT_PROJECT_DETAILS = """
+    A platform to write notes and create a knowledge graph with manual linking 
+    and graph visualization through tags, using a Vue frontend and TypeScript backend.
+    Make sure to write the code and documentation in a modular way, with clear separation 
+    using the file writer tool at each step of the process.
+    """
 
-    # Build agents and tasks
-    artifact_output = ArtifactOutput(OUTPUT_FOLDER)
-    
-    # Ensure output directory exists
-    output_path = artifact_output.get_base_output_path()
-    os.makedirs(output_path, exist_ok=True)
-    print(f"\nCrewAI Output Directory: {output_path}")
-    print(f"Directory created: {os.path.exists(output_path)}")
-    print(f"Is writable: {os.access(output_path, os.W_OK)}\n")
-    
-    agent_manager = AgentManager(artifact_output)
-    task_manager = TaskManager(agent_manager)
-    agents = agent_manager.get_all_agents()
-    tasks = task_manager.get_all_tasks()
 
+def _build_llm() -> Tuple[LLM, Dict[str, Any]]:
+    """Create the crew's LLM and embedder configuration from the environment."""
     # LLM and embedder configuration (can be overridden via env). The defaults
     # are tuned for a local LM Studio instance running an OpenAI-compatible
     # endpoint (e.g. http://localhost:1234/v1). We keep model identifiers
@@ -90,13 +85,135 @@ def run_with_monitoring():
             "dimensions": embedder_dims,
         },
     }
+    return local_llm, embedder
+
+
+class RunnerResources:
+    """Run-independent objects a warm runner process reuses across runs.
+
+    Building the LLM client, the agents' tools and (above all) starting the
+    MCP server dominate a run's start-up time. A `RunScheduler` in warm mode
+    creates one instance per worker process and passes it to every
+    `run_with_monitoring` call; each run still gets fresh agents, tasks, crew,
+    artifact folder, event queue and forwarder.
+    """
+
+    def __init__(self):
+        self.llm, self.embedder = _build_llm()
+        self._agent_manager: Optional[AgentManager] = None
+        self._listeners = None
+
+    def agent_manager_for(self, artifact_output: ArtifactOutput) -> AgentManager:
+        """The shared agent manager, re-bound to this run's artifact folder."""
+        if self._agent_manager is None:
+            self._agent_manager = AgentManager(artifact_output)
+        else:
+            self._agent_manager.rebind(artifact_output)
+        return self._agent_manager
+
+    def listeners_for(self, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue, **options: Any):
+        """Event listeners forwarding into this run's queue.
+
+        The event bus is process-wide: handlers are registered on the first
+        run only and re-bound to the new loop and queue afterwards (``options``
+        are only applied on the first run).
+        """
+        if self._listeners is None:
+            self._listeners = setup_listeners(loop, queue, crewai_event_bus, **options)
+        else:
+            bind_listeners(self._listeners, loop, queue)
+        return self._listeners
+
+    def shutdown(self) -> None:
+        if self._agent_manager is not None:
+            try:
+                self._agent_manager.shutdown()
+            except Exception:
+                pass
+            self._agent_manager = None
+
+
+def _replay_leftover_spools(base: str, redis_url: str, channel: str, run_id: str, **options: Any) -> None:
+    try:
+        replay_leftover_spools(
+            base,
+            redis_url,
+            channel,
+            skip=lambda name: name == run_id,
+            max_batch=int(os.getenv("FORWARDER_MAX_BATCH", "500")),
+            stream_maxlen=int(os.getenv("REDIS_STREAM_MAXLEN", "100000")),
+            **options,
+        )
+    except Exception as e:
+        print(f"Failed to replay leftover event spools: {e}")
+
+
+def run_with_monitoring(run_id: Optional[str] = None,
+                        project_details: Optional[str] = None,
+                        output_folder: Optional[str] = None,
+                        spool_dir: Optional[str] = None,
+                        should_cancel: Optional[Callable[[], bool]] = None,
+                        resources: Optional[RunnerResources] = None) -> Dict[str, Any]:
+    """Run the crew once with event forwarding and return a summary of the run.
+
+    ``output_folder`` defaults to ``CREW_OUTPUT_FOLDER``; artifacts go to a
+    folder of their own under it. ``spool_dir`` is this run's event spool;
+    it defaults to ``<MONITOR_SPOOL_DIR>/<run_id>``, the same layout the
+    scheduler uses, so a spool never holds events of another run.
+
+    ``should_cancel`` is polled after every agent step and task; once it
+    returns True the run stops at that point with status ``cancelled``.
+
+    ``resources`` lets a warm runner reuse the LLM, tools, MCP adapter and
+    listeners of earlier runs; without it they are created for this run and
+    shut down when it ends.
+    """
+    setup_started = time.monotonic()
+    owns_resources = resources is None
+    if owns_resources:
+        resources = RunnerResources()
+
+    # Every event of this run is tagged with the run id (RUN_ID env or random)
+    run_id = run_id or os.getenv("RUN_ID") or uuid.uuid4().hex[:12]
+    project_details = project_details or DEFAULT_PROJECT_DETAILS
+    OUTPUT_FOLDER = output_folder or os.getenv('CREW_OUTPUT_FOLDER', 'outputs')
+    
+    # Convert to absolute path to ensure FileWriterTool can save files
+    OUTPUT_FOLDER = os.path.abspath(OUTPUT_FOLDER)
+
+    # Build agents and tasks
+    artifact_output = ArtifactOutput(OUTPUT_FOLDER, run_id=run_id)
+    
+    # Ensure output directory exists
+    output_path = artifact_output.get_base_output_path()
+    os.makedirs(output_path, exist_ok=True)
+    print(f"\nCrewAI Output Directory: {output_path}")
+    print(f"Directory created: {os.path.exists(output_path)}")
+    print(f"Is writable: {os.access(output_path, os.W_OK)}\n")
+    
+    agent_manager = resources.agent_manager_for(artifact_output)
+    task_manager = TaskManager(agent_manager)
+    agents = agent_manager.get_all_agents()
+    tasks = task_manager.get_all_tasks()
+
+    local_llm, embedder = resources.llm, resources.embedder
 
     # Crew-level flags (can be tuned through environment variables)
     crew_verbose = os.getenv("CREW_VERBOSE", "true")
     crew_memory = os.getenv("CREW_MEMORY", "true").lower() in ("1", "true", "yes")
     crew_cache = os.getenv("CREW_CACHE", "true").lower() in ("1", "true", "yes")
 
-    crew: Crew = Crew(
+    crew: Crew = None
+
+    def _check_cancel(_output: Any = None) -> None:
+        if should_cancel is not None and should_cancel():
+            # Agents retry failed steps; make the cancel stop them right away
+            for agent in list(agents) + [getattr(crew, "manager_agent", None)]:
+                if agent is not None:
+                    agent.max_retry_limit = 0
+            raise RunCancelled(f"run {run_id} was cancelled")
+
+    crew = Crew(
         agents=agents,
         tasks=tasks,
         process=Process.hierarchical,
@@ -106,56 +223,159 @@ def run_with_monitoring():
         memory=crew_memory,
         embedder=embedder,
         cache=crew_cache,
+        step_callback=_check_cancel if should_cancel else None,
+        task_callback=_check_cancel if should_cancel else None,
     )
 
-    project_details = """
-    A platform to write notes and create a knowledge graph with manual linking 
-    and graph visualization through tags, using a Vue frontend and TypeScript backend.
-    Make sure to write the code and documentation in a modular way, with clear separation 
-    using the file writer tool at each step of the process.
-    """
-
     print("\n🚀 Starting CrewAI with Event Monitoring...")
-    print("📊 Events are being streamed to WebSocket clients")
+    print(f"📊 Events are being streamed to WebSocket clients (run id: {run_id})")
     print("🌐 Open http://localhost:5173 to view the dashboard\n")
 
     # Setup forwarder (Redis publisher)
     redis_url = os.getenv("REDIS_URL", "redis://127.0.0.1:6379/0")
     redis_channel = os.getenv("REDIS_CHANNEL", "crewai:events")
+    # Capped Redis Stream the bridge replays history from (empty disables it)
+    redis_stream = os.getenv("REDIS_STREAM", "crewai:events:stream") or None
+    # Publish on crewai:events:<run_id> so concurrent runs don't share a channel
+    per_run_channel = os.getenv("REDIS_CHANNEL_PER_RUN", "true").lower() in ("1", "true", "yes")
     loop = asyncio.new_event_loop()
-    send_queue: asyncio.Queue = asyncio.Queue()
+    # Bounded so memory stays flat while Redis is unavailable; stream chunks
+    # are coalesced/dropped first, lifecycle events are always kept.
+    droppable_events = os.getenv("MONITOR_DROPPABLE_EVENTS", "llm_stream_chunk")
+    send_queue: asyncio.Queue = EventQueue(
+        capacity=int(os.getenv("MONITOR_QUEUE_SIZE", "10000")),
+        droppable_types=[t.strip() for t in droppable_events.split(",") if t.strip()],
+    )
+
+    # Durable spool used by the forwarder while Redis is unreachable. Set
+    # MONITOR_SPOOL_DIR to an empty string to disable it.
+    if spool_dir is None:
+        spool_base = os.getenv("MONITOR_SPOOL_DIR", os.path.join(OUTPUT_FOLDER, ".event-spool"))
+        spool_dir = os.path.join(spool_base, run_id) if spool_base else ""
+        if spool_base:
+            # Not started by a scheduler: replay what earlier runs left behind
+            threading.Thread(
+                target=_replay_leftover_spools,
+                args=(spool_base, redis_url, redis_channel, run_id),
+                kwargs={"stream": redis_stream, "per_run_channel": per_run_channel},
+                name="spool-replay",
+                daemon=True,
+            ).start()
+    spool = None
+    if spool_dir:
+        try:
+            spool = EventSpool(
+                spool_dir,
+                segment_bytes=int(os.getenv("MONITOR_SPOOL_SEGMENT_MB", "64")) * 1024 * 1024,
+                max_bytes=int(os.getenv("MONITOR_SPOOL_MAX_MB", "1024")) * 1024 * 1024,
+            )
+        except SpoolBusy as e:
+            print(f"Warning: {e}; events of this run are not spooled during Redis outages")
 
     # Create listeners that forwards into the queue
-    listeners = setup_listeners(loop, send_queue, crewai_event_bus)
+    # LLM message histories are sent as deltas unless MONITOR_LLM_DELTAS=false
+    delta_messages = os.getenv("MONITOR_LLM_DELTAS", "true").lower() in ("1", "true", "yes")
+    # ...with the full history resent every MONITOR_LLM_FULL_EVERY calls
+    # Streamed tokens are merged into frames of up to MONITOR_CHUNK_WINDOW_MS
+    # or MONITOR_CHUNK_MAX_BYTES (window 0 forwards every token).
+    listeners = resources.listeners_for(
+        loop,
+        send_queue,
+        delta_messages=delta_messages,
+        full_history_every=int(os.getenv("MONITOR_LLM_FULL_EVERY", "20")),
+        chunk_window=float(os.getenv("MONITOR_CHUNK_WINDOW_MS", "50")) / 1000,
+        chunk_max_bytes=int(os.getenv("MONITOR_CHUNK_MAX_BYTES", "2048")),
+    )
 
     # Start forwarder in background thread (publishes to Redis)
-    forwarder_coro = redis_forwarder(send_queue, redis_url, redis_channel)
+    forwarder_coro = redis_forwarder(
+        send_queue,
+        redis_url,
+        redis_channel,
+        max_batch=int(os.getenv("FORWARDER_MAX_BATCH", "500")),
+        linger=float(os.getenv("FORWARDER_LINGER_MS", "0")) / 1000,
+        stats_interval=float(os.getenv("FORWARDER_STATS_INTERVAL", "30")),
+        spool=spool,
+        stream=redis_stream,
+        stream_maxlen=int(os.getenv("REDIS_STREAM_MAXLEN", "100000")),
+        run_id=run_id,
+        per_run_channel=per_run_channel,
+    )
     forwarder_thread = start_loop_in_thread(loop, forwarder_coro)
 
+    # Publish every artifact manifest update so the dashboard can follow
+    # which files each agent/task produced without listing the folder
+    def _publish_artifact(entry: Dict[str, Any]) -> None:
+        payload = {"type": "artifact_written", "timestamp": time.time(), **entry}
+        loop.call_soon_threadsafe(send_queue.put_nowait, payload)
+
+    artifact_output.on_change = _publish_artifact
+
+    result: Dict[str, Any] = {
+        "run_id": run_id,
+        "status": "running",
+        "output_path": output_path,
+        "started_at": time.time(),
+        "finished_at": None,
+        "total_tokens": None,
+        "error": None,
+        # Time from the call to kickoff; what a warm runner saves
+        "setup_seconds": round(time.monotonic() - setup_started, 3),
+    }
+
     # Run the crew in a worker thread
     def _run_crew():
         try:
             print("🏁 Kicking off CrewAI process...\n")
-            crew.kickoff(inputs={'project_details': project_details})
+            _check_cancel()
+            output = crew.kickoff(inputs={'project_details': project_details})
+            result["status"] = "completed"
+            usage = getattr(output, "token_usage", None)
+            result["total_tokens"] = getattr(usage, "total_tokens", None)
         except Exception as e:
+            if isinstance(e, RunCancelled) or (should_cancel is not None and should_cancel()):
+                print(f"Run {run_id} cancelled")
+                result["status"] = "cancelled"
+                return
             print(f"Error during CrewAI kickoff: {e}")
+            result["status"] = "failed"
+            result["error"] = str(e)
         finally:
-            # Signal forwarder to stop and attempt graceful agent manager shutdown
+            result["finished_at"] = time.time()
             try:
-                loop.call_soon_threadsafe(send_queue.put_nowait, None)
-            except Exception:
-                pass
+                artifact_output.save_manifest()
+            except OSError as e:
+                print(f"Failed to save the artifact manifest: {e}")
+            if os.path.exists(artifact_output.manifest_path()):
+                result["manifest_path"] = artifact_output.manifest_path()
+            result["artifact_count"] = len(artifact_output.manifest())
+            # Blobs of run folders that were deleted since
+            artifact_output.prune_blobs()
+            # Signal forwarder to stop; a warm runner keeps its resources
             try:
-                agent_manager.shutdown()
+                loop.call_soon_threadsafe(send_queue.put_nowait, None)
             except Exception:
                 pass
+            if owns_resources:
+                resources.shutdown()
 
     crew_thread = threading.Thread(target=_run_crew, daemon=True)
     crew_thread.start()
     crew_thread.join()
 
-    # wait briefly for forwarder to finish
-    forwarder_thread.join(timeout=5)
+    try:
+        # wait briefly for forwarder to finish
+        forwarder_thread.join(timeout=5)
+    finally:
+        artifact_output.on_change = None
+        if not forwarder_thread.is_alive():
+            # Releases the spool's lock and the loop's selector and self-pipe
+            # (warm workers outlive the run); a forwarder still flushing
+            # closes its loop when it ends
+            if spool is not None:
+                spool.close()
+            loop.close()
+    return result
 
 
 if __name__ == "__main__":
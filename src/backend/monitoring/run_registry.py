@@ -0,0 +1,176 @@
+"""Run records and the run request queue shared with the bridge's run manager.
+
+The bridge submits run requests by pushing them onto a Redis list; runner
+workers (`worker.py`) pop them and execute them. Both sides keep a record of
+every run in a Redis hash so the bridge can list runs with their status,
+timings and token totals, and request a cooperative cancel.
+
+Keys (``prefix`` defaults to ``crewai:runs``; the bridge uses the same layout):
+
+ - ``<prefix>:queue``          list of JSON run requests (LPUSH / BLMOVE)
+ - ``<prefix>:queue:processing:<worker>`` requests a worker took and has not
+   finished yet
+ - ``<prefix>:queue:workers:<worker>`` worker heartbeat (expires when it dies)
+ - ``<prefix>``                sorted set of run ids by submission time
+ - ``<prefix>:<run_id>``       hash of JSON-encoded record fields
+ - ``<prefix>:<run_id>:cancel`` set when a cancel was requested
+
+Run ids are limited to `RUN_ID_PATTERN` (they are used in keys and folder
+names) and ``queue`` is reserved.
+
+A worker moves each request it takes into its own processing list and
+removes it when the run ends, so a request is never lost between the pop and
+the run. When a worker's heartbeat expires, the next worker to look
+(`recover_orphans`) requeues the requests it had not started and marks its
+running runs failed.
+"""
+import json
+import os
+import re
+import socket
+import time
+from typing import Any, Dict, Optional
+
+import redis
+
+# Finished runs stay listed for a week
+RECORD_TTL = 7 * 24 * 3600
+# A worker that has not refreshed its heartbeat for this long is considered dead
+WORKER_TTL = 30
+
+RUN_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+RESERVED_RUN_IDS = ("queue",)
+
+
+def valid_run_id(run_id: Any) -> bool:
+    """Whether ``run_id`` is safe to use in Redis keys and folder names."""
+    return isinstance(run_id, str) and bool(RUN_ID_PATTERN.match(run_id)) and run_id not in RESERVED_RUN_IDS
+
+
+class RunCancelled(Exception):
+    """Raised inside a run when a cancel was requested for it."""
+
+
+class RunRegistry:
+    """Synchronous access to the run queue and run records."""
+
+    def __init__(self, redis_url: str, prefix: Optional[str] = None, worker_id: Optional[str] = None):
+        self.prefix = prefix or os.getenv("RUN_REGISTRY_PREFIX", "crewai:runs")
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self._client = redis.Redis.from_url(redis_url)
+        # run_id -> raw request taken from the queue, until `ack`
+        self._taken: Dict[str, bytes] = {}
+
+    @property
+    def queue_key(self) -> str:
+        return f"{self.prefix}:queue"
+
+    def _processing_key(self, worker_id: str) -> str:
+        return f"{self.queue_key}:processing:{worker_id}"
+
+    def _heartbeat_key(self, worker_id: str) -> str:
+        return f"{self.queue_key}:workers:{worker_id}"
+
+    def _record_key(self, run_id: str) -> str:
+        return f"{self.prefix}:{run_id}"
+
+    def _cancel_key(self, run_id: str) -> str:
+        return f"{self.prefix}:{run_id}:cancel"
+
+    def pop(self, timeout: float = 1.0) -> Optional[Dict[str, Any]]:
+        """Wait up to ``timeout`` seconds for the next run request.
+
+        The request stays in this worker's processing list until `ack`.
+        """
+        processing = self._processing_key(self.worker_id)
+        raw = self._client.blmove(self.queue_key, processing, timeout, "RIGHT", "LEFT")
+        if raw is None:
+            return None
+        try:
+            request = json.loads(raw)
+        except ValueError:
+            request = None
+        if not isinstance(request, dict) or not valid_run_id(request.get("run_id")):
+            print(f"[worker] ignoring malformed run request: {raw!r:.200}")
+            self._client.lrem(processing, 1, raw)
+            return None
+        self._taken[request["run_id"]] = raw
+        return request
+
+    def ack(self, run_id: str) -> None:
+        """Drop a request taken with `pop` from the processing list (its run ended)."""
+        raw = self._taken.pop(run_id, None)
+        if raw is not None:
+            self._client.lrem(self._processing_key(self.worker_id), 1, raw)
+
+    def heartbeat(self) -> None:
+        """Mark this worker alive for the next `WORKER_TTL` seconds."""
+        self._client.set(self._heartbeat_key(self.worker_id), str(time.time()), ex=WORKER_TTL)
+
+    def recover_orphans(self) -> int:
+        """Hand back the requests of workers whose heartbeat expired.
+
+        Requests whose run had not started are requeued; runs left ``running``
+        are marked failed. Returns the number of requests handled.
+        """
+        handled = 0
+        prefix = self._processing_key("")
+        for key in self._client.scan_iter(match=f"{prefix}*"):
+            worker_id = key.decode()[len(prefix):]
+            if worker_id == self.worker_id or self._client.exists(self._heartbeat_key(worker_id)):
+                continue
+            # RPOP one at a time so two recovering workers never share a request
+            while True:
+                raw = self._client.rpop(key)
+                if raw is None:
+                    break
+                handled += 1
+                try:
+                    run_id = json.loads(raw)["run_id"]
+                    status = self.get(run_id).get("status")
+                except (ValueError, KeyError, TypeError):
+                    continue
+                if status == "queued":
+                    self._client.rpush(self.queue_key, raw)
+                    print(f"[worker] requeued run {run_id} of lost worker {worker_id}")
+                elif status == "running":
+                    self.update(run_id, status="failed", finished_at=time.time(),
+                                error=f"worker {worker_id} stopped while the run was in progress")
+                    print(f"[worker] marked run {run_id} of lost worker {worker_id} failed")
+        return handled
+
+    def get(self, run_id: str) -> Dict[str, Any]:
+        raw = self._client.hgetall(self._record_key(run_id))
+        return {k.decode(): json.loads(v) for k, v in raw.items()}
+
+    def update(self, run_id: str, **fields: Any) -> None:
+        key = self._record_key(run_id)
+        pipe = self._client.pipeline(transaction=False)
+        pipe.hset(key, mapping={k: json.dumps(v, default=str) for k, v in fields.items()})
+        pipe.expire(key, RECORD_TTL)
+        pipe.execute()
+
+    def cancel_requested(self, run_id: str) -> bool:
+        return bool(self._client.exists(self._cancel_key(run_id)))
+
+    def cancel_check(self, run_id: str, interval: float = 1.0):
+        """A callable for `run_with_monitoring` that polls at most every ``interval`` seconds."""
+        state = {"checked": 0.0, "cancelled": False}
+
+        def should_cancel() -> bool:
+            now = time.monotonic()
+            if not state["cancelled"] and now - state["checked"] >= interval:
+                state["checked"] = now
+                try:
+                    state["cancelled"] = self.cancel_requested(run_id)
+                except redis.RedisError:
+                    pass
+            return state["cancelled"]
+
+        return should_cancel
+
+    def close(self) -> None:
+        try:
+            self._client.close()
+        except Exception:
+            pass
@@ -0,0 +1,242 @@
+"""Run scheduler: execute many monitored crew runs concurrently.
+
+`run_with_monitoring` runs one crew and blocks until it is done. The
+scheduler accepts any number of run requests (each with its own
+``project_details``) and executes up to ``max_workers`` of them at once, so a
+local LLM server that can serve several streams in parallel is kept busy.
+
+Every run executes in its own worker process. CrewAI's event bus is
+process-wide, so runs sharing a process would see each other's events; with
+one run per process each run gets its own listeners, forwarder, run-tagged
+events (and per-run Redis channel), artifact folder and event spool. Events
+that runs left in their spools (they ended while Redis was unreachable) are
+replayed on their run's channel when the next scheduler starts.
+
+By default every run gets a fresh process. With ``warm=True`` (``--warm``)
+worker processes are kept and reuse a `RunnerResources` (LLM client, tools,
+MCP server, event listeners) from one run to the next, so only the first run
+of each process pays for starting them.
+
+Usage:
+    python -m src.backend.monitoring.scheduler --workers 3 [--warm] runs.json
+
+where ``runs.json`` holds a list of ``{"project_details": "...", "run_id": "..."}``
+objects (``run_id`` is optional).
+"""
+import argparse
+import atexit
+import json
+import multiprocessing
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from .run_registry import valid_run_id
+
+# Record fields reported back to the run registry when a run ends
+_RESULT_FIELDS = ("status", "output_path", "started_at", "finished_at", "total_tokens", "error",
+                  "setup_seconds", "artifact_count")
+
+# Reused by every run of a warm worker process; created on its first run so a
+# failing setup is reported as that run's error instead of breaking the pool
+_resources = None
+
+
+def _init_warm_worker() -> None:
+    atexit.register(_shutdown_warm_worker)
+
+
+def _shutdown_warm_worker() -> None:
+    if _resources is not None:
+        _resources.shutdown()
+
+
+def _warm_resources():
+    global _resources
+    from .orchestrator import RunnerResources
+
+    if _resources is None:
+        _resources = RunnerResources()
+    return _resources
+
+
+def _execute(request: Dict[str, Any]) -> Dict[str, Any]:
+    # Imported in the worker process only; keeps the parent light
+    from .orchestrator import run_with_monitoring
+    from .run_registry import RunRegistry
+
+    run_id = request["run_id"]
+    warm = request.get("warm", False)
+    registry = RunRegistry(request["registry_url"]) if request.get("registry_url") else None
+    try:
+        if registry is not None:
+            if registry.cancel_requested(run_id):
+                result = {"run_id": run_id, "status": "cancelled", "finished_at": time.time()}
+                registry.update(run_id, status="cancelled", finished_at=result["finished_at"])
+                return result
+            registry.update(run_id, status="running", started_at=time.time(),
+                            worker=f"{socket.gethostname()}:{os.getpid()}")
+        result = run_with_monitoring(
+            run_id=run_id,
+            project_details=request.get("project_details"),
+            output_folder=request.get("output_folder"),
+            spool_dir=request.get("spool_dir"),
+            should_cancel=registry.cancel_check(run_id) if registry is not None else None,
+            resources=_warm_resources() if warm else None,
+        )
+    except Exception as e:
+        # Setup failures (e.g. LLM/tool construction) are reported, not raised
+        result = {"run_id": run_id, "status": "failed", "error": str(e), "finished_at": time.time()}
+    if registry is not None:
+        try:
+            registry.update(run_id, **{k: result[k] for k in _RESULT_FIELDS if k in result})
+        except Exception as e:
+            print(f"[scheduler] failed to record result of run {run_id}: {e}")
+        registry.close()
+    return result
+
+
+class RunScheduler:
+    """Pool of worker processes that each execute one monitored run at a time."""
+
+    def __init__(self,
+                 max_workers: Optional[int] = None,
+                 output_folder: Optional[str] = None,
+                 registry_url: Optional[str] = None,
+                 warm: bool = False):
+        self.max_workers = max_workers or int(os.getenv("RUN_WORKERS", "2"))
+        # When set, runs report status to (and poll cancels from) the run registry
+        self.registry_url = registry_url
+        self.output_folder = os.path.abspath(output_folder or os.getenv("CREW_OUTPUT_FOLDER", "outputs"))
+        self.warm = warm
+        if warm:
+            # Long-lived processes that keep their RunnerResources between runs
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_warm_worker,
+            )
+        else:
+            # A fresh process per run: nothing (event handlers, MCP subprocesses)
+            # leaks from one run into the next
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                max_tasks_per_child=1,
+            )
+        self._runs: Dict[str, Future] = {}
+        # Runs that ended during a Redis outage left events in their spools
+        if self._spool_base():
+            threading.Thread(target=self._replay_leftover_spools, name="spool-replay", daemon=True).start()
+
+    def _spool_base(self) -> str:
+        return os.getenv("MONITOR_SPOOL_DIR", os.path.join(self.output_folder, ".event-spool"))
+
+    def _spool_dir(self, run_id: str) -> str:
+        base = self._spool_base()
+        # Concurrent runs must not append to the same spool segments
+        return os.path.join(base, run_id) if base else ""
+
+    def _replay_leftover_spools(self) -> None:
+        from .forwarder import replay_leftover_spools
+
+        try:
+            replay_leftover_spools(
+                self._spool_base(),
+                os.getenv("REDIS_URL", "redis://127.0.0.1:6379/0"),
+                os.getenv("REDIS_CHANNEL", "crewai:events"),
+                # This scheduler's own runs replay their spools themselves
+                skip=lambda run_id: run_id in self._runs,
+                max_batch=int(os.getenv("FORWARDER_MAX_BATCH", "500")),
+                stream=os.getenv("REDIS_STREAM", "crewai:events:stream") or None,
+                stream_maxlen=int(os.getenv("REDIS_STREAM_MAXLEN", "100000")),
+                per_run_channel=os.getenv("REDIS_CHANNEL_PER_RUN", "true").lower() in ("1", "true", "yes"),
+            )
+        except Exception as e:
+            print(f"[scheduler] failed to replay leftover event spools: {e}")
+
+    def submit(self, project_details: Optional[str] = None, run_id: Optional[str] = None) -> str:
+        """Queue a run and return its run id."""
+        run_id = run_id or uuid.uuid4().hex[:12]
+        if not valid_run_id(run_id):
+            # Used in folder names and Redis keys
+            raise ValueError(f"invalid run id {run_id!r}: use 1-64 letters, digits, '_' or '-'")
+        if run_id in self._runs:
+            raise ValueError(f"run '{run_id}' was already submitted")
+        request = {
+            "run_id": run_id,
+            "project_details": project_details,
+            "output_folder": self.output_folder,
+            "spool_dir": self._spool_dir(run_id),
+            "registry_url": self.registry_url,
+            "warm": self.warm,
+        }
+        self._runs[run_id] = self._executor.submit(_execute, request)
+        print(f"[scheduler] queued run {run_id}")
+        return run_id
+
+    def future(self, run_id: str) -> Future:
+        return self._runs[run_id]
+
+    def forget(self, run_id: str) -> None:
+        """Drop a finished run (long-lived workers would otherwise keep every future)."""
+        future = self._runs.get(run_id)
+        if future is not None and future.done():
+            del self._runs[run_id]
+
+    @property
+    def in_flight(self) -> int:
+        """Submitted runs that have not finished yet."""
+        return sum(1 for future in list(self._runs.values()) if not future.done())
+
+    def status(self) -> Dict[str, str]:
+        """State of every submitted run: queued/running, or its final status."""
+        states = {}
+        for run_id, future in self._runs.items():
+            if future.done():
+                states[run_id] = "failed" if future.exception() else future.result().get("status", "failed")
+            else:
+                states[run_id] = "running" if future.running() else "queued"
+        return states
+
+    def wait(self) -> List[Dict[str, Any]]:
+        """Block until every submitted run has finished and return their summaries."""
+        results = []
+        for run_id, future in self._runs.items():
+            try:
+                results.append(future.result())
+            except Exception as e:
+                # The worker process died (e.g. killed or crashed)
+                results.append({"run_id": run_id, "status": "failed", "error": str(e)})
+        return results
+
+    def shutdown(self, cancel_pending: bool = False) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=cancel_pending)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run several monitored crews concurrently.")
+    parser.add_argument("runs", help="JSON file with a list of {project_details, run_id} objects")
+    parser.add_argument("--workers", type=int, default=None, help="concurrent runs (default: RUN_WORKERS or 2)")
+    parser.add_argument("--warm", action="store_true", help="reuse worker processes and their LLM/tools/MCP server")
+    args = parser.parse_args()
+
+    with open(args.runs, "r", encoding="utf-8") as f:
+        requests = json.load(f)
+    scheduler = RunScheduler(args.workers, warm=args.warm)
+    for request in requests:
+        scheduler.submit(request.get("project_details"), request.get("run_id"))
+    try:
+        for result in scheduler.wait():
+            print(f"[scheduler] run {result['run_id']}: {result.get('status')}"
+                  + (f" ({result['error']})" if result.get("error") else ""))
+    finally:
+        scheduler.shutdown(cancel_pending=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Single-pass event serialization.
+
+`dumps()` turns an event payload into JSON bytes in one traversal: datetimes
+become ISO-8601 strings and any other non-JSON object becomes `str(obj)`.
+`orjson` is used when it is installed; otherwise the stdlib `json` module
+with a `default` hook is used. Both produce equivalent JSON for payloads
+made of dicts, lists, strings, numbers, datetimes and arbitrary objects.
+
+Enum members are the exception: orjson writes them as their value, the
+stdlib as `str(member)` unless they are also str or int (then both write the
+value). `snapshot()` turns such enum fields of a payload into `str(member)`
+before either backend sees them, so events look the same with or without
+orjson; enums nested inside other fields are not converted.
+
+Listeners only take a `snapshot()` of each payload on the crew thread; the
+forwarder loop calls `dumps()`.
+"""
+import json
+from datetime import date, datetime, time
+from enum import Enum
+from typing import Any, Dict
+
+try:  # Optional fast backend
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    # For any other non-serializable object, convert to string
+    # This includes TokenCalcHandler, custom objects, etc.
+    return str(obj)
+
+
+if orjson is not None:
+    BACKEND = "orjson"
+    # orjson writes datetimes exactly like isoformat(); dataclasses are routed
+    # through _default so they become str(obj) as on the stdlib path. Enums
+    # are written as their value, so `snapshot()` converts them beforehand.
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize obj to JSON bytes in a single pass."""
+        try:
+            return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+        except TypeError:
+            # e.g. integers wider than 64 bits; the stdlib handles those
+            return _stdlib_dumps(obj)
+else:
+    BACKEND = "json"
+
+    def dumps(obj: Any) -> bytes:
+        """Serialize obj to JSON bytes in a single pass."""
+        return _stdlib_dumps(obj)
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, default=_default, separators=(",", ":"), ensure_ascii=False).encode("utf-8", "replace")
+
+
+def snapshot(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Cheap copy of an event payload that is safe to serialize on another thread.
+
+    Only the top level is copied: list/tuple values become tuples and dict/set
+    values are shallow-copied, so a history list that CrewAI keeps appending
+    to is frozen as of the event. Elements inside those containers (message
+    dicts, Task/Agent objects) are shared, not copied; CrewAI appends new
+    messages rather than editing existing ones, and the objects only contribute
+    their cheap `str()` representation.
+
+    Enum values that are not also str or int become `str(member)`, as the
+    stdlib backend writes them.
+    """
+    frozen = {}
+    for key, value in payload.items():
+        if isinstance(value, Enum) and not isinstance(value, (str, int)):
+            value = str(value)
+        elif isinstance(value, (list, tuple)):
+            value = tuple(value)
+        elif isinstance(value, dict):
+            value = dict(value)
+        elif isinstance(value, set):
+            value = set(value)
+        frozen[key] = value
+    return frozen
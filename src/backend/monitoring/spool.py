@@ -0,0 +1,202 @@
+"""Durable on-disk spool for encoded events while Redis is unreachable.
+
+The spool is an append-only sequence of segment files
+(``segment-000001.spool``, ...). Each record is a 4-byte little-endian length
+followed by the encoded event. Writes append to the newest segment and roll
+to a new one once it reaches ``segment_bytes``. Replay memory-maps the oldest
+segment and slices records straight out of the mapping. A segment is deleted
+once every record in it has been published.
+
+Delivery is at-least-once: the read offset within a segment is not persisted,
+so if the process dies mid-segment the whole head segment is replayed on the
+next start, including records that were already published.
+
+An open spool holds an exclusive lock on ``.lock`` in its directory (released
+by `close` or when the process exits), so a spool still in use by a live run
+is never replayed by another process.
+"""
+import mmap
+import os
+import struct
+from typing import Iterable, List, Optional
+
+
+_HEADER = struct.Struct("<I")
+_SEGMENT_PREFIX = "segment-"
+_SEGMENT_SUFFIX = ".spool"
+LOCK_FILE = ".lock"
+
+
+class SpoolBusy(OSError):
+    """The spool directory is open in another process."""
+
+
+def _lock_directory(directory: str):
+    """Open and exclusively lock the directory's lock file without blocking."""
+    f = open(os.path.join(directory, LOCK_FILE), "a+b")
+    try:
+        if os.name == "nt":
+            import msvcrt
+
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        f.close()
+        raise SpoolBusy(f"spool {directory} is in use by another process")
+    return f
+
+
+class EventSpool:
+    """Append-only, segmented event spool with in-order replay."""
+
+    def __init__(self, directory: str, segment_bytes: int = 64 * 1024 * 1024, max_bytes: int = 1024 * 1024 * 1024):
+        self.directory = os.path.abspath(directory)
+        self.segment_bytes = segment_bytes
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock_file = _lock_directory(self.directory)
+        self._segments: List[str] = sorted(
+            os.path.join(self.directory, name)
+            for name in os.listdir(self.directory)
+            if name.startswith(_SEGMENT_PREFIX) and name.endswith(_SEGMENT_SUFFIX)
+        )
+        self._next_seq = self._segment_seq(self._segments[-1]) + 1 if self._segments else 1
+        self._writer = None
+        self._writer_path: Optional[str] = None
+        self._write_size = 0
+        self._reader_file = None
+        self._reader_map: Optional[mmap.mmap] = None
+        self._read_offset = 0
+        self._batch_end = 0
+        self._batch_count = 0
+        self.spooled = 0
+        self.replayed = 0
+        self.discarded_segments = 0
+
+    @staticmethod
+    def _segment_seq(path: str) -> int:
+        name = os.path.basename(path)
+        return int(name[len(_SEGMENT_PREFIX):-len(_SEGMENT_SUFFIX)])
+
+    @property
+    def empty(self) -> bool:
+        return not self._segments
+
+    def append(self, data: bytes) -> None:
+        """Append one encoded event to the tail segment."""
+        if self._writer is None or self._write_size >= self.segment_bytes:
+            self._roll()
+        self._writer.write(_HEADER.pack(len(data)))
+        self._writer.write(data)
+        self._write_size += _HEADER.size + len(data)
+        self.spooled += 1
+
+    def append_many(self, items: Iterable[bytes]) -> None:
+        for data in items:
+            self.append(data)
+        self.flush()
+
+    def flush(self) -> None:
+        if self._writer is not None:
+            self._writer.flush()
+
+    def _roll(self) -> None:
+        self._close_writer()
+        path = os.path.join(self.directory, f"{_SEGMENT_PREFIX}{self._next_seq:06d}{_SEGMENT_SUFFIX}")
+        self._next_seq += 1
+        self._writer = open(path, "ab")
+        self._writer_path = path
+        self._write_size = 0
+        self._segments.append(path)
+        self._enforce_limit()
+
+    def _close_writer(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._writer = None
+        self._writer_path = None
+
+    def _enforce_limit(self) -> None:
+        """Drop the oldest segments once the spool exceeds max_bytes."""
+        total = sum(os.path.getsize(p) for p in self._segments if os.path.exists(p))
+        while total > self.max_bytes and len(self._segments) > 1:
+            oldest = self._segments[0]
+            total -= os.path.getsize(oldest) if os.path.exists(oldest) else 0
+            self._drop_head()
+            self.discarded_segments += 1
+            print(f"[spool] size limit reached, discarded {os.path.basename(oldest)}")
+
+    def _drop_head(self) -> None:
+        self._close_reader()
+        head = self._segments.pop(0)
+        try:
+            os.remove(head)
+        except OSError:
+            pass
+        self._read_offset = 0
+
+    def _close_reader(self) -> None:
+        if self._reader_map is not None:
+            self._reader_map.close()
+        if self._reader_file is not None:
+            self._reader_file.close()
+        self._reader_map = None
+        self._reader_file = None
+
+    def read_batch(self, max_records: int) -> List[bytes]:
+        """Return up to max_records events from the head of the spool, oldest first.
+
+        The records stay in the spool until `commit()` is called, so a batch
+        that fails to publish is returned again by the next call.
+        """
+        while self._segments:
+            if self._segments[0] == self._writer_path:
+                # The head segment becomes read-only; new events roll over
+                self._close_writer()
+            if self._reader_map is None:
+                self._reader_file = open(self._segments[0], "rb")
+                if os.fstat(self._reader_file.fileno()).st_size == 0:
+                    self._drop_head()
+                    continue
+                self._reader_map = mmap.mmap(self._reader_file.fileno(), 0, access=mmap.ACCESS_READ)
+            records: List[bytes] = []
+            mm = self._reader_map
+            offset, end = self._read_offset, len(mm)
+            while len(records) < max_records and offset + _HEADER.size <= end:
+                (length,) = _HEADER.unpack_from(mm, offset)
+                start = offset + _HEADER.size
+                if start + length > end:
+                    # Torn write from a crash; nothing after it is usable
+                    offset = end
+                    break
+                records.append(mm[start:start + length])
+                offset = start + length
+            if records:
+                self._batch_end = offset
+                self._batch_count = len(records)
+                return records
+            # Segment fully consumed
+            self._drop_head()
+        return []
+
+    def commit(self) -> None:
+        """Mark the records returned by the last `read_batch()` as published."""
+        if self._reader_map is None:
+            return
+        self._read_offset = self._batch_end
+        self.replayed += self._batch_count
+        self._batch_count = 0
+        if self._read_offset + _HEADER.size > len(self._reader_map):
+            self._drop_head()
+
+    def close(self) -> None:
+        self._close_writer()
+        self._close_reader()
+        if self._lock_file is not None:
+            # Closing the file releases the lock
+            self._lock_file.close()
+            self._lock_file = None
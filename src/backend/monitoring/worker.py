@@ -0,0 +1,111 @@
+"""Runner worker: executes runs submitted through the bridge's run manager API.
+
+A worker is a long-lived process that pops run requests from the Redis run
+queue (see `run_registry.py`) and hands them to a `RunScheduler`, so up to
+``RUN_WORKERS`` runs execute at once. It only takes a request when it has a
+free slot, which leaves the rest of the queue to other workers. Start as many
+workers as needed, on any machine that can reach Redis:
+
+    python -m src.backend.monitoring.worker [--workers 3]
+
+Worker processes are warm by default (``RUN_WARM=true``): they stay alive and
+reuse the LLM client, tools and MCP server between runs instead of starting
+them for every run.
+
+Runs are cancelled cooperatively: the bridge sets a cancel flag that the run
+polls after every agent step and task.
+
+A request stays in the worker's processing list until its run ends. If a
+worker dies, another worker requeues the requests it had not started and marks
+its running runs failed once its heartbeat expires.
+"""
+import argparse
+import os
+import time
+from concurrent.futures import Future
+
+from .run_registry import WORKER_TTL, RunRegistry
+from .scheduler import RunScheduler
+
+
+def run_worker(redis_url: str, max_workers: int, warm: bool = True) -> None:
+    registry = RunRegistry(redis_url)
+    scheduler = RunScheduler(max_workers, registry_url=redis_url, warm=warm)
+    print(f"[worker] waiting for runs on '{registry.queue_key}' ({max_workers} concurrent, "
+          f"{'warm' if warm else 'fresh process per run'})")
+
+    def _finished(run_id: str, future: Future) -> None:
+        error = future.exception()
+        if error is not None:
+            # The run's process died before it could report a result
+            print(f"[worker] run {run_id} crashed: {error}")
+            try:
+                registry.update(run_id, status="failed", error=str(error), finished_at=time.time())
+            except Exception:
+                pass
+        else:
+            print(f"[worker] run {run_id} {future.result().get('status')}")
+        scheduler.forget(run_id)
+        try:
+            registry.ack(run_id)
+        except Exception as e:
+            print(f"[worker] failed to acknowledge run {run_id}: {e}")
+
+    def _start(request) -> None:
+        run_id = request["run_id"]
+        if registry.get(run_id).get("status") == "cancelled":
+            registry.ack(run_id)
+            return
+        try:
+            scheduler.submit(request.get("project_details"), run_id)
+        except ValueError as e:
+            print(f"[worker] {e}")
+            registry.ack(run_id)
+            return
+        scheduler.future(run_id).add_done_callback(lambda f, run_id=run_id: _finished(run_id, f))
+
+    backoff = 1
+    # A request taken from the queue but not started yet (kept across Redis errors)
+    request = None
+    last_heartbeat = 0.0
+    try:
+        while True:
+            try:
+                # Also while busy, or other workers would take this one for dead
+                if time.monotonic() - last_heartbeat >= WORKER_TTL / 3:
+                    registry.heartbeat()
+                    registry.recover_orphans()
+                    last_heartbeat = time.monotonic()
+                if scheduler.in_flight >= max_workers:
+                    time.sleep(0.2)
+                    continue
+                if request is None:
+                    request = registry.pop(timeout=1.0)
+                if request is not None:
+                    _start(request)
+                    request = None
+                backoff = 1
+            except Exception as e:
+                print(f"[worker] Redis unavailable: {e}; retrying in {backoff}s")
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 30)
+    except KeyboardInterrupt:
+        print("[worker] stopping; waiting for in-flight runs")
+    finally:
+        scheduler.shutdown()
+        registry.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Execute runs submitted through the bridge.")
+    parser.add_argument("--workers", type=int, default=None, help="concurrent runs (default: RUN_WORKERS or 2)")
+    args = parser.parse_args()
+    run_worker(
+        os.getenv("REDIS_URL", "redis://127.0.0.1:6379/0"),
+        args.workers or int(os.getenv("RUN_WORKERS", "2")),
+        warm=os.getenv("RUN_WARM", "true").lower() in ("1", "true", "yes"),
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -7,60 +7,59 @@ that enables decoupling of runners from frontends.
 import asyncio
 import json
 import os
-from typing import Set
+import time
 from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
 
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, Response, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import uvicorn
 
-import redis.asyncio as aioredis
+from .connections import ClientConnection, ConnectionManager
+from .conversations import ConversationStore
+from .frames import ENCODING_JSON, ENCODING_MSGPACK, ENCODINGS, Frame, msgpack
+from .history import EventHistory
+from .run_manager import InvalidRunId, RunManager
+from .runs import RunTracker, load_artifact_manifest
+from .subscriber import redis_subscriber
+from .subscriptions import Subscription
+from .workers import WorkerRegistry, optional_registry
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan handler to initialize and cleanup Redis subscriber."""
+    global history, workers, run_manager
     redis_task = None
-    redis_client = None
+    heartbeat_task = None
     try:
-        async def _redis_subscriber(manager: "ConnectionManager", redis_url: str, channel: str):
-            """Subscribe to Redis channel and broadcast received messages to connected WebSocket clients."""
-            client = aioredis.from_url(redis_url)
-            pubsub = client.pubsub()
-            await pubsub.subscribe(channel)
-            print(f"[bridge] subscribed to Redis channel '{channel}' at {redis_url}")
-            try:
-                while True:
-                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
-                    if not message:
-                        await asyncio.sleep(0.1)
-                        continue
-                    # Parse Redis pub/sub message format
-                    data = message.get("data")
-                    if isinstance(data, (bytes, bytearray)):
-                        data = data.decode("utf-8")
-                    try:
-                        payload = json.loads(data)
-                    except Exception as e:
-                        print(f"[bridge] failed to parse message as JSON: {e}; raw={data}")
-                        continue
-                    await manager.broadcast(payload)
-            finally:
-                try:
-                    await pubsub.unsubscribe(channel)
-                except Exception:
-                    pass
-                try:
-                    await client.close()
-                except Exception:
-                    pass
-
         redis_url = os.getenv("REDIS_URL", "redis://127.0.0.1:6379/0")
         redis_channel = os.getenv("REDIS_CHANNEL", "crewai:events")
-        redis_client = aioredis.from_url(redis_url)
-        # Start subscriber as a background task
-        redis_task = asyncio.create_task(_redis_subscriber(manager, redis_url, redis_channel))
+        validate_payloads = os.getenv("BRIDGE_VALIDATE_JSON", "false").lower() in ("1", "true", "yes")
+        max_batch = int(os.getenv("BRIDGE_SUBSCRIBER_BATCH", "500"))
+        # Start subscriber as a background task (reconnects on its own)
+        redis_task = asyncio.create_task(
+            redis_subscriber(
+                manager,
+                redis_url,
+                redis_channel,
+                validate_payloads,
+                max_batch=max_batch,
+                conversations=conversations,
+                runs=runs,
+                pattern=os.getenv("BRIDGE_CHANNEL_PATTERN"),
+            )
+        )
         print("[bridge] Redis subscriber started")
+        redis_stream = os.getenv("REDIS_STREAM", "crewai:events:stream")
+        if redis_stream:
+            history = EventHistory(redis_url, redis_stream, int(os.getenv("BRIDGE_HISTORY_CHUNK", "1000")))
+        # Each worker process subscribes on its own; heartbeats let /health
+        # report totals across all of them
+        workers = optional_registry(redis_url)
+        if workers:
+            heartbeat_task = asyncio.create_task(workers.heartbeat(manager))
+        run_manager = RunManager(redis_url, os.getenv("RUN_REGISTRY_PREFIX", "crewai:runs"))
     except Exception as e:
         print(f"[bridge] Redis subscriber setup failed: {e}")
 
@@ -68,16 +67,20 @@ async def lifespan(app: FastAPI):
         yield
     finally:
         # Cleanup
-        if redis_task:
-            try:
-                redis_task.cancel()
-            except Exception:
-                pass
-        if redis_client:
-            try:
-                await redis_client.close()
-            except Exception:
-                pass
+        for task in (redis_task, heartbeat_task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+        workers = None
+        if run_manager:
+            await run_manager.close()
+            run_manager = None
+        if history:
+            await history.close()
+            history = None
 
 
 app = FastAPI(title="CrewAI Event Bridge", lifespan=lifespan)
@@ -92,50 +95,106 @@ app.add_middleware(
 )
 
 
-class ConnectionManager:
-    """Manages WebSocket connections and broadcasts messages to all connected clients."""
-
-    def __init__(self):
-        self.active_connections: Set[WebSocket] = set()
-
-    async def connect(self, websocket: WebSocket):
-        await websocket.accept()
-        self.active_connections.add(websocket)
+manager = ConnectionManager()
+conversations = ConversationStore(int(os.getenv("BRIDGE_MAX_CONVERSATIONS", "256")))
+runs = RunTracker(
+    buffer_size=int(os.getenv("BRIDGE_RUN_BUFFER", "1000")),
+    max_runs=int(os.getenv("BRIDGE_MAX_RUNS", "16")),
+)
+history: Optional[EventHistory] = None
+workers: Optional[WorkerRegistry] = None
+run_manager: Optional[RunManager] = None
 
-    def disconnect(self, websocket: WebSocket):
-        self.active_connections.discard(websocket)
 
-    async def broadcast(self, message: dict):
-        """Broadcast message to all connected WebSocket clients."""
-        if not self.active_connections:
-            return
+async def _replay(connection: ClientConnection, request: Dict[str, Any]) -> None:
+    try:
+        await history.replay(connection, request.get("last_id"), request.get("since"), request.get("limit"))
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        print(f"[bridge] History replay failed: {e}")
+        connection.enqueue(Frame.from_payload({"type": "history_error", "error": str(e)}))
 
-        disconnected = set()
-        for connection in self.active_connections:
-            try:
-                await connection.send_json(message)
-            except Exception as e:
-                print(f"[bridge] error sending message: {e}")
-                disconnected.add(connection)
 
-        # Clean up disconnected clients
-        for connection in disconnected:
-            self.active_connections.discard(connection)
+def _start_replay(connection: ClientConnection, request: Dict[str, Any]) -> None:
+    """Replay history to a client (replacing any replay already in progress)."""
+    if history is None:
+        raise ValueError("event history is disabled")
+    limit = request.get("limit")
+    if limit is not None:
+        try:
+            request = {**request, "limit": int(limit)}
+        except (TypeError, ValueError):
+            raise ValueError("limit must be an integer")
+    if connection.replay_task and not connection.replay_task.done():
+        connection.replay_task.cancel()
+    # Held from now on, not from when the task first runs
+    connection.hold_live()
+    connection.replay_task = asyncio.create_task(_replay(connection, request))
 
 
-manager = ConnectionManager()
+def _handle_client_message(connection: ClientConnection, data: str) -> None:
+    """Apply a subscribe/unsubscribe/resume request sent by a client."""
+    try:
+        message = json.loads(data)
+        if not isinstance(message, dict):
+            raise ValueError("expected a JSON object")
+        action = message.get("action")
+        if action == "subscribe":
+            manager.subscribe(connection, Subscription.from_message(message))
+        elif action == "unsubscribe":
+            manager.subscribe(connection, None)
+        elif action == "resume":
+            _start_replay(connection, message)
+            return
+        else:
+            raise ValueError(f"unknown action {action!r}")
+    except ValueError as e:
+        connection.enqueue(Frame.from_payload({"type": "subscription_error", "error": str(e)}))
+        return
+    subscription = connection.subscription.to_dict() if connection.subscription else None
+    connection.enqueue(Frame.from_payload({"type": "subscription_ack", "subscription": subscription}))
 
 
 @app.websocket("/ws/events")
 async def websocket_endpoint(websocket: WebSocket):
-    """WebSocket endpoint for real-time event streaming from Redis."""
-    await manager.connect(websocket)
+    """WebSocket endpoint for real-time event streaming from Redis.
+
+    Clients receive every event unless they subscribe to a subset, either via
+    query parameters or a JSON subscribe message (see subscriptions.py), and
+    can catch up on missed events with ``last_id``/``since``/``limit`` query
+    parameters or a resume message (see history.py). ``?encoding=msgpack``
+    switches the client to binary MessagePack frames.
+    """
+    params = dict(websocket.query_params)
+    encoding = params.get("encoding") or ENCODING_JSON
+    encoding_error = None
+    if encoding not in ENCODINGS:
+        encoding_error, encoding = f"unknown encoding {encoding!r}", ENCODING_JSON
+    elif encoding == ENCODING_MSGPACK and msgpack is None:
+        encoding_error, encoding = "msgpack is not installed on the bridge", ENCODING_JSON
+    connection = await manager.connect(websocket, encoding)
+    if encoding_error:
+        connection.enqueue(Frame.from_payload({"type": "encoding_error", "error": encoding_error}))
+    if params:
+        try:
+            manager.subscribe(connection, Subscription.from_message(params))
+        except ValueError as e:
+            print(f"[bridge] ignoring invalid subscription query: {e}")
+    if any(params.get(key) for key in ("last_id", "since", "limit")):
+        try:
+            _start_replay(connection, params)
+        except ValueError as e:
+            print(f"[bridge] ignoring invalid resume query: {e}")
     try:
         while True:
-            # Keep connection alive; clients may send ping/pong
+            # Keep connection alive; clients may send ping/pong. Replies go
+            # through the client's queue so only its writer task sends.
             data = await websocket.receive_text()
             if data == "ping":
-                await websocket.send_text("pong")
+                connection.enqueue(Frame("pong"))
+            else:
+                _handle_client_message(connection, data)
     except WebSocketDisconnect:
         manager.disconnect(websocket)
         print("[bridge] WebSocket client disconnected")
@@ -146,11 +205,20 @@ async def websocket_endpoint(websocket: WebSocket):
 
 @app.get("/health")
 async def health_check():
-    """Health check endpoint."""
-    return {
-        "status": "healthy",
-        "connected_clients": len(manager.active_connections),
-    }
+    """Health check endpoint.
+
+    With several bridge workers the top-level counts are totals across all of
+    them; ``worker`` holds the figures of the process that answered.
+    """
+    local = {"connected_clients": len(manager.active_connections), **manager.stats()}
+    if workers is None:
+        return {"status": "healthy", **local}
+    try:
+        totals = await workers.aggregate(manager)
+    except Exception as e:
+        print(f"[bridge] failed to aggregate worker stats: {e}")
+        totals = {"workers": None, **local}
+    return {"status": "healthy", **totals, "worker": {"worker_id": workers.worker_id, **local}}
 
 
 @app.get("/api/config")
@@ -159,9 +227,128 @@ async def get_config():
     return {
         "ws_url": os.getenv("WS_URL", "ws://localhost:8000/ws/events"),
         "redis_channel": os.getenv("REDIS_CHANNEL", "crewai:events"),
+        "redis_stream": history.stream if history else None,
     }
 
 
+def _with_live_summary(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Attach timings and the live summary the bridge tracks for the run."""
+    started, finished = record.get("started_at"), record.get("finished_at")
+    if started:
+        record["duration"] = (finished or time.time()) - started
+    state = runs.get(record["run_id"])
+    if state is not None:
+        record["summary"] = state.summary
+        if record.get("total_tokens") is None:
+            record["total_tokens"] = state.summary["tokens"]["total_tokens"] or None
+    return record
+
+
+def _require_run_manager() -> RunManager:
+    if run_manager is None:
+        raise HTTPException(status_code=503, detail="Run manager unavailable")
+    return run_manager
+
+
+@app.get("/api/runs")
+async def list_runs(limit: int = 100):
+    """List submitted runs (newest first) with status, timings and token totals.
+
+    Runs started outside the run manager (e.g. by hand) are listed from the
+    events the bridge has seen.
+    """
+    records = []
+    if run_manager is not None:
+        try:
+            records = await run_manager.list(limit)
+        except Exception as e:
+            print(f"[bridge] failed to list runs: {e}")
+    listed = {record["run_id"] for record in records}
+    result = [_with_live_summary(record) for record in records]
+    for summary in runs.runs():
+        if summary["run_id"] not in listed:
+            result.append({"run_id": summary["run_id"], "status": summary["status"], "summary": summary})
+    return {"runs": result[:limit]}
+
+
+@app.post("/api/runs", status_code=202)
+async def submit_run(payload: dict | None = None):
+    """Queue a run for the runner workers: ``{"project_details": "...", "run_id": "..."}``."""
+    payload = payload or {}
+    try:
+        return await _require_run_manager().submit(payload.get("project_details"), payload.get("run_id"))
+    except InvalidRunId as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@app.get("/api/runs/{run_id}")
+async def get_run(run_id: str):
+    record = await _require_run_manager().get(run_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Unknown run")
+    return _with_live_summary(record)
+
+
+@app.post("/api/runs/{run_id}/cancel")
+async def cancel_run(run_id: str):
+    """Cancel a run: queued runs never start, running ones stop after their current step."""
+    record = await _require_run_manager().cancel(run_id)
+    if record is None:
+        raise HTTPException(status_code=404, detail="Unknown run")
+    return record
+
+
+@app.get("/api/runs/{run_id}/artifacts")
+async def get_run_artifacts(run_id: str, path: Optional[str] = None):
+    """The files a run produced (or one file's entry with ``path``).
+
+    Tracked runs are served from their ``artifact_written`` events; older runs
+    from the manifest persisted in their run folder when ``BRIDGE_ARTIFACTS_DIR``
+    points at the runners' output folder.
+    """
+    state = runs.get(run_id)
+    manifest = state.artifacts if state is not None else None
+    if not manifest:
+        artifacts_dir = os.getenv("BRIDGE_ARTIFACTS_DIR")
+        if artifacts_dir:
+            manifest = await asyncio.to_thread(load_artifact_manifest, artifacts_dir, run_id) or manifest
+    if manifest is None:
+        raise HTTPException(status_code=404, detail="Unknown run")
+    if path is not None:
+        entry = manifest.get(path.strip("/"))
+        if entry is None:
+            raise HTTPException(status_code=404, detail="Unknown artifact")
+        return entry
+    return {"run_id": run_id, "files": list(manifest.values())}
+
+
+@app.get("/api/snapshot")
+async def get_snapshot(run_id: Optional[str] = None, events: bool = True):
+    """Return a run's summary and its most recent events in one response.
+
+    Defaults to the most recently active run. Buffered events are spliced in
+    as the exact JSON the runner published rather than re-encoded.
+    """
+    state = runs.get(run_id)
+    if state is None:
+        raise HTTPException(status_code=404, detail="Unknown run")
+    body = '{"summary":' + json.dumps(state.summary, default=str)
+    if events:
+        body += ',"events":[' + ",".join(frame.text for frame in state.events.items()) + "]"
+    return Response(content=body + "}", media_type="application/json")
+
+
+@app.get("/api/conversations/{conversation_id}")
+async def get_conversation(conversation_id: str):
+    """Return the full LLM message history rebuilt from delta-encoded events."""
+    conversation = conversations.get(conversation_id)
+    if conversation is None:
+        raise HTTPException(status_code=404, detail="Unknown conversation")
+    return conversation
+
+
 @app.post("/api/test-event")
 async def send_test_event(payload: dict | None = None):
     """Send a test event to all connected WebSocket clients (for diagnostics)."""
@@ -170,7 +357,7 @@ async def send_test_event(payload: dict | None = None):
         "timestamp": str(asyncio.get_event_loop().time()),
         "payload": payload or {"msg": "hello from bridge test-event"},
     }
-    await manager.broadcast(message)
+    manager.broadcast(message)
     return {"status": "ok", "sent": message}
 
 
@@ -181,4 +368,12 @@ if os.path.exists("src/frontend/dist"):
 
 if __name__ == "__main__":
     port = int(os.getenv("BRIDGE_PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # Worker processes each import the app, so it is passed as an import string
+    uvicorn.run(
+        "src.bridge.app:app",
+        host="0.0.0.0",
+        port=port,
+        workers=int(os.getenv("BRIDGE_WORKERS", "1")),
+        # Compress frames for clients that offer permessage-deflate (browsers do)
+        ws_per_message_deflate=os.getenv("BRIDGE_WS_DEFLATE", "true").lower() in ("1", "true", "yes"),
+    )
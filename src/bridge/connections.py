@@ -0,0 +1,325 @@
+"""WebSocket connection management for the bridge.
+
+Every connected client owns a bounded outbound queue drained by its own writer
+task, so a slow or stuck browser only ever delays itself. ``broadcast`` never
+awaits a socket: it enqueues on each client and returns immediately.
+"""
+import asyncio
+import os
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple, Union
+
+from fastapi import WebSocket
+
+from .frames import ENCODING_JSON, ENCODING_MSGPACK, Frame, parse_stream_id
+from .subscriptions import Subscription
+
+
+# Overflow policies applied when a client's outbound queue is full.
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_COALESCE = "coalesce"
+OVERFLOW_DISCONNECT = "disconnect"
+OVERFLOW_POLICIES = (OVERFLOW_DROP_OLDEST, OVERFLOW_COALESCE, OVERFLOW_DISCONNECT)
+
+# Event types whose consecutive messages can be merged into one under the
+# coalesce policy (the text of each chunk is concatenated).
+COALESCIBLE_TYPES = {"llm_stream_chunk"}
+
+# Close code sent to clients that are disconnected for falling behind
+# (1008 = policy violation).
+SLOW_CONSUMER_CLOSE_CODE = 1008
+
+
+class ClientConnection:
+    """A single WebSocket client with its own bounded send queue and writer task."""
+
+    def __init__(self,
+                 websocket: WebSocket,
+                 max_queue: int,
+                 overflow_policy: str,
+                 on_close: Optional[Callable[["ClientConnection"], None]] = None,
+                 encoding: str = ENCODING_JSON):
+        self.websocket = websocket
+        self.encoding = encoding
+        self.max_queue = max_queue
+        self.overflow_policy = overflow_policy
+        self.subscription: Optional[Subscription] = None
+        self.dropped = 0
+        self.coalesced = 0
+        self._on_close = on_close
+        self._pending: Deque[Frame] = deque()
+        self._wakeup = asyncio.Event()
+        self._room = asyncio.Event()
+        self._room.set()
+        self._writer_task: Optional[asyncio.Task] = None
+        self._closed = False
+        # While history is replayed, live frames are held here (None = live)
+        self._held: Optional[Deque[Frame]] = None
+        self._held_overflow = False
+        self.replay_task: Optional[asyncio.Task] = None
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._pending)
+
+    def start(self) -> None:
+        """Start the writer task that drains this client's queue."""
+        self._writer_task = asyncio.create_task(self._writer())
+
+    def wants(self, frame: Frame) -> bool:
+        """Whether this client's subscription accepts frame."""
+        subscription = self.subscription
+        if subscription is None:
+            return True
+        if not subscription.matches_type(frame.event_type) or not subscription.matches_run(frame.run_id):
+            return False
+        if subscription.payload_fields:
+            try:
+                return subscription.matches_fields(frame.payload())
+            except ValueError:
+                return False
+        return True
+
+    def deliver(self, frame: Frame) -> bool:
+        """Enqueue a live frame, or hold it while history is being replayed."""
+        if self._held is None:
+            return self.enqueue(frame)
+        if len(self._held) >= self.max_queue:
+            # The replay picks these up again from Redis instead
+            self._held.clear()
+            self._held_overflow = True
+        self._held.append(frame)
+        return not self._closed
+
+    def hold_live(self) -> None:
+        """Start holding live frames (called before a history replay is scheduled)."""
+        if self._held is None:
+            self._held = deque()
+            self._held_overflow = False
+
+    def release_live(self, after_id: Optional[str]) -> bool:
+        """Switch back to live delivery, sending held frames newer than after_id.
+
+        Returns False (and keeps holding) if held frames were lost to overflow,
+        in which case the caller must replay from after_id again first.
+        """
+        if self._held is None:
+            return True
+        if self._held_overflow:
+            self._held.clear()
+            self._held_overflow = False
+            return False
+        held, self._held = self._held, None
+        cursor = parse_stream_id(after_id) if after_id else None
+        for frame in held:
+            if cursor and frame.stream_id and parse_stream_id(frame.stream_id) <= cursor:
+                continue
+            self.enqueue(frame)
+        return True
+
+    async def wait_for_room(self) -> None:
+        """Wait until the queue is at most half full (replay backpressure)."""
+        while not self._closed and len(self._pending) > self.max_queue // 2:
+            self._room.clear()
+            await self._room.wait()
+
+    def enqueue(self, message: Frame) -> bool:
+        """Queue a frame without blocking.
+
+        Returns False when the client has overflowed under the ``disconnect``
+        policy (or is already closed) and should be dropped by the caller.
+        """
+        if self._closed:
+            return False
+        if len(self._pending) >= self.max_queue:
+            if self.overflow_policy == OVERFLOW_DISCONNECT:
+                return False
+            if self.overflow_policy == OVERFLOW_COALESCE and self._coalesce(message):
+                return True
+            self._pending.popleft()
+            self.dropped += 1
+        self._pending.append(message)
+        self._wakeup.set()
+        return True
+
+    def _coalesce(self, message: Frame) -> bool:
+        """Fold message into the newest queued frame of the same stream if possible.
+
+        Only coalescible frames are decoded, and only once the queue is full.
+        """
+        if not self._pending:
+            return False
+        last_frame = self._pending[-1]
+        if message.event_type not in COALESCIBLE_TYPES or last_frame.event_type != message.event_type:
+            return False
+        try:
+            last, current = last_frame.payload(), dict(message.payload())
+        except ValueError:
+            return False
+        if last.get("llm_name") != current.get("llm_name") or last.get("tool_call") or current.get("tool_call"):
+            return False
+        current["chunk"] = (last.get("chunk") or "") + (current.get("chunk") or "")
+        self._pending[-1] = Frame.from_payload(current)
+        self.coalesced += 1
+        return True
+
+    async def _writer(self) -> None:
+        try:
+            while True:
+                while not self._pending:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                frame = self._pending.popleft()
+                if len(self._pending) <= self.max_queue // 2:
+                    self._room.set()
+                if self.encoding == ENCODING_MSGPACK:
+                    data = frame.binary()
+                    if data is not None:
+                        await self.websocket.send_bytes(data)
+                        continue
+                await self.websocket.send_text(frame.text)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[bridge] error sending message: {e}")
+        finally:
+            self._closed = True
+            self._pending.clear()
+            self._room.set()
+            if self._on_close:
+                self._on_close(self)
+
+    async def close(self, code: int = 1000, reason: str = "") -> None:
+        """Stop the writer and replay tasks and close the underlying socket (best-effort)."""
+        self._closed = True
+        self._room.set()
+        for task in (self._writer_task, self.replay_task):
+            if task and not task.done():
+                task.cancel()
+        try:
+            await self.websocket.close(code=code, reason=reason)
+        except Exception:
+            pass
+
+
+class ConnectionManager:
+    """Manages WebSocket connections and fans messages out to subscribed clients.
+
+    Queue size and overflow policy default to the ``BRIDGE_CLIENT_QUEUE_SIZE``
+    and ``BRIDGE_OVERFLOW_POLICY`` environment variables.
+
+    Routing uses an index from (event type, run id) to the clients whose
+    subscription accepts that pair. It is built lazily per key and reset
+    whenever a client connects, disconnects or changes its subscription. Payloads are
+    only decoded when a routed client also filters on payload fields, and then
+    only once per frame.
+    """
+
+    def __init__(self, max_queue: Optional[int] = None, overflow_policy: Optional[str] = None):
+        self.max_queue = max_queue or int(os.getenv("BRIDGE_CLIENT_QUEUE_SIZE", "1000"))
+        self.overflow_policy = overflow_policy or os.getenv("BRIDGE_OVERFLOW_POLICY", OVERFLOW_DROP_OLDEST)
+        if self.overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(
+                f"Unknown overflow policy '{self.overflow_policy}'; expected one of {', '.join(OVERFLOW_POLICIES)}"
+            )
+        self.active_connections: Dict[WebSocket, ClientConnection] = {}
+        # Frames relayed, and frame deliveries to clients, since start-up
+        self.relayed = 0
+        self.delivered = 0
+        self._routes: Dict[Tuple[Optional[str], Optional[str]], List[ClientConnection]] = {}
+        # Close tasks of dropped clients; the loop only keeps weak references
+        self._closing: Set[asyncio.Task] = set()
+
+    async def connect(self, websocket: WebSocket, encoding: str = ENCODING_JSON) -> ClientConnection:
+        await websocket.accept()
+        connection = ClientConnection(
+            websocket, self.max_queue, self.overflow_policy, on_close=self._on_writer_closed, encoding=encoding
+        )
+        self.active_connections[websocket] = connection
+        self._routes.clear()
+        connection.start()
+        return connection
+
+    def disconnect(self, websocket: WebSocket):
+        connection = self.active_connections.pop(websocket, None)
+        self._routes.clear()
+        if connection and not connection.closed:
+            self._close_later(connection)
+
+    def _close_later(self, connection: ClientConnection, code: int = 1000, reason: str = "") -> None:
+        task = asyncio.create_task(connection.close(code, reason))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    def subscribe(self, connection: ClientConnection, subscription: Optional[Subscription]) -> None:
+        """Replace a client's subscription (None or an empty one receives everything)."""
+        connection.subscription = None if subscription is None or subscription.is_empty else subscription
+        self._routes.clear()
+
+    def _on_writer_closed(self, connection: ClientConnection) -> None:
+        if self.active_connections.get(connection.websocket) is connection:
+            del self.active_connections[connection.websocket]
+            self._routes.clear()
+
+    def _route(self, event_type: Optional[str], run_id: Optional[str]) -> List[ClientConnection]:
+        key = (event_type, run_id)
+        targets = self._routes.get(key)
+        if targets is None:
+            targets = [
+                c for c in self.active_connections.values()
+                if c.subscription is None
+                or (c.subscription.matches_type(event_type) and c.subscription.matches_run(run_id))
+            ]
+            if len(self._routes) >= 4096:
+                # Run ids keep changing; don't let stale keys pile up
+                self._routes.clear()
+            self._routes[key] = targets
+        return targets
+
+    def broadcast(self, message: Union[Frame, Dict[str, Any]]) -> None:
+        """Enqueue message for every subscribed client without awaiting any socket.
+
+        Dicts are encoded once here; every client is handed the same frame.
+        """
+        self.relayed += 1
+        if not self.active_connections:
+            return
+        if not isinstance(message, Frame):
+            message = Frame.from_payload(message)
+
+        slow = []
+        for connection in self._route(message.event_type, message.run_id):
+            subscription = connection.subscription
+            if subscription is not None and subscription.payload_fields:
+                try:
+                    if not subscription.matches_fields(message.payload()):
+                        continue
+                except ValueError:
+                    continue
+            if not connection.deliver(message):
+                slow.append(connection)
+            else:
+                self.delivered += 1
+
+        # Disconnect clients that fell behind under the 'disconnect' policy
+        if slow:
+            self._routes.clear()
+        for connection in slow:
+            self.active_connections.pop(connection.websocket, None)
+            print(f"[bridge] disconnecting slow WebSocket client ({connection.queue_depth} messages queued)")
+            self._close_later(connection, SLOW_CONSUMER_CLOSE_CODE, "client too slow")
+
+    def stats(self) -> Dict[str, int]:
+        """Aggregate queue statistics across connected clients."""
+        connections = list(self.active_connections.values())
+        return {
+            "relayed": self.relayed,
+            "delivered": self.delivered,
+            "queued": sum(c.queue_depth for c in connections),
+            "dropped": sum(c.dropped for c in connections),
+            "coalesced": sum(c.coalesced for c in connections),
+        }
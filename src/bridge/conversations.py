@@ -0,0 +1,59 @@
+"""Rebuilds full LLM message histories from delta-encoded LLM call events.
+
+The runner sends `llm_call_started`/`llm_call_completed` events whose
+``messages`` hold only what was appended since the previous call of the same
+conversation (see ``messages_base`` / ``messages_total``). The bridge applies
+those deltas here so clients that join mid-conversation can fetch the full
+history once and apply later deltas themselves.
+
+A conversation the bridge missed a delta of is marked incomplete until the
+runner resends its full history, which it does at least every
+``MONITOR_LLM_FULL_EVERY`` calls.
+"""
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+# Event types whose ``messages`` field may be delta-encoded
+HISTORY_EVENT_TYPES = {"llm_call_started", "llm_call_completed"}
+
+
+class ConversationStore:
+    """Bounded, least-recently-updated-first cache of rebuilt conversations."""
+
+    def __init__(self, max_conversations: int = 256):
+        self.max_conversations = max_conversations
+        self._conversations: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    def apply(self, payload: Dict[str, Any]) -> None:
+        """Apply the delta carried by an LLM call event (no-op for full-history events)."""
+        conversation_id = payload.get("conversation_id")
+        messages = payload.get("messages")
+        if not conversation_id or not isinstance(messages, list):
+            return
+        base = payload.get("messages_base") or 0
+        entry = self._conversations.get(conversation_id)
+        if base == 0:
+            entry = {"messages": list(messages), "complete": True}
+        elif entry is not None and len(entry["messages"]) == base:
+            entry["messages"].extend(messages)
+        else:
+            # We missed part of the conversation (e.g. the bridge restarted);
+            # keep what we have until the runner's next full history arrives.
+            entry = entry or {"messages": [], "complete": False}
+            entry["complete"] = False
+        self._conversations[conversation_id] = entry
+        self._conversations.move_to_end(conversation_id)
+        while len(self._conversations) > self.max_conversations:
+            self._conversations.popitem(last=False)
+
+    def get(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._conversations.get(conversation_id)
+        if entry is None:
+            return None
+        messages: List[Any] = entry["messages"]
+        return {
+            "conversation_id": conversation_id,
+            "messages": messages,
+            "messages_total": len(messages),
+            "complete": entry["complete"],
+        }
@@ -0,0 +1,123 @@
+"""Pre-encoded WebSocket frames shared by every client they are sent to.
+
+Events arrive from Redis already JSON-encoded. Wrapping the text in a ``Frame``
+lets the bridge forward those bytes as-is instead of decoding and re-encoding
+the payload once per connected client. Clients that asked for MessagePack get
+a binary encoding that is likewise built once per frame and then shared.
+"""
+import json
+import re
+from typing import Any, Dict, Optional, Tuple, Union
+
+try:
+    import msgpack
+except ImportError:  # optional: only needed for binary (MessagePack) clients
+    msgpack = None
+
+ENCODING_JSON = "json"
+ENCODING_MSGPACK = "msgpack"
+ENCODINGS = (ENCODING_JSON, ENCODING_MSGPACK)
+
+# Runner payloads put "type" first (after the "stream_id" and "run_id" the
+# forwarder splices in), so peeking at the head of the text is enough to route
+# a frame without parsing the (possibly huge) body.
+_TYPE_PEEK_CHARS = 256
+_TYPE_RE = re.compile(r'"type"\s*:\s*"([^"\\]*)"')
+_RUN_ID_RE = re.compile(r'"run_id"\s*:\s*"([^"\\]*)"')
+_STREAM_ID_RE = re.compile(r'^\{"stream_id":"(\d+-\d+)"')
+
+
+def peek_event_type(text: str) -> Optional[str]:
+    """Return the event type from the head of an encoded event, if present."""
+    match = _TYPE_RE.search(text, 0, _TYPE_PEEK_CHARS)
+    return match.group(1) if match else None
+
+
+def peek_run_id(text: str) -> Optional[str]:
+    """Return the run id from the head of an encoded event, if present."""
+    match = _RUN_ID_RE.search(text, 0, _TYPE_PEEK_CHARS)
+    return match.group(1) if match else None
+
+
+def peek_stream_id(text: str) -> Optional[str]:
+    """Return the Redis Stream entry id the forwarder put at the head of an event."""
+    match = _STREAM_ID_RE.match(text)
+    return match.group(1) if match else None
+
+
+def parse_stream_id(stream_id: str) -> Tuple[int, int]:
+    """Split a Redis Stream id ("<ms>-<seq>") into a comparable tuple."""
+    ms, _, seq = stream_id.partition("-")
+    return int(ms), int(seq or 0)
+
+
+class Frame:
+    """An encoded event plus the little metadata needed to route it."""
+
+    __slots__ = ("text", "event_type", "stream_id", "run_id", "_payload", "_binary")
+
+    def __init__(self,
+                 text: str,
+                 event_type: Optional[str] = None,
+                 payload: Optional[Dict[str, Any]] = None,
+                 stream_id: Optional[str] = None,
+                 run_id: Optional[str] = None):
+        self.text = text
+        self.event_type = event_type
+        self.stream_id = stream_id
+        self.run_id = run_id
+        self._payload = payload
+        self._binary: Optional[bytes] = None
+
+    @classmethod
+    def from_payload(cls, payload: Dict[str, Any]) -> "Frame":
+        """Encode a dict once (used for bridge-originated messages)."""
+        run_id = payload.get("run_id")
+        return cls(json.dumps(payload, default=str), payload.get("type"), payload,
+                   run_id=str(run_id) if run_id is not None else None)
+
+    @classmethod
+    def from_raw(cls, data: Union[bytes, bytearray, str], validate: bool = False) -> "Frame":
+        """Wrap a Redis message body without re-encoding it.
+
+        When ``validate`` is set the body is parsed once and a ValueError is
+        raised if it is not a JSON object.
+        """
+        text = data.decode("utf-8") if isinstance(data, (bytes, bytearray)) else data
+        if validate:
+            payload = json.loads(text)
+            if not isinstance(payload, dict):
+                raise ValueError(f"expected a JSON object, got {type(payload).__name__}")
+            run_id = payload.get("run_id")
+            return cls(text, payload.get("type"), payload, peek_stream_id(text),
+                       str(run_id) if run_id is not None else None)
+        return cls(text, peek_event_type(text), stream_id=peek_stream_id(text), run_id=peek_run_id(text))
+
+    @classmethod
+    def from_stream_entry(cls, stream_id: Union[bytes, str], data: Union[bytes, bytearray, str]) -> "Frame":
+        """Build the frame for a history entry, with its id spliced in like live events."""
+        if isinstance(stream_id, bytes):
+            stream_id = stream_id.decode("ascii")
+        text = data.decode("utf-8") if isinstance(data, (bytes, bytearray)) else data
+        body = "," + text[1:] if len(text) > 2 else "}"
+        text = f'{{"stream_id":"{stream_id}"{body}'
+        return cls(text, peek_event_type(text), stream_id=stream_id, run_id=peek_run_id(text))
+
+    def payload(self) -> Dict[str, Any]:
+        """Decode the frame once (only needed on slow paths such as field filters).
+
+        The returned dict is shared; copy it before modifying.
+        """
+        if self._payload is None:
+            self._payload = json.loads(self.text)
+        return self._payload
+
+    def binary(self) -> Optional[bytes]:
+        """MessagePack encoding of the frame, or None for non-JSON frames (e.g. "pong")."""
+        if self._binary is None:
+            try:
+                payload = self.payload()
+            except ValueError:
+                return None
+            self._binary = msgpack.packb(payload, default=str)
+        return self._binary
@@ -0,0 +1,126 @@
+"""Replayable event history backed by a capped Redis Stream.
+
+The runner's forwarder appends every event to a Redis Stream and publishes it
+with the entry id spliced in as ``stream_id``. A client that (re)connects can
+ask to resume from the last id it saw, from a timestamp, or with the most
+recent N events::
+
+    {"action": "resume", "last_id": "1718000000000-3"}
+    {"action": "resume", "since": "2024-06-10T08:00:00Z"}   # or epoch ms
+    {"action": "resume", "limit": 500}
+
+The backlog is read in XRANGE chunks while the client's live frames are
+held. Once the backlog is exhausted the held frames newer than the last
+replayed id are released and the client is live again.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import redis.asyncio as aioredis
+
+from .connections import ClientConnection
+from .frames import Frame
+
+
+def since_to_stream_id(since: Any) -> str:
+    """Convert an ISO timestamp or epoch milliseconds into a stream start id."""
+    if isinstance(since, (int, float)) or (isinstance(since, str) and since.isdigit()):
+        return f"{int(since)}-0"
+    if isinstance(since, str):
+        moment = datetime.fromisoformat(since.replace("Z", "+00:00"))
+        return f"{int(moment.timestamp() * 1000)}-0"
+    raise ValueError("since must be an ISO timestamp or epoch milliseconds")
+
+
+class EventHistory:
+    """Serves backlog replays from the capped Redis Stream."""
+
+    def __init__(self, redis_url: str, stream: str, chunk_size: int = 1000):
+        self.redis_url = redis_url
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self._client = aioredis.from_url(redis_url)
+
+    async def close(self) -> None:
+        try:
+            await self._client.close()
+        except Exception:
+            pass
+
+    async def replay(self,
+                     connection: ClientConnection,
+                     last_id: Optional[str] = None,
+                     since: Any = None,
+                     limit: Optional[int] = None) -> int:
+        """Send the backlog to connection, then switch it back to live delivery.
+
+        The caller must call ``connection.hold_live()`` before scheduling the
+        replay: live frames arriving before it starts would otherwise be sent
+        and then replayed again. Returns the number of history frames enqueued.
+        """
+        sent = 0
+        try:
+            if last_id:
+                start, inclusive = last_id, False
+            elif since is not None:
+                start, inclusive = since_to_stream_id(since), True
+            else:
+                start, inclusive = None, True
+
+            if start is None and limit:
+                # Most recent `limit` events, oldest first
+                entries = await self._client.xrevrange(self.stream, "+", "-", count=limit)
+                entries.reverse()
+                sent += await self._send(connection, entries)
+                # An empty stream leaves cursor None: every held frame is new
+                cursor = self._decode_id(entries[-1][0]) if entries else None
+            else:
+                cursor, sent = await self._catch_up(connection, start or "-", inclusive)
+
+            # Held live frames may have overflowed during a long replay; read
+            # what they covered from the stream and try again.
+            while not connection.release_live(cursor):
+                cursor, count = await self._catch_up(connection, cursor or "-", cursor is None)
+                sent += count
+        except Exception:
+            connection.release_live(None)
+            raise
+        connection.enqueue(Frame.from_payload({"type": "history_replayed", "count": sent, "last_id": cursor}))
+        return sent
+
+    async def _catch_up(self,
+                        connection: ClientConnection,
+                        start: str,
+                        inclusive: bool) -> Tuple[Optional[str], int]:
+        """XRANGE from start to the end of the stream in chunks."""
+        sent = 0
+        cursor: Optional[str] = None if start == "-" else start
+        lower = start if inclusive else f"({start}"
+        while not connection.closed:
+            entries = await self._client.xrange(self.stream, lower, "+", count=self.chunk_size)
+            if not entries:
+                break
+            sent += await self._send(connection, entries)
+            cursor = self._decode_id(entries[-1][0])
+            lower = f"({cursor}"
+            if len(entries) < self.chunk_size:
+                break
+        return cursor, sent
+
+    async def _send(self, connection: ClientConnection, entries: List[Tuple[Any, Dict[Any, Any]]]) -> int:
+        sent = 0
+        for entry_id, fields in entries:
+            data = fields.get(b"data") if b"data" in fields else fields.get("data")
+            if data is None:
+                continue
+            frame = Frame.from_stream_entry(entry_id, data)
+            if not connection.wants(frame):
+                continue
+            await connection.wait_for_room()
+            connection.enqueue(frame)
+            sent += 1
+        return sent
+
+    @staticmethod
+    def _decode_id(entry_id: Any) -> str:
+        return entry_id.decode("ascii") if isinstance(entry_id, bytes) else str(entry_id)
@@ -0,0 +1,122 @@
+"""Run manager: submit, list and cancel runs executed by runner workers.
+
+Runs are handed to warm runner workers (``python -m src.backend.monitoring.worker``)
+through a Redis list; workers and the bridge share a record per run in a Redis
+hash (see ``src/backend/monitoring/run_registry.py`` for the key layout, which
+this module mirrors).
+"""
+import json
+import re
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+import redis.asyncio as aioredis
+from redis.exceptions import WatchError
+
+RECORD_TTL = 7 * 24 * 3600
+CANCEL_TTL = 24 * 3600
+FINAL_STATUSES = ("completed", "failed", "cancelled")
+# Same rules as the runner's run_registry: ids end up in keys and folder names
+RUN_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+RESERVED_RUN_IDS = ("queue",)
+
+
+class InvalidRunId(ValueError):
+    """A client-supplied run id that cannot be used in keys and folder names."""
+
+
+def valid_run_id(run_id: Any) -> bool:
+    """Whether ``run_id`` is safe to use in Redis keys and folder names."""
+    return isinstance(run_id, str) and bool(RUN_ID_PATTERN.match(run_id)) and run_id not in RESERVED_RUN_IDS
+
+
+class RunManager:
+    """Async client for the run queue and run records."""
+
+    def __init__(self, redis_url: str, prefix: str = "crewai:runs", max_listed: int = 1000):
+        self.prefix = prefix
+        self.max_listed = max_listed
+        self._client = aioredis.from_url(redis_url)
+
+    async def close(self) -> None:
+        try:
+            await self._client.close()
+        except Exception:
+            pass
+
+    def _record_key(self, run_id: str) -> str:
+        return f"{self.prefix}:{run_id}"
+
+    async def submit(self, project_details: Optional[str] = None, run_id: Optional[str] = None) -> Dict[str, Any]:
+        """Record a run as queued and push it onto the worker queue."""
+        if run_id is None:
+            run_id = uuid.uuid4().hex[:12]
+        elif not valid_run_id(run_id):
+            raise InvalidRunId(f"invalid run_id {run_id!r}: use 1-64 letters, digits, '_' or '-'")
+        key = self._record_key(run_id)
+        now = time.time()
+        record = {"run_id": run_id, "status": "queued", "submitted_at": now, "project_details": project_details}
+        request = {"run_id": run_id, "project_details": project_details, "submitted_at": now}
+        async with self._client.pipeline(transaction=True) as pipe:
+            try:
+                # Two submits of the same id: only the first one's MULTI goes through
+                await pipe.watch(key)
+                if await pipe.exists(key):
+                    raise ValueError(f"run '{run_id}' already exists")
+                pipe.multi()
+                pipe.hset(key, mapping={k: json.dumps(v) for k, v in record.items()})
+                pipe.expire(key, RECORD_TTL)
+                pipe.zadd(self.prefix, {run_id: now})
+                # Keep the index bounded; records expire on their own
+                pipe.zremrangebyrank(self.prefix, 0, -self.max_listed - 1)
+                pipe.lpush(f"{self.prefix}:queue", json.dumps(request))
+                await pipe.execute()
+            except WatchError:
+                raise ValueError(f"run '{run_id}' already exists")
+        return record
+
+    async def get(self, run_id: str) -> Optional[Dict[str, Any]]:
+        if not valid_run_id(run_id):
+            return None
+        raw = await self._client.hgetall(self._record_key(run_id))
+        if not raw:
+            return None
+        return self._decode(raw)
+
+    async def list(self, limit: int = 100) -> List[Dict[str, Any]]:
+        """Most recently submitted runs first."""
+        run_ids = await self._client.zrevrange(self.prefix, 0, max(0, limit - 1))
+        if not run_ids:
+            return []
+        pipe = self._client.pipeline(transaction=False)
+        for run_id in run_ids:
+            pipe.hgetall(self._record_key(run_id.decode()))
+        return [self._decode(raw) for raw in await pipe.execute() if raw]
+
+    async def cancel(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Request a cooperative cancel; queued runs are cancelled immediately."""
+        record = await self.get(run_id)
+        if record is None:
+            return None
+        if record.get("status") in FINAL_STATUSES:
+            return record
+        await self._client.set(f"{self.prefix}:{run_id}:cancel", "1", ex=CANCEL_TTL)
+        if record.get("status") == "queued":
+            # The worker skips cancelled requests when it pops them
+            fields = {"status": "cancelled", "finished_at": time.time()}
+        else:
+            fields = {"cancel_requested_at": time.time()}
+        await self._client.hset(self._record_key(run_id), mapping={k: json.dumps(v) for k, v in fields.items()})
+        record.update(fields)
+        return record
+
+    @staticmethod
+    def _decode(raw: Dict[bytes, bytes]) -> Dict[str, Any]:
+        record = {}
+        for key, value in raw.items():
+            try:
+                record[key.decode()] = json.loads(value)
+            except ValueError:
+                record[key.decode()] = value.decode("utf-8", "replace")
+        return record
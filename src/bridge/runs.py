@@ -0,0 +1,235 @@
+"""Recent events and an incrementally maintained summary for each run.
+
+New dashboards bootstrap from ``GET /api/snapshot`` instead of replaying the
+whole run: the bridge keeps the last N frames of every run in a fixed-size
+ring buffer and folds each event into a small summary (status, current task,
+per-agent status, token totals, error count) as it passes through. Building a
+snapshot therefore costs the same regardless of how long the run has been
+going.
+
+Events are grouped by their ``run_id`` when the runner sets one; otherwise a
+run starts at every ``crew_kickoff_started`` event.
+
+``artifact_written`` events keep each run's artifact manifest (path, size,
+sha256, mtime, agent, task of every file the agents wrote) for
+``GET /api/runs/{run_id}/artifacts``; runs the bridge no longer tracks are
+read from the ``.manifest.json`` the runner persists in the run folder.
+"""
+import json
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from .frames import Frame
+
+# Event types folded into the summary; all of them are small payloads
+_SUMMARY_PREFIXES = ("crew_", "task_", "agent_execution_", "flow_")
+# Manifest entry fields (see src/backend/core/artifacts.py)
+_ARTIFACT_FIELDS = ("path", "size", "sha256", "mtime", "agent", "task")
+_MANIFEST_FILE = ".manifest.json"
+# Run folders are "<YYYY-mm-dd_HH-MM-SS>_<run_id>" (ArtifactOutput.get_base_output_path)
+_RUN_FOLDER_TIMESTAMP = r"\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2}"
+
+
+class RingBuffer:
+    """Fixed-capacity, array-backed buffer that overwrites its oldest entry."""
+
+    __slots__ = ("_items", "_start", "_size")
+
+    def __init__(self, capacity: int):
+        self._items: List[Optional[Frame]] = [None] * max(1, capacity)
+        self._start = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, item: Frame) -> None:
+        capacity = len(self._items)
+        if self._size < capacity:
+            self._items[(self._start + self._size) % capacity] = item
+            self._size += 1
+        else:
+            self._items[self._start] = item
+            self._start = (self._start + 1) % capacity
+
+    def items(self) -> List[Frame]:
+        """Buffered items, oldest first."""
+        end = self._start + self._size
+        if end <= len(self._items):
+            return self._items[self._start:end]
+        return self._items[self._start:] + self._items[:end - len(self._items)]
+
+
+class RunState:
+    """Ring buffer of recent frames plus the running summary of one run."""
+
+    def __init__(self, run_id: str, buffer_size: int):
+        self.events = RingBuffer(buffer_size)
+        self.summary: Dict[str, Any] = {
+            "run_id": run_id,
+            "crew_name": None,
+            "status": "running",
+            "started_at": time.time(),
+            "finished_at": None,
+            "current_task": None,
+            "agents": {},
+            "tokens": {"total_tokens": 0, "llm_calls": 0, "stream_chunks": 0},
+            "error_count": 0,
+            "event_count": 0,
+            "last_event_type": None,
+            "last_stream_id": None,
+            "artifact_count": 0,
+        }
+        # Relative path -> manifest entry
+        self.artifacts: Dict[str, Dict[str, Any]] = {}
+
+    def apply(self, frame: Frame) -> None:
+        self.events.append(frame)
+        summary = self.summary
+        event_type = frame.event_type or ""
+        summary["event_count"] += 1
+        summary["last_event_type"] = event_type
+        if frame.stream_id:
+            summary["last_stream_id"] = frame.stream_id
+        if event_type.endswith("_failed") or event_type.endswith("_error"):
+            summary["error_count"] += 1
+
+        # Only cheap, type-level bookkeeping for high-volume LLM events
+        if event_type == "llm_call_completed":
+            summary["tokens"]["llm_calls"] += 1
+            return
+        if event_type == "llm_stream_chunk":
+            summary["tokens"]["stream_chunks"] += 1
+            return
+        if event_type == "artifact_written":
+            self._apply_artifact(frame)
+            return
+        if not event_type.startswith(_SUMMARY_PREFIXES):
+            return
+        try:
+            payload = frame.payload()
+        except ValueError:
+            return
+        self._apply_payload(event_type, payload)
+
+    def _apply_artifact(self, frame: Frame) -> None:
+        try:
+            payload = frame.payload()
+        except ValueError:
+            return
+        path = payload.get("path")
+        if not path:
+            return
+        self.artifacts[path] = {field: payload.get(field) for field in _ARTIFACT_FIELDS}
+        self.summary["artifact_count"] = len(self.artifacts)
+
+    def _apply_payload(self, event_type: str, payload: Dict[str, Any]) -> None:
+        summary = self.summary
+        if event_type.startswith("crew_kickoff_"):
+            summary["crew_name"] = payload.get("crew_name") or summary["crew_name"]
+            if event_type == "crew_kickoff_completed":
+                summary["status"] = "completed"
+                summary["finished_at"] = time.time()
+                summary["current_task"] = None
+                if isinstance(payload.get("total_tokens"), int):
+                    summary["tokens"]["total_tokens"] = payload["total_tokens"]
+            elif event_type == "crew_kickoff_failed":
+                summary["status"] = "failed"
+                summary["finished_at"] = time.time()
+            return
+
+        role = payload.get("agent_role")
+        if not role:
+            return
+        agent = summary["agents"].setdefault(
+            role, {"status": "idle", "current_task": None, "tasks_completed": 0, "tasks_failed": 0}
+        )
+        title = payload.get("task_title") or payload.get("task_name")
+        if event_type == "task_started":
+            agent["status"] = "working"
+            agent["current_task"] = title
+            summary["current_task"] = {"title": title, "agent_role": role, "started_at": payload.get("start_time")}
+        elif event_type == "task_completed":
+            agent["status"] = "idle"
+            agent["current_task"] = None
+            agent["tasks_completed"] += 1
+        elif event_type == "task_failed":
+            agent["status"] = "failed"
+            agent["current_task"] = None
+            agent["tasks_failed"] += 1
+        elif event_type == "agent_execution_started":
+            agent["status"] = "working"
+        elif event_type == "agent_execution_completed":
+            agent["status"] = "idle"
+        elif event_type == "agent_execution_error":
+            agent["status"] = "failed"
+
+
+class RunTracker:
+    """Keeps RunState for the most recently active runs."""
+
+    def __init__(self, buffer_size: int = 1000, max_runs: int = 16):
+        self.buffer_size = buffer_size
+        self.max_runs = max_runs
+        self._runs: "OrderedDict[str, RunState]" = OrderedDict()
+        self._implicit_runs = 0
+        self._current: Optional[str] = None
+
+    def apply(self, frame: Frame) -> None:
+        run_id = frame.run_id
+        if run_id is None:
+            if frame.event_type == "crew_kickoff_started" or self._current is None:
+                self._implicit_runs += 1
+                self._current = f"run-{self._implicit_runs}"
+            run_id = self._current
+        state = self._runs.get(run_id)
+        if state is None:
+            state = self._runs[run_id] = RunState(run_id, self.buffer_size)
+            while len(self._runs) > self.max_runs:
+                self._runs.popitem(last=False)
+        else:
+            self._runs.move_to_end(run_id)
+        state.apply(frame)
+
+    def runs(self) -> List[Dict[str, Any]]:
+        """Summaries of the tracked runs, most recently active first."""
+        return [state.summary for state in reversed(self._runs.values())]
+
+    def get(self, run_id: Optional[str] = None) -> Optional[RunState]:
+        """The given run, or the most recently active one."""
+        if run_id is None:
+            return next(reversed(self._runs.values()), None)
+        return self._runs.get(run_id)
+
+
+def load_artifact_manifest(artifacts_dir: str, run_id: str) -> Optional[Dict[str, Dict[str, Any]]]:
+    """Read the persisted manifest of ``run_id`` from the runners' output folder.
+
+    Run folders are named ``<timestamp>_<run_id>``; returns None when there is
+    no such folder or it has no manifest.
+
+    The bridge does not import the runner's code, so this decodes the file
+    the same way as ``ArtifactOutput.load_manifest`` in
+    src/backend/core/artifacts.py; keep the two (and ``_ARTIFACT_FIELDS``)
+    in sync when the manifest format changes.
+    """
+    # Anchored on the timestamp: run ids may contain "_", so a plain suffix
+    # match would take "..._notes_app" for run "app"
+    pattern = re.compile(f"{_RUN_FOLDER_TIMESTAMP}_{re.escape(run_id)}")
+    try:
+        folders = [entry.path for entry in os.scandir(artifacts_dir)
+                   if entry.is_dir() and pattern.fullmatch(entry.name)]
+    except OSError:
+        return None
+    for folder in sorted(folders, reverse=True):
+        try:
+            with open(os.path.join(folder, _MANIFEST_FILE), "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        fields = data.get("fields") or _ARTIFACT_FIELDS[1:]
+        return {path: {"path": path, **dict(zip(fields, values))} for path, values in (data.get("files") or {}).items()}
+    return None
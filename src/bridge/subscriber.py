@@ -0,0 +1,112 @@
+"""Redis subscriber: relays events published by runners to the ConnectionManager.
+
+Runners publish each run's events on its own channel (``<channel>:<run_id>``);
+the subscriber listens to those with a pattern subscription as well as to the
+plain channel (used by older runners and bridge diagnostics).
+
+The subscriber blocks on the pub/sub socket instead of polling, so a message is
+broadcast as soon as it arrives. Every wake-up drains whatever else is already
+buffered before yielding back to the event loop. Lost connections are retried
+with exponential backoff.
+"""
+import asyncio
+from typing import Optional
+
+import redis.asyncio as aioredis
+
+from .connections import ConnectionManager
+from .conversations import HISTORY_EVENT_TYPES, ConversationStore
+from .frames import Frame
+from .runs import RunTracker
+
+
+async def redis_subscriber(manager: ConnectionManager,
+                           redis_url: str,
+                           channel: str,
+                           validate_payloads: bool = False,
+                           max_batch: int = 500,
+                           idle_timeout: float = 30.0,
+                           conversations: Optional[ConversationStore] = None,
+                           runs: Optional[RunTracker] = None,
+                           pattern: Optional[str] = None):
+    """Subscribe to a Redis channel and broadcast received messages to WebSocket clients.
+
+    ``idle_timeout`` bounds how long a single blocking read waits before the
+    connection health check runs; it does not add latency to messages.
+    LLM call events are also applied to ``conversations`` when given, and
+    every event is recorded in ``runs`` for snapshots. ``pattern`` is the
+    channel pattern for per-run channels (``<channel>:*`` by default; an
+    empty string disables it).
+    """
+    if pattern is None:
+        pattern = f"{channel}:*"
+    backoff = 1
+    while True:
+        client = None
+        pubsub = None
+        try:
+            client = aioredis.from_url(redis_url, health_check_interval=idle_timeout, socket_keepalive=True)
+            pubsub = client.pubsub(ignore_subscribe_messages=True)
+            await pubsub.subscribe(channel)
+            if pattern:
+                await pubsub.psubscribe(pattern)
+            print(f"[bridge] subscribed to Redis channel '{channel}'"
+                  + (f" and pattern '{pattern}'" if pattern else "") + f" at {redis_url}")
+            backoff = 1
+            while True:
+                # Block until the next message (or the health-check interval)
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=idle_timeout)
+                drained = 0
+                while message is not None:
+                    _relay(manager, message, validate_payloads, conversations, runs)
+                    drained += 1
+                    if drained >= max_batch:
+                        # Let client writers run before draining further
+                        await asyncio.sleep(0)
+                        drained = 0
+                    message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=0.0)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[bridge] Redis subscription failed: {e}; reconnecting in {backoff}s")
+        finally:
+            if pubsub is not None:
+                try:
+                    await pubsub.unsubscribe(channel)
+                    if pattern:
+                        await pubsub.punsubscribe(pattern)
+                    await pubsub.reset()
+                except Exception:
+                    pass
+            if client is not None:
+                try:
+                    await client.close()
+                except Exception:
+                    pass
+        await asyncio.sleep(backoff)
+        backoff = min(backoff * 2, 30)
+
+
+def _relay(manager: ConnectionManager,
+           message: dict,
+           validate_payloads: bool,
+           conversations: Optional[ConversationStore],
+           runs: Optional[RunTracker] = None) -> None:
+    # Forward the published bytes as-is; every client gets the same
+    # pre-encoded frame. Parsing is only done on request.
+    if message.get("type") not in ("message", "pmessage"):
+        return
+    data = message.get("data")
+    try:
+        frame = Frame.from_raw(data, validate=validate_payloads)
+    except Exception as e:
+        print(f"[bridge] failed to parse message as JSON: {e}; raw={data!r:.200}")
+        return
+    if conversations is not None and frame.event_type in HISTORY_EVENT_TYPES:
+        try:
+            conversations.apply(frame.payload())
+        except ValueError as e:
+            print(f"[bridge] failed to apply LLM message delta: {e}")
+    if runs is not None:
+        runs.apply(frame)
+    manager.broadcast(frame)
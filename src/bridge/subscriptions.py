@@ -0,0 +1,66 @@
+"""Server-side event filters requested by WebSocket clients.
+
+A client narrows what it receives either with query parameters on connect
+(``/ws/events?event_types=*_failed,task_*&agent_role=Tester%20Agent``) or by
+sending a JSON message at any time::
+
+    {"action": "subscribe", "event_types": ["*_failed"], "run_id": "...",
+     "agent_role": "...", "task_id": "..."}
+    {"action": "unsubscribe"}   # back to receiving everything
+
+``event_types`` are shell-style globs. Field filters (``run_id``,
+``agent_role``, ``task_id``) only match events that carry that field with the
+given value. ``run_id`` is read from the head of the frame like the event
+type, so watching a single run never needs the payload decoded.
+"""
+import fnmatch
+import re
+from typing import Any, Dict, Iterable, Optional
+
+FIELD_FILTERS = ("run_id", "agent_role", "task_id")
+
+
+class Subscription:
+    """Compiled event-type globs plus optional payload field filters."""
+
+    def __init__(self, event_types: Optional[Iterable[str]] = None, **fields: Any):
+        self.event_types = [t for t in (event_types or []) if t]
+        self._type_re = (
+            re.compile("|".join(f"(?:{fnmatch.translate(t)})" for t in self.event_types))
+            if self.event_types else None
+        )
+        self.fields = {k: str(v) for k, v in fields.items() if k in FIELD_FILTERS and v not in (None, "")}
+        self.run_id = self.fields.get("run_id")
+        # Filters that still need the decoded payload
+        self.payload_fields = {k: v for k, v in self.fields.items() if k != "run_id"}
+
+    @classmethod
+    def from_message(cls, message: Dict[str, Any]) -> "Subscription":
+        event_types = message.get("event_types") or []
+        if isinstance(event_types, str):
+            event_types = event_types.split(",")
+        if not isinstance(event_types, list) or not all(isinstance(t, str) for t in event_types):
+            raise ValueError("event_types must be a list of glob strings")
+        return cls([t.strip() for t in event_types], **{k: message.get(k) for k in FIELD_FILTERS})
+
+    @property
+    def is_empty(self) -> bool:
+        return self._type_re is None and not self.fields
+
+    def matches_type(self, event_type: Optional[str]) -> bool:
+        if self._type_re is None:
+            return True
+        return event_type is not None and self._type_re.match(event_type) is not None
+
+    def matches_run(self, run_id: Optional[str]) -> bool:
+        return self.run_id is None or self.run_id == run_id
+
+    def matches_fields(self, payload: Dict[str, Any]) -> bool:
+        for key, expected in self.payload_fields.items():
+            value = payload.get(key)
+            if value is None or str(value) != expected:
+                return False
+        return True
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"event_types": self.event_types, **self.fields}
@@ -0,0 +1,94 @@
+"""Worker heartbeats so `/health` can report totals across bridge processes.
+
+The bridge scales out by running several uvicorn workers (``BRIDGE_WORKERS``)
+or several instances behind a load balancer. Each worker subscribes to Redis
+on its own and serves only the clients connected to it, so no state has to
+be shared for streaming. For health reporting every worker writes its
+``ConnectionManager`` stats to a Redis key that expires unless refreshed;
+`/health` sums the keys that are still alive.
+"""
+import asyncio
+import json
+import os
+import socket
+import time
+from typing import Any, Dict, List, Optional
+
+import redis.asyncio as aioredis
+
+from .connections import ConnectionManager
+
+
+class WorkerRegistry:
+    """Publishes this worker's stats and aggregates those of its peers."""
+
+    def __init__(self, redis_url: str, prefix: str = "crewai:bridge:workers", interval: float = 5.0):
+        self.redis_url = redis_url
+        self.prefix = prefix
+        self.interval = interval
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self.started_at = time.time()
+        self._client = aioredis.from_url(redis_url)
+
+    def _key(self, worker_id: str) -> str:
+        return f"{self.prefix}:{worker_id}"
+
+    def local_stats(self, manager: ConnectionManager) -> Dict[str, Any]:
+        return {
+            "worker_id": self.worker_id,
+            "started_at": self.started_at,
+            "updated_at": time.time(),
+            "connected_clients": len(manager.active_connections),
+            **manager.stats(),
+        }
+
+    async def heartbeat(self, manager: ConnectionManager) -> None:
+        """Refresh this worker's stats key every ``interval`` seconds until cancelled."""
+        ttl = max(1, int(self.interval * 3))
+        try:
+            while True:
+                try:
+                    await self._client.set(self._key(self.worker_id), json.dumps(self.local_stats(manager)), ex=ttl)
+                except Exception as e:
+                    print(f"[bridge] worker heartbeat failed: {e}")
+                await asyncio.sleep(self.interval)
+        finally:
+            try:
+                await self._client.delete(self._key(self.worker_id))
+                await self._client.close()
+            except Exception:
+                pass
+
+    async def workers(self) -> List[Dict[str, Any]]:
+        """Stats of every live worker (including this one)."""
+        keys = [key async for key in self._client.scan_iter(match=f"{self.prefix}:*", count=100)]
+        if not keys:
+            return []
+        workers = []
+        for raw in await self._client.mget(keys):
+            if raw:
+                try:
+                    workers.append(json.loads(raw))
+                except ValueError:
+                    continue
+        return workers
+
+    async def aggregate(self, manager: ConnectionManager) -> Dict[str, Any]:
+        """Summed stats across workers; this worker's figures are always current."""
+        workers = {w["worker_id"]: w for w in await self.workers() if "worker_id" in w}
+        workers[self.worker_id] = self.local_stats(manager)
+        totals: Dict[str, Any] = {"workers": len(workers)}
+        for stats in workers.values():
+            for key, value in stats.items():
+                if key in ("worker_id", "started_at", "updated_at") or not isinstance(value, (int, float)):
+                    continue
+                totals[key] = totals.get(key, 0) + value
+        return totals
+
+
+def optional_registry(redis_url: str) -> Optional[WorkerRegistry]:
+    """A registry unless disabled with ``BRIDGE_HEARTBEAT_INTERVAL=0``."""
+    interval = float(os.getenv("BRIDGE_HEARTBEAT_INTERVAL", "5"))
+    if interval <= 0:
+        return None
+    return WorkerRegistry(redis_url, os.getenv("BRIDGE_WORKER_PREFIX", "crewai:bridge:workers"), interval)
@@ -7,6 +7,12 @@ export const useEventStore = defineStore('events', () => {
   const connectionStatus = ref<'connected' | 'disconnected'>('disconnected')
   const ws = ref<WebSocket | null>(null)
   const maxEvents = ref(500) // Keep last 500 events
+  // Last Redis Stream id seen, so a reconnect resumes where it left off
+  let lastStreamId: string | null = null
+  // Summary of the current run from the bridge snapshot
+  const runSummary = ref<Record<string, any> | null>(null)
+  // Live messages received while the snapshot is loading (null = not loading)
+  let pendingMessages: any[] | null = null
 
   const eventsByType = computed(() => {
     const grouped: Record<string, CrewAIEvent[]> = {}
@@ -50,8 +56,88 @@ export const useEventStore = defineStore('events', () => {
     }
   }
 
+  // Full LLM message histories rebuilt from delta-encoded events
+  const conversations = new Map<string, any[]>()
+
+  function expandMessages(data: any) {
+    if (!data.conversation_id || typeof data.messages_base !== 'number' || !Array.isArray(data.messages)) {
+      return
+    }
+    const known = conversations.get(data.conversation_id)
+    if (data.messages_base === 0) {
+      conversations.set(data.conversation_id, data.messages)
+      return
+    }
+    if (known && known.length === data.messages_base) {
+      const messages = known.concat(data.messages)
+      conversations.set(data.conversation_id, messages)
+      data.messages = messages
+      return
+    }
+    // Joined mid-conversation: fetch the rebuilt history from the bridge
+    fetch(`/api/conversations/${data.conversation_id}`)
+      .then(response => (response.ok ? response.json() : null))
+      .then(conversation => {
+        // Incomplete until the runner's next full history; wait for that
+        if (!conversation || !conversation.complete) return
+        const messages = conversation.messages.slice(0, data.messages_total)
+        conversations.set(data.conversation_id, messages)
+        data.messages = messages
+      })
+      .catch(e => console.error('Failed to fetch conversation history:', e))
+  }
+
+  // Redis Stream ids are "<ms>-<seq>"; compare them numerically
+  function streamIdAfter(id: string, other: string): boolean {
+    const [ms, seq] = id.split('-').map(Number)
+    const [otherMs, otherSeq] = other.split('-').map(Number)
+    return ms > otherMs || (ms === otherMs && seq > otherSeq)
+  }
+
+  function handleMessage(data: any) {
+    if (data.stream_id) {
+      // Already shown (e.g. delivered live and then again by a replay)
+      if (lastStreamId && !streamIdAfter(data.stream_id, lastStreamId)) {
+        return
+      }
+      lastStreamId = data.stream_id
+    }
+    if (data.type === 'history_replayed' || data.type === 'history_error') {
+      return
+    }
+    expandMessages(data)
+    addEvent({
+      type: data.type,
+      timestamp: data.timestamp || new Date().toISOString(),
+      data: data,
+    })
+  }
+
   function clearEvents() {
     events.value = []
+    conversations.clear()
+  }
+
+  async function loadSnapshot(): Promise<boolean> {
+    try {
+      const response = await fetch('/api/snapshot')
+      if (!response.ok) return false
+      const snapshot = await response.json()
+      runSummary.value = snapshot.summary
+      for (const data of snapshot.events || []) {
+        expandMessages(data)
+        addEvent({
+          type: data.type,
+          timestamp: data.timestamp || new Date().toISOString(),
+          data: data,
+        })
+      }
+      lastStreamId = snapshot.summary?.last_stream_id || null
+      return true
+    } catch (e) {
+      console.error('Failed to load run snapshot:', e)
+      return false
+    }
   }
 
   function connectToServer() {
@@ -66,16 +152,36 @@ export const useEventStore = defineStore('events', () => {
       ws.value.onopen = () => {
         console.log('WebSocket connected')
         connectionStatus.value = 'connected'
+        const socket = ws.value
+        if (lastStreamId) {
+          // Catch up on events missed while disconnected
+          socket?.send(JSON.stringify({ action: 'resume', last_id: lastStreamId }))
+          return
+        }
+        // First connect: paint from the run snapshot, then resume after it.
+        // Live messages are held until then so they land after the snapshot.
+        pendingMessages = []
+        loadSnapshot().then(loaded => {
+          const held = pendingMessages || []
+          pendingMessages = null
+          const resume = loaded && lastStreamId
+            ? { action: 'resume', last_id: lastStreamId }
+            : { action: 'resume', limit: maxEvents.value }
+          socket?.send(JSON.stringify(resume))
+          // The replay delivers held stream events in order; keep only the
+          // ones that are not in the stream
+          held.filter(data => !data.stream_id).forEach(handleMessage)
+        })
       }
 
       ws.value.onmessage = (event) => {
         try {
           const data = JSON.parse(event.data)
-          addEvent({
-            type: data.type,
-            timestamp: data.timestamp || new Date().toISOString(),
-            data: data,
-          })
+          if (pendingMessages) {
+            pendingMessages.push(data)
+            return
+          }
+          handleMessage(data)
         } catch (e) {
           console.error('Failed to parse event:', e)
         }
@@ -111,6 +217,7 @@ export const useEventStore = defineStore('events', () => {
   return {
     events,
     connectionStatus,
+    runSummary,
     eventsByType,
     agentEvents,
     taskEvents,
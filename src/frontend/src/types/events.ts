@@ -211,7 +211,15 @@ export interface MemorySaveFailedEvent extends CrewAIEvent {
 }
 
 // --- LLM events
-export interface LLMCallStartedEvent extends CrewAIEvent {
+// Message histories may be delta-encoded; the event store expands `messages`
+// to the full history before events reach components.
+export interface LLMMessageHistory {
+  conversation_id?: string
+  messages_base?: number
+  messages_total?: number
+}
+
+export interface LLMCallStartedEvent extends CrewAIEvent, LLMMessageHistory {
   llm_name?: string
   messages?: any[]
   tools?: any[]
@@ -222,7 +230,7 @@ export interface LLMCallStartedEvent extends CrewAIEvent {
   available_functions?: Record<string, any>
 }
 
-export interface LLMCallCompletedEvent extends CrewAIEvent {
+export interface LLMCallCompletedEvent extends CrewAIEvent, LLMMessageHistory {
   call_type?: string | null
   llm_name?: string
   temperature?: number | null
@@ -243,6 +251,8 @@ export interface LLMStreamChunkEvent extends CrewAIEvent {
   llm_name?: string
   chunk?: any
   tool_call?: any
+  // Number of streamed tokens merged into this frame
+  chunk_count?: number
 }
 
 // --- Tool usage events